@@ -1,30 +1,111 @@
-"""A/B benchmark: SQLite FTS5 vs Qdrant text search vs Qdrant hybrid.
+"""A/B benchmark: full-text lookup vs Qdrant text search vs Qdrant hybrid.
+
+The "FTS" column times `QdrantStore.search_fts` (text match + memory
+fetch), the replacement for the old SQLite FTS5 path. The three backends
+are independent, so each query runs them concurrently and reports each
+backend's own latency.
+
+Alongside the FTS/text set overlap, the FTS and text rankings are fused
+with the same RRF used by `do_recall` and scored against the hybrid
+ranking with NDCG@10 and Kendall tau.
+
+Each query is timed once cold (first call in the process), then run
+`--warmup` times untimed, then `--iters` times for the warm samples.
+Latencies are reported as cold/warm p50, p95 and p99 per backend.
 
 Usage:
-    uv run python bench/ab_fts_vs_qdrant.py
+    uv run python bench/ab_fts_vs_qdrant.py [--warmup 2] [--iters 5]
 
 Requires a populated memory store (run `cmk remember` a few times first).
 Set MEMORY_STORE_PATH or uses default ~/.claude-memory.
 """
 
+import argparse
+import math
 import os
+import statistics
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Ensure package is importable from repo root
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
+from claude_memory_kit.cache import TTLCache
 from claude_memory_kit.config import get_store_path
-from claude_memory_kit.store.sqlite import SqliteStore
-from claude_memory_kit.store.vectors import VectorStore
-
-
-def run_bench():
+from claude_memory_kit.store.qdrant_store import QdrantStore
+from claude_memory_kit.tools.recall import rrf_fuse
+
+K = 10
+
+
+BACKENDS = ("FTS", "Q-text", "hybrid")
+
+
+def _timed(fn, *args, **kwargs):
+    """Run fn and return (result, elapsed_ms). Failures count as empty."""
+    t0 = time.perf_counter_ns()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception:
+        result = []
+    return result, (time.perf_counter_ns() - t0) / 1e6
+
+
+def _run_once(pool, db, q):
+    """Run the three backends concurrently; return [(results, ms)] in BACKENDS order."""
+    futs = [
+        pool.submit(_timed, db.search_fts, q, limit=10, user_id="local"),
+        pool.submit(_timed, db.search_text, q, limit=10, user_id="local"),
+        pool.submit(_timed, db.search, q, limit=10, user_id="local"),
+    ]
+    return [f.result() for f in futs]
+
+
+def _pct(samples: list[float]) -> tuple[float, float, float]:
+    """p50/p95/p99 of samples in ms."""
+    if len(samples) < 2:
+        v = samples[0] if samples else 0.0
+        return v, v, v
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    return q[49], q[94], q[98]
+
+
+def ndcg_at_k(ranking: list[str], reference: list[str], k: int = K) -> float:
+    """NDCG of `ranking` using graded relevance from positions in `reference`."""
+    rel = {mid: k - i for i, mid in enumerate(reference[:k])}
+    if not rel:
+        return 1.0 if not ranking else 0.0
+    dcg = sum(rel.get(mid, 0) / math.log2(i + 2) for i, mid in enumerate(ranking[:k]))
+    ideal = sorted(rel.values(), reverse=True)
+    idcg = sum(r / math.log2(i + 2) for i, r in enumerate(ideal))
+    return dcg / idcg
+
+
+def kendall_tau(a: list[str], b: list[str]) -> float | None:
+    """Kendall tau over items ranked by both lists; None if fewer than 2 shared."""
+    pos_b = {mid: i for i, mid in enumerate(b)}
+    shared = [mid for mid in a if mid in pos_b]
+    n = len(shared)
+    if n < 2:
+        return None
+    concordant = discordant = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if pos_b[shared[i]] < pos_b[shared[j]]:
+                concordant += 1
+            else:
+                discordant += 1
+    return (concordant - discordant) / (n * (n - 1) / 2)
+
+
+def run_bench(warmup: int = 2, iters: int = 5):
     store_path = get_store_path()
-    db = SqliteStore(store_path)
-    db.migrate()
-    vectors = VectorStore(store_path)
-    vectors.ensure_collection()
+    db = QdrantStore(store_path)
+    db.ensure_collection()
+    # search_text and query encoding memoize; zero-size caches time the backend itself
+    db._text_cache = TTLCache(maxsize=0)
+    db._query_cache = TTLCache(maxsize=0)
 
     # Count memories to verify there's data
     total = db.count_memories(user_id="local")
@@ -48,69 +129,83 @@ def run_bench():
     # Deduplicate
     queries = list(dict.fromkeys(queries))
 
-    print(f"\nrunning {len(queries)} queries across 3 search backends\n")
-    print(f"{'query':<30} {'FTS5':>8} {'Q-text':>8} {'hybrid':>8}  overlap")
-    print("-" * 80)
+    print(
+        f"\nrunning {len(queries)} queries across 3 search backends "
+        f"(warmup={warmup}, iters={iters})\n"
+    )
+    print(f"{'query':<30} {'FTS':>8} {'Q-text':>8} {'hybrid':>8}  overlap        ndcg@{K}  tau")
+    print("-" * 96)
 
-    fts_total_ms = 0.0
-    qtext_total_ms = 0.0
-    hybrid_total_ms = 0.0
+    cold: dict[str, list[float]] = {b: [] for b in BACKENDS}
+    warm: dict[str, list[float]] = {b: [] for b in BACKENDS}
     overlap_ratios = []
-
-    for q in queries:
-        # A: SQLite FTS5
-        t0 = time.perf_counter()
-        try:
-            fts_results = db.search_fts(q, limit=10, user_id="local")
-        except Exception:
-            fts_results = []
-        fts_ms = (time.perf_counter() - t0) * 1000
-
-        # B: Qdrant text index
-        t0 = time.perf_counter()
-        try:
-            qtext_results = vectors.search_text(q, limit=10, user_id="local")
-        except Exception:
-            qtext_results = []
-        qtext_ms = (time.perf_counter() - t0) * 1000
-
-        # C: Qdrant hybrid (dense + sparse RRF)
-        t0 = time.perf_counter()
-        try:
-            hybrid_results = vectors.search(q, limit=10, user_id="local")
-        except Exception:
-            hybrid_results = []
-        hybrid_ms = (time.perf_counter() - t0) * 1000
-
-        fts_ids = {m.id for m in fts_results}
-        qtext_ids = {mid for mid, _ in qtext_results}
-        hybrid_ids = {mid for mid, _ in hybrid_results}
-        all_ids = fts_ids | qtext_ids
-
-        if all_ids:
-            overlap = len(fts_ids & qtext_ids) / len(all_ids)
-        else:
-            overlap = 1.0
-
-        overlap_ratios.append(overlap)
-        fts_total_ms += fts_ms
-        qtext_total_ms += qtext_ms
-        hybrid_total_ms += hybrid_ms
-
-        q_display = q[:28] + ".." if len(q) > 30 else q
-        print(
-            f"{q_display:<30} "
-            f"{len(fts_results):>3} {fts_ms:>4.1f}ms "
-            f"{len(qtext_results):>3} {qtext_ms:>4.1f}ms "
-            f"{len(hybrid_results):>3} {hybrid_ms:>4.1f}ms  "
-            f"fts/qtext={overlap:.0%}"
-        )
+    ndcgs = []
+    taus = []
+
+    # One worker per backend; Qdrant HTTP and numpy scoring release the GIL
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        for q in queries:
+            for b, (_, ms) in zip(BACKENDS, _run_once(pool, db, q)):
+                cold[b].append(ms)
+            for _ in range(warmup):
+                _run_once(pool, db, q)
+            per_query: dict[str, list[float]] = {b: [] for b in BACKENDS}
+            for _ in range(max(1, iters)):
+                runs = _run_once(pool, db, q)
+                for b, (_, ms) in zip(BACKENDS, runs):
+                    per_query[b].append(ms)
+                    warm[b].append(ms)
+            (fts_results, _), (qtext_results, _), (hybrid_results, _) = runs
+            fts_ms, qtext_ms, hybrid_ms = (
+                statistics.median(per_query[b]) for b in BACKENDS
+            )
+
+            fused = [mid for mid, _ in rrf_fuse(
+                [(m.id, 0.0) for m in fts_results], qtext_results,
+            )][:K]
+            hybrid_rank = [mid for mid, _ in hybrid_results][:K]
+            ndcg = ndcg_at_k(fused, hybrid_rank)
+            tau = kendall_tau(fused, hybrid_rank)
+            ndcgs.append(ndcg)
+            if tau is not None:
+                taus.append(tau)
+
+            fts_ids = {m.id for m in fts_results}
+            qtext_ids = {mid for mid, _ in qtext_results}
+            hybrid_ids = {mid for mid, _ in hybrid_results}
+            all_ids = fts_ids | qtext_ids
+
+            if all_ids:
+                overlap = len(fts_ids & qtext_ids) / len(all_ids)
+            else:
+                overlap = 1.0
+
+            overlap_ratios.append(overlap)
+
+            q_display = q[:28] + ".." if len(q) > 30 else q
+            print(
+                f"{q_display:<30} "
+                f"{len(fts_results):>3} {fts_ms:>4.1f}ms "
+                f"{len(qtext_results):>3} {qtext_ms:>4.1f}ms "
+                f"{len(hybrid_results):>3} {hybrid_ms:>4.1f}ms  "
+                f"fts/qtext={overlap:>4.0%}  "
+                f"{ndcg:>6.2f}  {'-' if tau is None else f'{tau:+.2f}'}"
+            )
 
     n = len(queries)
     avg_overlap = sum(overlap_ratios) / n if n else 0
+    avg_ndcg = sum(ndcgs) / n if n else 0
+    avg_tau = f"{sum(taus) / len(taus):+.2f}" if taus else "-"
 
-    print("-" * 80)
-    print(f"{'avg':<30} {'':>3} {fts_total_ms/n:>4.1f}ms {'':>3} {qtext_total_ms/n:>4.1f}ms {'':>3} {hybrid_total_ms/n:>4.1f}ms  overlap={avg_overlap:.0%}")
+    print("-" * 96)
+    print(f"{'avg overlap':<30} {avg_overlap:.0%}")
+    print(f"rrf(fts, qtext) vs hybrid: ndcg@{K}={avg_ndcg:.2f}  kendall_tau={avg_tau}")
+    print()
+    print(f"{'latency (ms)':<14} {'cold p50':>9} {'warm p50':>9} {'p95':>8} {'p99':>8}")
+    for b in BACKENDS:
+        c50, _, _ = _pct(cold[b])
+        w50, w95, w99 = _pct(warm[b])
+        print(f"{b:<14} {c50:>9.2f} {w50:>9.2f} {w95:>8.2f} {w99:>8.2f}")
     print()
 
     if avg_overlap > 0.8:
@@ -123,9 +218,13 @@ def run_bench():
     print()
     print("notes:")
     print("  - FTS5 supports boolean operators (AND/OR/NOT), qdrant text does substring matching")
-    print("  - hybrid search (dense+sparse) is the primary path, text is only a fallback")
-    print("  - if hybrid already returns results, neither FTS5 nor text search runs")
+    print("  - recall runs hybrid (dense+sparse) and text search together and fuses them with RRF (k=60)")
+    print("  - ndcg/tau compare the lexical-only fused ranking to hybrid; low values mean dense adds signal")
 
 
 if __name__ == "__main__":
-    run_bench()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs per query")
+    parser.add_argument("--iters", type=int, default=5, help="timed warm runs per query")
+    args = parser.parse_args()
+    run_bench(warmup=args.warmup, iters=args.iters)
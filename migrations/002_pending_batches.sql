@@ -0,0 +1,10 @@
+-- Anthropic message batches submitted by `cmk classify --batch` and not
+-- yet applied by `cmk classify --poll`.
+CREATE TABLE IF NOT EXISTS pending_batches (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    created TIMESTAMPTZ DEFAULT NOW(),
+    memory_ids TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_pending_batches_user ON pending_batches(user_id, kind);
@@ -8,15 +8,19 @@ from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 import httpx
-from fastapi import APIRouter, FastAPI, HTTPException, Request, Depends
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from pydantic_core import to_json
 
 from ..auth import get_current_user, is_auth_enabled, LOCAL_USER
 from ..auth_keys import create_api_key, list_keys, revoke_key
+from ..cache import (
+    classification_cache, normalize_query, search_cache, synthesis_cache,
+)
 from ..config import get_store_path, is_cloud_mode, get_database_url
 from ..store import Store
-from ..types import IdentityCard
+from ..types import IdentityCard, Memory
 from ..tools import (
     do_remember, do_recall, do_reflect,
     do_identity, do_forget, do_prime, do_scan,
@@ -56,13 +60,20 @@ async def lifespan(app: FastAPI):
     if not get_database_url():
         store.auth_db.migrate()
     store.qdrant.ensure_collection()
+    store.qdrant.warmup()
     app.state.store = store
 
     yield
 
+    await store.qdrant.aclose()
+
 
 app = FastAPI(title="claude-memory-kit", lifespan=lifespan)
-origins = os.getenv("CORS_ORIGINS", "http://localhost:5555,http://localhost:3000").split(",")
+origins = [
+    o.strip()
+    for o in os.getenv("CORS_ORIGINS", "http://localhost:5555,http://localhost:3000").split(",")
+    if o.strip()
+]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -80,6 +91,27 @@ async def security_headers(request: Request, call_next):
     return response
 
 
+# Serialize memory lists straight to JSON bytes in pydantic-core instead of
+# model_dump() -> jsonable_encoder -> json.dumps.
+_memory_list_adapter = TypeAdapter(dict[str, list[Memory]])
+
+
+def _memories_response(memories: list[Memory]) -> Response:
+    return Response(
+        _memory_list_adapter.dump_json({"memories": memories}),
+        media_type="application/json",
+    )
+
+
+def _json_response(content) -> Response:
+    """Encode a payload (dicts, lists, models, datetimes) in pydantic-core.
+
+    Returning a Response skips FastAPI's jsonable_encoder walk over every
+    value, which dominates on large rule and graph listings.
+    """
+    return Response(to_json(content), media_type="application/json")
+
+
 def _get_store() -> Store:
     return app.state.store
 
@@ -270,7 +302,7 @@ async def list_memories(
         limit, offset, user_id=user["id"],
         gate=gate, person=person, project=project,
     )
-    return {"memories": [m.model_dump() for m in memories]}
+    return _memories_response(memories)
 
 
 @router.post("/memories")
@@ -291,7 +323,7 @@ async def get_memory(id: str, user: dict = Depends(_auth)):
     mem = store.qdrant.get_memory(id, user_id=user["id"])
     if not mem:
         raise HTTPException(404, "memory not found")
-    return mem.model_dump()
+    return _json_response(mem)
 
 
 @router.patch("/memories/{id}")
@@ -350,8 +382,12 @@ async def unpin_memory(id: str, user: dict = Depends(_auth)):
 async def search(
     req: SearchRequest, user: dict = Depends(_auth)
 ):
-    store = _get_store()
-    result = await do_recall(store, req.query, user_id=user["id"])
+    key = (user["id"], normalize_query(req.query))
+    result = search_cache.get(key)
+    if result is None:
+        store = _get_store()
+        result = await do_recall(store, req.query, user_id=user["id"])
+        search_cache.set(key, result)
     return {"result": result}
 
 
@@ -385,7 +421,7 @@ async def get_graph(id: str, user: dict = Depends(_auth)):
     related = store.qdrant.find_related(
         id, depth=2, user_id=user["id"]
     )
-    return {"related": related}
+    return _json_response({"related": related})
 
 
 @router.post("/reflect")
@@ -419,7 +455,7 @@ async def list_private(
         level if level != "flagged" else "flagged",
         limit, offset, user_id=user["id"],
     )
-    return {"memories": [m.model_dump() for m in memories]}
+    return _memories_response(memories)
 
 
 @router.get("/privacy-stats")
@@ -497,6 +533,9 @@ async def get_stats(user: dict = Depends(_auth)):
         "total": store.qdrant.count_memories(user_id=uid),
         "by_gate": store.qdrant.count_by_gate(user_id=uid),
         "has_identity": store.qdrant.get_identity(user_id=uid) is not None,
+        "synthesis_cache": synthesis_cache.stats(),
+        "search_cache": search_cache.stats(),
+        "classification_cache": classification_cache.stats(),
     }
 
 
@@ -506,7 +545,7 @@ async def get_stats(user: dict = Depends(_auth)):
 async def list_rules(user: dict = Depends(_auth)):
     store = _get_store()
     rules = store.qdrant.list_rules(user_id=user["id"])
-    return {"rules": rules}
+    return _json_response({"rules": rules})
 
 
 @router.post("/rules")
@@ -640,7 +679,7 @@ async def list_team_memories(
         limit, offset, user_id=f"team:{team_id}",
         visibility="team",
     )
-    return {"memories": [m.model_dump() for m in memories]}
+    return _memories_response(memories)
 
 
 @router.post("/teams/{team_id}/rules")
@@ -665,7 +704,7 @@ async def list_team_rules(
     store = _get_store()
     _require_team_member(store, team_id, user["id"])
     rules = store.qdrant.list_rules(user_id=f"team:{team_id}")
-    return {"rules": rules}
+    return _json_response({"rules": rules})
 
 
 # ---- Mode ----
@@ -712,10 +751,9 @@ async def local_data_check(user: dict = Depends(_auth)):
     """Check if unclaimed local data exists."""
     store = _get_store()
     counts = store.count_user_data("local")
-    total = counts.get("total", 0)
     return {
-        "has_local_data": total > 0,
-        "counts": counts,
+        "has_local_data": counts.total > 0,
+        "counts": counts.to_dict(),
     }
 
 
@@ -729,11 +767,11 @@ async def claim_local(user: dict = Depends(_auth)):
         raise HTTPException(400, "cannot claim data as local user")
 
     counts = store.count_user_data("local")
-    if counts.get("total", 0) == 0:
+    if counts.total == 0:
         return {"migrated": {}, "message": "no local data to claim"}
 
-    result = store.migrate_user_data("local", uid)
-    return {"migrated": result, "message": "local data claimed"}
+    result = store.migrate_user_data("local", uid, counts=counts)
+    return {"migrated": result.to_dict(), "message": "local data claimed"}
 
 
 # Mount router at /api (backward compat) and /api/v1
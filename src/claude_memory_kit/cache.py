@@ -0,0 +1,144 @@
+"""In-process LRU cache with per-entry TTL.
+
+Used to memoize LLM synthesis calls: the same journal week or identity
+prompt is often re-sent within a few minutes (reflect retries, dashboard
+refreshes), and each call costs seconds of model latency. Also backs the
+short-lived `/api/search` and MCP recall result caches, and remembers
+sensitivity classifications by content.
+"""
+
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .config import result_caches_enabled
+
+
+def make_key(*parts: str) -> str:
+    """Stable key for a prompt: blake2b over the NUL-joined parts."""
+    return hashlib.blake2b("\0".join(parts).encode()).hexdigest()
+
+
+class TTLCache:
+    """LRU mapping whose entries expire `ttl` seconds after being set.
+
+    Thread-safe: stores hit it from `asyncio.to_thread` workers, and
+    writes invalidate it while searches on other threads read it.
+    """
+
+    def __init__(self, maxsize: int = 100, ttl: float = 900.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires, value = item
+            if expires <= time.monotonic():
+                self._data.pop(key, None)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, match: Callable[[Hashable], bool] | None = None) -> None:
+        """Drop entries whose key satisfies `match` (all if None).
+
+        Hit/miss counters are kept.
+        """
+        with self._lock:
+            if match is None:
+                self._data.clear()
+                return
+            for key in [k for k in self._data if match(k)]:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._data)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "size": size,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+# Synthesis results (consolidation digests, identity rewrites)
+synthesis_cache = TTLCache(maxsize=100, ttl=900.0)
+
+# Search and recall results are only invalidated by this process's own
+# writes; a ttl of 0 turns them off for multi-worker deployments.
+_cache_results = result_caches_enabled()
+
+# /api/search responses, keyed by (user_id, normalized query)
+search_cache = TTLCache(maxsize=512, ttl=60.0 if _cache_results else 0.0)
+
+# Sensitivity verdicts, keyed by normalized memory content. A verbatim
+# repeat (templated note, greeting) reuses the earlier classification.
+classification_cache = TTLCache(maxsize=4096, ttl=7 * 86400.0)
+
+# do_identity output per user. Chatty clients call it back to back; a
+# second of staleness in the recent-journal tail is acceptable.
+identity_cache = TTLCache(maxsize=128, ttl=1.0)
+
+# MCP recall_memories output, keyed by (user_id, team_id, normalized query).
+# Models re-ask the same thing after tool errors and retries.
+recall_cache = TTLCache(maxsize=128, ttl=30.0 if _cache_results else 0.0)
+
+
+def normalize_query(query: str) -> str:
+    return unicodedata.normalize("NFKC", query).casefold().strip()
+
+
+def invalidate_search_cache(user_id: str | None) -> None:
+    """Forget cached search and recall results after `user_id`'s memories
+    change (everyone's if None).
+
+    Team-scoped recall results are dropped on any write: they include
+    other members' team-visible memories, and a write doesn't say which
+    teams can see it.
+    """
+    if user_id is None:
+        search_cache.invalidate()
+        recall_cache.invalidate()
+        return
+    search_cache.invalidate(lambda key: key[0] == user_id)
+    recall_cache.invalidate(lambda key: key[0] == user_id or key[1] is not None)
+
+
+def invalidate_identity_cache(user_id: str) -> None:
+    """Forget a user's cached identity output after their card changes."""
+    identity_cache.invalidate(lambda key: key == user_id)
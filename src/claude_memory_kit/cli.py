@@ -2,23 +2,53 @@
 
 import asyncio
 import json
+import os
 import sys
 import uuid
 
 import click
 
 from .cli_auth import get_user_id, get_team_id
-from .config import get_store_path
+from .config import get_store_path, is_cloud_mode, is_daemon_mode
 from .store import Store
 
 
-def _get_store() -> Store:
+def _get_store(memories: bool = True) -> Store:
+    """Open the store. Pass memories=False for auth-only commands."""
     store = Store(get_store_path())
     store.auth_db.migrate()
-    store.qdrant.ensure_collection()
+    if memories:
+        store.qdrant.ensure_collection()
     return store
 
 
+def _echo_counts(counts) -> None:
+    """List the non-empty per-type counts of a StoreCounts."""
+    for name in ("memories", "journal", "identity", "rules"):
+        count = getattr(counts, name)
+        if count > 0:
+            click.echo(f"  {name}: {count}")
+
+
+def _run(cmd: str, args: dict | None = None) -> str:
+    """Run a store-backed command via the daemon, or inline if none is up.
+
+    Only a daemon that never took the request falls back to inline: once
+    it has, rerunning could save or delete a memory twice.
+    """
+    from .daemon import DaemonError, request, run_command, spawn
+    args = args or {}
+    uid = get_user_id()
+    if is_daemon_mode() and spawn():
+        try:
+            result = request(cmd, args, uid)
+        except DaemonError as e:
+            raise click.ClickException(str(e)) from e
+        if result is not None:
+            return result
+    return asyncio.run(run_command(_get_store(), cmd, args, uid))
+
+
 @click.group(invoke_without_command=True)
 @click.pass_context
 def main(ctx):
@@ -34,40 +64,29 @@ def main(ctx):
 @click.option("--project", default=None, help="Project context")
 def remember(content, gate, person, project):
     """Store a new memory."""
-    from .tools.remember import do_remember
-    store = _get_store()
-    result = asyncio.run(
-        do_remember(store, content, gate, person, project, user_id=get_user_id())
-    )
-    click.echo(result)
+    click.echo(_run("remember", {
+        "content": content, "gate": gate,
+        "person": person, "project": project,
+    }))
 
 
 @main.command()
 @click.argument("query")
 def recall(query):
     """Search memories."""
-    from .tools.recall import do_recall
-    store = _get_store()
-    result = asyncio.run(do_recall(store, query, user_id=get_user_id()))
-    click.echo(result)
+    click.echo(_run("recall", {"query": query}))
 
 
 @main.command()
 def reflect():
     """Trigger memory consolidation."""
-    from .tools.reflect import do_reflect
-    store = _get_store()
-    result = asyncio.run(do_reflect(store, user_id=get_user_id()))
-    click.echo(result)
+    click.echo(_run("reflect"))
 
 
 @main.command()
 def identity():
     """Show identity card."""
-    from .tools.identity import do_identity
-    store = _get_store()
-    result = asyncio.run(do_identity(store, user_id=get_user_id()))
-    click.echo(result)
+    click.echo(_run("identity"))
 
 
 @main.command()
@@ -75,70 +94,80 @@ def identity():
 @click.option("--reason", required=True, help="Why to forget this memory")
 def forget(memory_id, reason):
     """Forget a memory (archive with reason)."""
-    from .tools.forget import do_forget
-    store = _get_store()
-    result = asyncio.run(
-        do_forget(store, memory_id, reason, user_id=get_user_id())
-    )
-    click.echo(result)
+    click.echo(_run("forget", {"memory_id": memory_id, "reason": reason}))
 
 
 @main.command()
 def extract():
     """Extract memories from stdin transcript."""
-    from .tools.auto_extract import do_auto_extract
     transcript = sys.stdin.read()
     if not transcript.strip():
         click.echo("No transcript provided on stdin.")
         return
-    store = _get_store()
-    result = asyncio.run(
-        do_auto_extract(store, transcript, user_id=get_user_id())
-    )
-    click.echo(result)
+    click.echo(_run("extract", {"transcript": transcript}))
 
 
 @main.command()
 @click.argument("message")
 def prime(message):
     """Proactive recall from a message."""
-    from .tools.prime import do_prime
-    store = _get_store()
-    result = asyncio.run(do_prime(store, message, user_id=get_user_id()))
-    click.echo(result)
+    click.echo(_run("prime", {"message": message}))
 
 
 @main.command()
 def scan():
     """Scan memories for PII and sensitive data patterns."""
-    from .tools.scan import do_scan
-    store = _get_store()
-    result = asyncio.run(do_scan(store, user_id=get_user_id()))
-    click.echo(result)
+    click.echo(_run("scan"))
 
 
 @main.command()
 @click.option("--force", is_flag=True, help="Re-classify all memories, not just unclassified")
-def classify(force):
+@click.option("--batch", is_flag=True,
+              help="Queue on the Message Batches API (half price, results within 24h)")
+@click.option("--poll", is_flag=True, help="Apply results of finished --batch runs")
+def classify(force, batch, poll):
     """Classify memories for sensitive content using Opus."""
-    from .tools.classify import classify_memories
-    store = _get_store()
-    result = asyncio.run(
-        classify_memories(store, user_id=get_user_id(), force=force)
-    )
-    click.echo(result)
+    click.echo(_run("classify", {"force": force, "batch": batch, "poll": poll}))
+
+
+@main.command(name="daemon")
+@click.option("--idle", default=600, help="Exit after this many idle seconds")
+def daemon_cmd(idle):
+    """Run the local CLI daemon in the foreground."""
+    from .daemon import serve
+    asyncio.run(serve(idle_timeout=float(idle)))
+
+
+def _default_workers() -> int:
+    return max(2, (os.cpu_count() or 2) // 2)
 
 
 @main.command()
 @click.option("--port", default=7749, help="API server port")
-def serve(port):
+@click.option(
+    "--workers", default=1, type=click.IntRange(min=0),
+    help="Worker processes (0 = half the CPUs). Cloud mode only.",
+)
+def serve(port, workers):
     """Start API server for dashboard."""
     import uvicorn
+    kwargs = {}
+    if workers != 1:
+        if is_cloud_mode():
+            kwargs["workers"] = workers or _default_workers()
+            # Each worker caches search/recall results in-process and only
+            # sees its own writes, so turn those caches off for the workers.
+            os.environ["CMK_RESULT_CACHE"] = "false"
+        else:
+            # Embedded Qdrant locks the store directory, so extra workers
+            # would come up with a disabled store.
+            click.echo("local mode: ignoring --workers, running one process.", err=True)
     uvicorn.run(
         "claude_memory_kit.api.app:app",
         host="0.0.0.0",
         port=port,
         log_level="info",
+        **kwargs,
     )
 
 
@@ -191,27 +220,22 @@ def claim():
 
     store = _get_store()
     local_counts = store.count_user_data("local")
-    total = local_counts.get("total", 0)
+    total = local_counts.total
 
     if total == 0:
         click.echo("No local data to claim.")
         return
 
     click.echo(f"Found {total} local items to migrate:")
-    for table in ("memories", "journal", "edges", "archive"):
-        count = local_counts.get(table, 0)
-        if count > 0:
-            click.echo(f"  {table}: {count}")
+    _echo_counts(local_counts)
 
     if not click.confirm("Migrate all local data to your cloud account?"):
         click.echo("Cancelled.")
         return
 
-    result = store.migrate_user_data("local", uid)
+    result = store.migrate_user_data("local", uid, counts=local_counts)
     click.echo("\nMigrated:")
-    for key, count in result.items():
-        if count > 0:
-            click.echo(f"  {key}: {count}")
+    _echo_counts(result)
     click.echo("Done. Local data now belongs to your cloud account.")
 
 
@@ -225,27 +249,22 @@ def export_data():
 
     store = _get_store()
     cloud_counts = store.count_user_data(uid)
-    total = cloud_counts.get("total", 0)
+    total = cloud_counts.total
 
     if total == 0:
         click.echo("No cloud data to export.")
         return
 
     click.echo(f"Found {total} cloud items to export to local:")
-    for table in ("memories", "journal", "edges", "archive"):
-        count = cloud_counts.get(table, 0)
-        if count > 0:
-            click.echo(f"  {table}: {count}")
+    _echo_counts(cloud_counts)
 
     if not click.confirm("Copy all cloud data to local storage?"):
         click.echo("Cancelled.")
         return
 
-    result = store.migrate_user_data(uid, "local")
+    result = store.migrate_user_data(uid, "local", counts=cloud_counts)
     click.echo("\nExported:")
-    for key, count in result.items():
-        if count > 0:
-            click.echo(f"  {key}: {count}")
+    _echo_counts(result)
     click.echo("Done. Cloud data copied to local mode.")
 
 
@@ -287,7 +306,7 @@ def team_create(name):
         click.echo("Not logged in. Run 'cmk init <api-key>' first.")
         return
 
-    store = _get_store()
+    store = _get_store(memories=False)
     team_id = f"team_{uuid.uuid4().hex[:8]}"
     team_info = store.auth_db.create_team(team_id, name, uid)
 
@@ -311,7 +330,7 @@ def team_join(team_id):
         click.echo("Not logged in. Run 'cmk init <api-key>' first.")
         return
 
-    store = _get_store()
+    store = _get_store(memories=False)
     team_info = store.auth_db.get_team(team_id)
     if not team_info:
         click.echo(f"Team '{team_id}' not found.")
@@ -340,7 +359,7 @@ def team_leave():
         click.echo("Not in a team. Nothing to leave.")
         return
 
-    store = _get_store()
+    store = _get_store(memories=False)
     role = store.auth_db.get_member_role(tid, uid)
     if role == "owner":
         click.echo("You are the owner. Transfer ownership or delete the team instead.")
@@ -365,7 +384,7 @@ def team_members():
         click.echo("Not in a team. Run 'cmk team join <id>' first.")
         return
 
-    store = _get_store()
+    store = _get_store(memories=False)
     team_info = store.auth_db.get_team(tid)
     if not team_info:
         click.echo(f"Team '{tid}' not found.")
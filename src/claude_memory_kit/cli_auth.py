@@ -9,9 +9,18 @@ from urllib.parse import urlparse, parse_qs
 
 import click
 
+from .cache import TTLCache
+
 CREDENTIALS_DIR = os.path.expanduser("~/.claude-memory")
 CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "credentials.json")
 CALLBACK_PORT = 9847  # localhost callback port for OAuth
+CREDENTIALS_TTL = 60.0  # seconds a parsed credentials file is reused
+
+# Parsed credentials keyed by path. get_api_key runs on every synthesis
+# call, so without this each save in a long-lived server re-reads the file.
+# Writes and logout invalidate; edits made by another process show up
+# within CREDENTIALS_TTL.
+_credentials_cache = TTLCache(maxsize=8, ttl=CREDENTIALS_TTL)
 
 
 def _get_login_url() -> str:
@@ -25,9 +34,10 @@ def _save_credentials(data: dict) -> None:
     with open(CREDENTIALS_FILE, "w") as f:
         json.dump(data, f, indent=2)
     os.chmod(CREDENTIALS_FILE, 0o600)
+    _credentials_cache.invalidate()
 
 
-def load_credentials() -> dict | None:
+def _read_credentials() -> dict | None:
     if not os.path.exists(CREDENTIALS_FILE):
         return None
     try:
@@ -37,6 +47,16 @@ def load_credentials() -> dict | None:
         return None
 
 
+def load_credentials() -> dict | None:
+    cached = _credentials_cache.get(CREDENTIALS_FILE)
+    if cached is None:
+        cached = (_read_credentials(),)
+        _credentials_cache.set(CREDENTIALS_FILE, cached)
+    creds = cached[0]
+    # Callers edit and re-save the dict; keep the cached copy pristine
+    return dict(creds) if creds is not None else None
+
+
 def get_user_id() -> str:
     """Resolve user_id: CMK_USER_ID env > credentials.json > 'local'."""
     env_id = os.getenv("CMK_USER_ID")
@@ -312,6 +332,7 @@ def do_logout() -> None:
     """Remove stored credentials."""
     if os.path.exists(CREDENTIALS_FILE):
         os.remove(CREDENTIALS_FILE)
+        _credentials_cache.invalidate()
         click.echo("Logged out. Switched back to local mode.")
     else:
         click.echo("Not logged in.")
@@ -1,5 +1,6 @@
 import os
 import logging
+from functools import lru_cache
 
 from dotenv import load_dotenv
 
@@ -12,6 +13,7 @@ HAIKU = "claude-haiku-4-5-20251001"
 log = logging.getLogger("cmk")
 
 
+@lru_cache(maxsize=None)
 def get_model() -> str:
     model = os.getenv("ANTHROPIC_MODEL", OPUS)
     if model != OPUS:
@@ -39,6 +41,7 @@ def get_api_key() -> str:
     return key
 
 
+@lru_cache(maxsize=None)
 def get_store_path() -> str:
     return os.path.expanduser(
         os.getenv("MEMORY_STORE_PATH", "~/.claude-memory")
@@ -53,19 +56,49 @@ def get_database_url() -> str | None:
     return None
 
 
+def _env_int(name: str) -> int | None:
+    val = os.getenv(name, "").strip()
+    return int(val) if val.isdigit() else None
+
+
+@lru_cache(maxsize=None)
 def get_qdrant_config() -> dict:
-    """Return Qdrant connection config. Cloud if URL set, local otherwise."""
+    """Return Qdrant connection config. Cloud if URL set, local otherwise.
+
+    The hnsw_* keys are None unless overridden through CMK_HNSW_M,
+    CMK_HNSW_EF_CONSTRUCT and CMK_HNSW_EF, so deployments can compare
+    graph settings without a code change. Cloud mode talks gRPC unless
+    CMK_QDRANT_GRPC is set false (e.g. where only 443 is reachable).
+    Cached for the life of the process; treat the returned dict as
+    read-only.
+    """
     url = os.getenv("QDRANT_URL", "")
     api_key = os.getenv("QDRANT_API_KEY", "")
     jina_key = os.getenv("JINA_API_KEY", "")
+    hnsw = {
+        "hnsw_m": _env_int("CMK_HNSW_M"),
+        "hnsw_ef_construct": _env_int("CMK_HNSW_EF_CONSTRUCT"),
+        "hnsw_ef": _env_int("CMK_HNSW_EF"),
+    }
     if url and not url.startswith("<"):
+        grpc = os.getenv("CMK_QDRANT_GRPC", "true").lower() in ("true", "1", "yes")
         return {
             "mode": "cloud",
             "url": url,
             "api_key": api_key,
             "jina_api_key": jina_key,
+            "prefer_grpc": grpc,
+            **hnsw,
         }
-    return {"mode": "local"}
+    return {"mode": "local", **hnsw}
+
+
+def clear_config_cache() -> None:
+    """Forget cached settings and credentials so the next call re-reads them."""
+    from .cli_auth import _credentials_cache
+    for fn in (get_model, get_store_path, get_qdrant_config):
+        fn.cache_clear()
+    _credentials_cache.clear()
 
 
 def is_cloud_mode() -> bool:
@@ -73,6 +106,26 @@ def is_cloud_mode() -> bool:
     return cfg["mode"] == "cloud"
 
 
+def is_daemon_mode() -> bool:
+    """Route CLI commands through a long-lived local daemon (opt-in).
+
+    Opt-in because embedded Qdrant takes an exclusive lock on the store
+    directory: while the daemon holds it, other processes (the MCP
+    server, `cmk serve`) fall back to a disabled store.
+    """
+    return os.getenv("CMK_DAEMON", "").lower() in ("true", "1", "yes")
+
+
+def result_caches_enabled() -> bool:
+    """Cache search/recall results in-process (on unless CMK_RESULT_CACHE=false).
+
+    Writes only invalidate the caches of the process that made them, so
+    `cmk serve --workers` turns these off rather than let one worker
+    serve results another worker's write has made stale.
+    """
+    return os.getenv("CMK_RESULT_CACHE", "true").lower() in ("true", "1", "yes")
+
+
 # ---- Flow Mode ----
 
 FLOW_CHAR_THRESHOLD = 2000  # ~500 tokens
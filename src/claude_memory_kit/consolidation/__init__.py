@@ -1 +1 @@
-from .decay import compute_decay_score, is_fading
+from .decay import compute_decay_score, compute_decay_scores_bulk, fading_mask, is_fading
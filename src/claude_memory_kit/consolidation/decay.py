@@ -1,8 +1,14 @@
 import math
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
 from ..types import DecayClass, Memory
 
+if TYPE_CHECKING:
+    import numpy as np
+
+FADING_THRESHOLD = 0.1
+
 
 def compute_decay_score(memory: Memory) -> float:
     """0.0 = should archive, 1.0 = very alive."""
@@ -26,4 +32,33 @@ def _frequency(memory: Memory) -> float:
 def is_fading(memory: Memory) -> bool:
     if memory.decay_class == DecayClass.never:
         return False
-    return compute_decay_score(memory) < 0.1
+    return compute_decay_score(memory) < FADING_THRESHOLD
+
+
+def compute_decay_scores_bulk(memories: list[Memory]) -> "np.ndarray":
+    """compute_decay_score for many memories in one vectorized pass."""
+    # numpy costs ~90ms to import; only reflect's bulk pass needs it,
+    # not every tool that imports this package
+    import numpy as np
+    n = len(memories)
+    now = datetime.now(timezone.utc).timestamp()
+    last = np.fromiter((m.last_accessed.timestamp() for m in memories), float, n)
+    access = np.fromiter((m.access_count for m in memories), float, n)
+    # 0 marks "never decays"
+    half_life = np.fromiter(
+        (m.decay_class.half_life_days() or 0.0 for m in memories), float, n,
+    )
+    days_since = (now - last) / 86400
+    decays = half_life > 0
+    recency = np.ones(n)
+    recency[decays] = np.power(0.5, days_since[decays] / half_life[decays])
+    return recency * np.log2(access + 1)
+
+
+def fading_mask(memories: list[Memory]) -> "np.ndarray":
+    """Bulk is_fading: boolean array aligned with `memories`."""
+    import numpy as np
+    never = np.fromiter(
+        (m.decay_class == DecayClass.never for m in memories), bool, len(memories),
+    )
+    return ~never & (compute_decay_scores_bulk(memories) < FADING_THRESHOLD)
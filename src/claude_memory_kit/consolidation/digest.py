@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from collections import defaultdict
 
@@ -6,6 +7,8 @@ from ..types import Gate
 
 log = logging.getLogger("cmk")
 
+MAX_CONCURRENT_DIGESTS = 5
+
 
 async def consolidate_journals(
     db, api_key: str, user_id: str = "local"
@@ -23,33 +26,52 @@ async def consolidate_journals(
         week_key = dt.strftime("%G-W%V")
         week_groups[week_key].append(date_str)
 
-    digests_written = []
+    # One read for every stale date, already rendered as text per date
+    all_dates = [d for dates in week_groups.values() for d in dates]
+    text_by_date = db.concat_journal_for_dates(all_dates, user_id=user_id)
+
+    weeks = []
     for week_key, dates in week_groups.items():
-        combined = []
-        for date in dates:
-            entries = db.journal_by_date(date, user_id=user_id)
-            for e in entries:
-                combined.append(
-                    f"[{e['gate']}] {e['content']}"
-                )
-        if not combined:
-            continue
+        combined = "\n".join(
+            text_by_date[date] for date in dates if text_by_date.get(date)
+        )
+        if combined:
+            weeks.append((week_key, dates, combined))
 
-        digest = await consolidate_entries("\n".join(combined), api_key)
+    # Weeks are independent; overlap the LLM calls, capped for rate limits
+    sem = asyncio.Semaphore(MAX_CONCURRENT_DIGESTS)
 
-        # Store digest as a special journal entry
-        db.insert_journal_raw(
-            date=week_key,
-            gate=Gate.digest,
-            content=f"# Week {week_key}\n\n{digest}",
-            user_id=user_id,
-        )
+    async def _digest(text: str) -> str:
+        async with sem:
+            return await consolidate_entries(text, api_key)
+
+    results = await asyncio.gather(
+        *(_digest(text) for _, _, text in weeks), return_exceptions=True,
+    )
+
+    rows = []
+    archived: list[str] = []
+    error: BaseException | None = None
+    for (week_key, dates, _), digest in zip(weeks, results):
+        if isinstance(digest, BaseException):
+            log.warning("digest for %s failed: %s", week_key, digest)
+            error = error or digest
+            continue
+        # Stored as a special journal entry keyed by ISO week
+        rows.append((week_key, Gate.digest, f"# Week {week_key}\n\n{digest}"))
+        archived.extend(dates)
 
-        # Archive original entries
-        for date in dates:
-            db.archive_journal_date(date, user_id=user_id)
+    # One write for all digests, then one delete for their originals.
+    # Originals are only archived once their digests are safely stored.
+    if rows:
+        db.insert_journal_raw_many(rows, user_id=user_id)
+        db.archive_journal_dates(archived, user_id=user_id)
+    digests_written = [week_key for week_key, _, _ in rows]
 
-        digests_written.append(week_key)
+    # Keep the old contract: a failed synthesis still surfaces to the caller,
+    # after the weeks that did succeed are saved and archived
+    if error is not None:
+        raise error
 
     if not digests_written:
         return None
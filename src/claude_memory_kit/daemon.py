@@ -0,0 +1,236 @@
+"""Local daemon that keeps one Store open across CLI invocations.
+
+Each `cmk remember/recall/...` call otherwise builds a fresh Store, runs
+the SQLite migrations, and re-checks the Qdrant collection before doing
+any work. The daemon owns a single Store behind a Unix socket; CLI
+subcommands send it one JSON frame per call and fall back to an inline
+store when nothing is listening.
+
+Wire format: one line of JSON each way.
+    request:  {"cmd": "recall", "args": {"query": "..."}, "user_id": "local"}
+    response: {"result": "..."} or {"error": "..."}
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+
+from .config import get_store_path
+from .store import Store
+
+log = logging.getLogger("cmk")
+
+SOCKET_NAME = "cmk.sock"
+IDLE_TIMEOUT = 600.0    # seconds without a request before the daemon exits
+CONNECT_TIMEOUT = 0.2   # seconds to wait when probing the socket
+SPAWN_WAIT = 5.0        # seconds to wait for a freshly forked daemon
+
+COMMANDS = (
+    "remember", "recall", "reflect", "identity", "forget",
+    "extract", "prime", "scan", "classify",
+)
+
+
+class DaemonError(RuntimeError):
+    """The daemon took the request but the command failed or its reply
+    was lost. Either way it may already have run, so don't retry."""
+
+
+def get_socket_path() -> str:
+    return os.path.join(get_store_path(), SOCKET_NAME)
+
+
+def open_store() -> Store:
+    store = Store(get_store_path())
+    store.auth_db.migrate()
+    store.qdrant.ensure_collection()
+    store.qdrant.warmup()
+    return store
+
+
+async def run_command(store: Store, cmd: str, args: dict, user_id: str) -> str:
+    """Run one CLI command against an already-open store.
+
+    Shared by the daemon and the inline CLI fallback so both paths
+    produce identical output.
+    """
+    if cmd == "remember":
+        from .tools.remember import do_remember
+        return await do_remember(
+            store, args["content"], args["gate"],
+            args.get("person"), args.get("project"), user_id=user_id,
+        )
+    if cmd == "recall":
+        from .tools.recall import do_recall
+        return await do_recall(store, args["query"], user_id=user_id)
+    if cmd == "reflect":
+        from .tools.reflect import do_reflect
+        return await do_reflect(store, user_id=user_id)
+    if cmd == "identity":
+        from .tools.identity import do_identity
+        return await do_identity(store, user_id=user_id)
+    if cmd == "forget":
+        from .tools.forget import do_forget
+        return await do_forget(
+            store, args["memory_id"], args["reason"], user_id=user_id,
+        )
+    if cmd == "extract":
+        from .tools.auto_extract import do_auto_extract
+        return await do_auto_extract(store, args["transcript"], user_id=user_id)
+    if cmd == "prime":
+        from .tools.prime import do_prime
+        return await do_prime(store, args["message"], user_id=user_id)
+    if cmd == "scan":
+        from .tools.scan import do_scan
+        return await do_scan(store, user_id=user_id)
+    if cmd == "classify":
+        from .tools.classify import classify_memories, poll_classification_batches
+        if args.get("poll"):
+            return await poll_classification_batches(store, user_id=user_id)
+        return await classify_memories(
+            store, user_id=user_id, force=bool(args.get("force")),
+            use_batch_api=bool(args.get("batch")),
+        )
+    raise DaemonError(f"unknown command: {cmd}")
+
+
+# ---- Client side ----
+
+def request(cmd: str, args: dict, user_id: str) -> str | None:
+    """Send one command to a running daemon.
+
+    Returns None only when no daemon accepts the connection, so the
+    caller can fall back to an inline store. Once the frame is sent the
+    daemon may have acted on it: a failed command, or an empty or
+    truncated reply, raises DaemonError instead.
+    """
+    path = get_socket_path()
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except OSError:
+            return None
+        sock.settimeout(None)
+        frame = {"cmd": cmd, "args": args, "user_id": user_id}
+        buf = b""
+        try:
+            sock.sendall(json.dumps(frame).encode() + b"\n")
+            while not buf.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+        except OSError as e:
+            raise DaemonError(f"lost connection to daemon during {cmd}: {e}") from e
+    finally:
+        sock.close()
+    if not buf.endswith(b"\n"):
+        raise DaemonError(f"daemon closed the connection before replying to {cmd}")
+    try:
+        reply = json.loads(buf)
+    except ValueError as e:
+        raise DaemonError(f"unreadable reply from daemon: {e}") from e
+    if "error" in reply:
+        raise DaemonError(reply["error"])
+    return reply["result"]
+
+
+def is_running() -> bool:
+    path = get_socket_path()
+    if not os.path.exists(path):
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def spawn() -> bool:  # pragma: no cover - forks the test runner
+    """Fork a detached daemon and wait for its socket to accept connections."""
+    if is_running():
+        return True
+    pid = os.fork()
+    if pid == 0:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        try:
+            asyncio.run(serve())
+        finally:
+            os._exit(0)
+    deadline = time.monotonic() + SPAWN_WAIT
+    while time.monotonic() < deadline:
+        if is_running():
+            return True
+        time.sleep(0.05)
+    log.warning("cmk daemon did not come up within %.0fs", SPAWN_WAIT)
+    return False
+
+
+# ---- Server side ----
+
+async def _handle(store: Store, reader, writer) -> None:
+    try:
+        line = await reader.readline()
+        if not line:
+            return
+        try:
+            frame = json.loads(line)
+            result = await run_command(
+                store, frame["cmd"], frame.get("args") or {},
+                frame.get("user_id") or "local",
+            )
+            reply = {"result": result}
+        except Exception as e:
+            log.error("daemon command failed: %s", e)
+            reply = {"error": str(e)}
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(
+    store: Store | None = None, idle_timeout: float = IDLE_TIMEOUT,
+) -> None:
+    """Serve CLI requests until idle for `idle_timeout` seconds."""
+    path = get_socket_path()
+    if is_running():
+        log.info("cmk daemon already listening on %s", path)
+        return
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket from a crashed daemon
+    store = store or open_store()
+    last_seen = time.monotonic()
+
+    async def on_connect(reader, writer):
+        nonlocal last_seen
+        last_seen = time.monotonic()
+        await _handle(store, reader, writer)
+        last_seen = time.monotonic()
+
+    server = await asyncio.start_unix_server(on_connect, path=path)
+    os.chmod(path, 0o600)
+    log.info("cmk daemon listening on %s", path)
+    try:
+        while time.monotonic() - last_seen < idle_timeout:
+            await asyncio.sleep(min(1.0, idle_timeout))
+    finally:
+        server.close()
+        await server.wait_closed()
+        if os.path.exists(path):
+            os.unlink(path)
+        log.info("cmk daemon idle for %.0fs, exiting", idle_timeout)
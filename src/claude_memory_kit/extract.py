@@ -4,11 +4,13 @@ import os
 
 import httpx
 
+from .cache import make_key, synthesis_cache
 from .config import get_model
 
 log = logging.getLogger("cmk")
 
 ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages"
+ANTHROPIC_BATCHES_URL = f"{ANTHROPIC_API_URL}/batches"
 CMK_CLOUD_URL = os.getenv("CMK_API_URL", "https://cmk-api.onrender.com")
 
 EXTRACTION_PROMPT = """You are Claude's memory system. Read this conversation transcript and extract any memories worth keeping. Each memory must pass at least one write gate:
@@ -63,6 +65,14 @@ async def _call_cloud_proxy(
         return data["text"]
 
 
+def _anthropic_headers(api_key: str) -> dict:
+    return {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json",
+    }
+
+
 async def _call_anthropic_direct(
     system: str,
     user: str,
@@ -75,11 +85,7 @@ async def _call_anthropic_direct(
     async with httpx.AsyncClient(timeout=60.0) as client:
         resp = await client.post(
             ANTHROPIC_API_URL,
-            headers={
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json",
-            },
+            headers=_anthropic_headers(api_key),
             json={
                 "model": model,
                 "max_tokens": max_tokens,
@@ -94,6 +100,69 @@ async def _call_anthropic_direct(
         return data["content"][0]["text"]
 
 
+async def _submit_message_batch(
+    requests: list[tuple[str, str, str]],
+    api_key: str,
+    max_tokens: int = 4096,
+    model: str | None = None,
+) -> str:
+    """Queue (custom_id, system, user) prompts on the Message Batches API.
+
+    Batched requests are billed at half price and finish within 24 hours.
+    Direct Anthropic keys only; the cloud proxy has no batch endpoint.
+    Returns the batch id to poll with `_fetch_message_batch`.
+    """
+    model = model or get_model()
+    body = {"requests": [
+        {
+            "custom_id": custom_id,
+            "params": {
+                "model": model,
+                "max_tokens": max_tokens,
+                "system": system,
+                "messages": [{"role": "user", "content": user}],
+            },
+        }
+        for custom_id, system, user in requests
+    ]}
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        resp = await client.post(
+            ANTHROPIC_BATCHES_URL, headers=_anthropic_headers(api_key), json=body,
+        )
+        if resp.status_code != 200:
+            log.error("anthropic batch submit failed (%d): %s", resp.status_code, resp.text)
+            raise RuntimeError(f"anthropic batch submit failed ({resp.status_code})")
+        return resp.json()["id"]
+
+
+async def _fetch_message_batch(batch_id: str, api_key: str) -> dict[str, str] | None:
+    """Text of each succeeded request by custom_id, or None while processing.
+
+    Errored and expired requests are left out of the result.
+    """
+    headers = _anthropic_headers(api_key)
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        resp = await client.get(f"{ANTHROPIC_BATCHES_URL}/{batch_id}", headers=headers)
+        if resp.status_code != 200:
+            log.error("anthropic batch poll failed (%d): %s", resp.status_code, resp.text)
+            raise RuntimeError(f"anthropic batch poll failed ({resp.status_code})")
+        batch = resp.json()
+        if batch.get("processing_status") != "ended":
+            return None
+        resp = await client.get(batch["results_url"], headers=headers)
+        if resp.status_code != 200:
+            raise RuntimeError(f"anthropic batch results failed ({resp.status_code})")
+    texts: dict[str, str] = {}
+    for line in resp.text.splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        result = row.get("result") or {}
+        if result.get("type") == "succeeded":
+            texts[row["custom_id"]] = result["message"]["content"][0]["text"]
+    return texts
+
+
 async def _call_anthropic(
     system: str,
     user: str,
@@ -107,6 +176,25 @@ async def _call_anthropic(
     return await _call_anthropic_direct(system, user, api_key, max_tokens, model=model)
 
 
+async def _cached_call(
+    system: str, user: str, api_key: str, max_tokens: int,
+) -> str:
+    """_call_anthropic memoized on (model, prompt) for the cache TTL.
+
+    Empty answers are not cached so a transient blank reply is retried.
+    """
+    # Key on the model the call will actually use, not the raw env var
+    model = get_model()
+    key = make_key(model, system, user, str(max_tokens))
+    cached = synthesis_cache.get(key)
+    if cached is not None:
+        return cached
+    text = await _call_anthropic(system, user, api_key, max_tokens=max_tokens, model=model)
+    if text and text.strip():
+        synthesis_cache.set(key, text)
+    return text
+
+
 async def extract_memories(
     transcript: str, api_key: str
 ) -> list[dict]:
@@ -131,7 +219,7 @@ async def extract_memories(
 
 
 async def consolidate_entries(entries: str, api_key: str) -> str:
-    return await _call_anthropic(
+    return await _cached_call(
         CONSOLIDATION_PROMPT,
         f"Journal entries:\n{entries}",
         api_key,
@@ -142,7 +230,7 @@ async def consolidate_entries(entries: str, api_key: str) -> str:
 async def regenerate_identity(
     memories: str, api_key: str
 ) -> str:
-    return await _call_anthropic(
+    return await _cached_call(
         IDENTITY_PROMPT,
         f"Memories:\n{memories}",
         api_key,
@@ -16,7 +16,6 @@ from ..config import (
     get_store_path,
     is_flow_mode,
 )
-from ..types import Gate, JournalEntry
 
 log = logging.getLogger("cmk.flow")
 
@@ -100,6 +99,7 @@ async def _store_observation(tool_name: str, compressed: str) -> None:
     try:
         from ..cli_auth import get_user_id
         from ..store import Store
+        from ..types import Gate, JournalEntry
 
         store = Store(get_store_path())
         store.qdrant.ensure_collection()
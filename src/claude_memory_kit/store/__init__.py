@@ -1,8 +1,45 @@
 import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from .qdrant_store import QdrantStore
 from .sqlite import SqliteStore
 
+if TYPE_CHECKING:
+    from .qdrant_store import QdrantStore
+
+
+def __getattr__(name: str):
+    # qdrant_client costs ~1s to import; load it only when memories are
+    # actually touched so auth-only CLI commands start fast (PEP 562).
+    if name == "QdrantStore":
+        from .qdrant_store import QdrantStore
+        globals()["QdrantStore"] = QdrantStore
+        return QdrantStore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class StoreCounts:
+    """Points owned by one user, per payload type."""
+
+    memories: int = 0
+    journal: int = 0
+    identity: int = 0
+    rules: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.memories + self.journal + self.identity + self.rules
+
+    def to_dict(self) -> dict:
+        return {
+            "memories": self.memories,
+            "journal": self.journal,
+            "identity": self.identity,
+            "rules": self.rules,
+            "total": self.total,
+        }
+
 
 def _make_auth_db(path: str):
     """Create auth DB backend: Postgres if DATABASE_URL set, else SQLite."""
@@ -18,19 +55,52 @@ class Store:
 
     def __init__(self, path: str):
         self.path = path
-        self.qdrant = QdrantStore(path)
+        self._qdrant: "QdrantStore | None" = None
         self.auth_db = _make_auth_db(path)
 
+    @property
+    def qdrant(self) -> "QdrantStore":
+        """Memory store, opened on first use.
+
+        Embedded Qdrant loads its segments and takes a directory lock on
+        open, so auth-only callers (team and key management) never pay
+        for it.
+        """
+        if self._qdrant is None:
+            from . import QdrantStore
+            self._qdrant = QdrantStore(self.path)
+        return self._qdrant
+
+    @qdrant.setter
+    def qdrant(self, value: "QdrantStore") -> None:
+        self._qdrant = value
+
     async def init(self) -> None:
         # Only run SQLite migrations; Postgres schema is managed externally
         if not os.getenv("DATABASE_URL", "").strip():
             self.auth_db.migrate()
         self.qdrant.ensure_collection()
 
-    def count_user_data(self, user_id: str) -> dict:
-        count = self.qdrant.count_memories(user_id=user_id)
-        return {"memories": count, "total": count}
+    def count_user_data(self, user_id: str) -> StoreCounts:
+        by_type = self.qdrant.count_by_type(user_id=user_id)
+        return StoreCounts(
+            memories=by_type.get("memory", 0),
+            journal=by_type.get("journal", 0),
+            identity=by_type.get("identity", 0),
+            rules=by_type.get("rule", 0),
+        )
+
+    def migrate_user_data(
+        self, from_id: str, to_id: str, counts: StoreCounts | None = None,
+    ) -> StoreCounts:
+        """Reassign every point of `from_id` to `to_id`; returns what moved.
 
-    def migrate_user_data(self, from_id: str, to_id: str) -> dict:
-        count = self.qdrant.migrate_user_id(from_id, to_id)
-        return {"memories": count, "total": count}
+        Callers that just showed the user `count_user_data(from_id)` pass
+        it as `counts` to skip counting again.
+        """
+        if counts is None:
+            counts = self.count_user_data(from_id)
+        if not counts.total:
+            return counts
+        self.qdrant.migrate_user_id(from_id, to_id, count=counts.total)
+        return counts
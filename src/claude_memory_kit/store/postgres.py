@@ -2,9 +2,13 @@
 
 Used when DATABASE_URL is set. Connects to Supabase Postgres where
 BetterAuth manages core user/session tables and CMK adds api_keys,
-teams, and team_members.
+teams, team_members and pending_batches (see migrations/).
 """
 
+import json
+
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 import psycopg
@@ -16,6 +20,12 @@ class PostgresStore:
         self.conn = psycopg.connect(dsn, row_factory=dict_row)
         self.conn.autocommit = True
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several writes into one transaction (see SqliteStore)."""
+        with self.conn.transaction():
+            yield
+
     # ------------------------------------------------------------------ #
     #  Users (BetterAuth "user" table with CMK columns)                   #
     # ------------------------------------------------------------------ #
@@ -73,8 +83,11 @@ class PostgresStore:
             )
             row = cur.fetchone()
             if row:
+                # At most one row version a minute per key, not one per request
                 cur.execute(
-                    "UPDATE api_keys SET last_used = NOW() WHERE id = %s",
+                    "UPDATE api_keys SET last_used = NOW() WHERE id = %s "
+                    "AND (last_used IS NULL "
+                    "OR last_used < NOW() - INTERVAL '60 seconds')",
                     (row["id"],),
                 )
             return row
@@ -103,7 +116,9 @@ class PostgresStore:
 
     def create_team(self, team_id: str, name: str, created_by: str) -> dict:
         now = datetime.now(timezone.utc).isoformat()
-        with self.conn.cursor() as cur:
+        # Autocommit would leave a team without its owner if the second
+        # insert failed
+        with self.transaction(), self.conn.cursor() as cur:
             cur.execute(
                 "INSERT INTO teams (id, name, created_by, created) "
                 "VALUES (%s, %s, %s, %s)",
@@ -180,7 +195,7 @@ class PostgresStore:
             return row["role"] if row else None
 
     def delete_team(self, team_id: str) -> bool:
-        with self.conn.cursor() as cur:
+        with self.transaction(), self.conn.cursor() as cur:
             cur.execute(
                 "DELETE FROM team_members WHERE team_id = %s", (team_id,)
             )
@@ -188,3 +203,44 @@ class PostgresStore:
                 "DELETE FROM teams WHERE id = %s", (team_id,)
             )
             return cur.rowcount > 0
+
+    # ------------------------------------------------------------------ #
+    #  Pending message batches                                             #
+    # ------------------------------------------------------------------ #
+
+    def add_pending_batch(
+        self, batch_id: str, user_id: str, kind: str,
+        memory_ids: list[str] | None = None,
+    ) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        ids = json.dumps(memory_ids or [])
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO pending_batches (id, user_id, kind, created, memory_ids) "
+                "VALUES (%s, %s, %s, %s, %s) "
+                "ON CONFLICT (id) DO UPDATE SET memory_ids = %s",
+                (batch_id, user_id, kind, now, ids, ids),
+            )
+
+    def list_pending_batches(self, user_id: str, kind: str) -> list[str]:
+        """Batch ids of one kind awaiting results, oldest first."""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT id FROM pending_batches WHERE user_id = %s AND kind = %s "
+                "ORDER BY created",
+                (user_id, kind),
+            )
+            return [r["id"] for r in cur.fetchall()]
+
+    def pending_batch_memory_ids(self, user_id: str, kind: str) -> set[str]:
+        """Memory ids already queued in this user's pending batches."""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT memory_ids FROM pending_batches WHERE user_id = %s AND kind = %s",
+                (user_id, kind),
+            )
+            return {mid for r in cur.fetchall() for mid in json.loads(r["memory_ids"])}
+
+    def delete_pending_batch(self, batch_id: str) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM pending_batches WHERE id = %s", (batch_id,))
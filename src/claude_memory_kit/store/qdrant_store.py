@@ -7,42 +7,63 @@ are stored inline as payload arrays on memory points.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import os
 import struct
+import threading
 import time
+from collections.abc import Iterator
 from datetime import datetime, timezone
+from functools import cached_property, lru_cache
 
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import (
+    DeleteOperation,
     Distance,
     Document,
     FieldCondition,
     Filter,
     FilterSelector,
+    FloatIndexParams,
+    FloatIndexType,
     Fusion,
     FusionQuery,
     HnswConfigDiff,
     IsNullCondition,
     KeywordIndexParams,
     KeywordIndexType,
+    MatchAny,
     MatchText,
     MatchValue,
     Modifier,
     OrderBy,
+    OrderByQuery,
     PayloadField,
+    PointIdsList,
     PointStruct,
+    PointsList,
     Prefetch,
+    QuantizationSearchParams,
+    QueryRequest,
     Range,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SetPayload,
+    SetPayloadOperation,
     SparseVector,
     SparseVectorParams,
     TextIndexParams,
     TokenizerType,
+    UpsertOperation,
     VectorParams,
 )
 
-from ..config import get_qdrant_config
+from ..cache import TTLCache, invalidate_identity_cache, invalidate_search_cache
+from ..config import get_qdrant_config, result_caches_enabled
 from ..types import DecayClass, Gate, IdentityCard, JournalEntry, Memory, Visibility
 
 log = logging.getLogger("cmk")
@@ -50,56 +71,160 @@ log = logging.getLogger("cmk")
 COLLECTION = "cmk_memories"
 JINA_MODEL = "jinaai/jina-embeddings-v3"
 JINA_DIM = 1024
+# fastembed serves this from Qdrant/bge-small-en-v1.5-onnx-Q: an int8
+# quantized ONNX export, about half the size and CPU time of float32.
 LOCAL_MODEL = "BAAI/bge-small-en-v1.5"
+LOCAL_PROVIDERS = ["CPUExecutionProvider"]
+MODEL_CACHE_DIR = "models"  # under the store path; /tmp is wiped on reboot
 LOCAL_DIM = 384
 SPARSE_MODEL = "Qdrant/bm25"
 BM25_CLOUD_MODEL = "Qdrant/bm25"
-
-
+# int8 scalar quantization for dense vectors: 4x smaller, kept in RAM; the
+# top candidates are rescored against the original float32 vectors.
+DENSE_QUANTIZATION = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True),
+)
+# HNSW build/search settings. Cloud builds per-tenant graphs only (m=0,
+# payload_m) since every query filters on user_id. full_scan_threshold is
+# in KB of vectors: below it a brute-force scan beats the graph walk.
+HNSW_M = 16
+HNSW_EF_CONSTRUCT = 64
+HNSW_EF_SEARCH = 64
+HNSW_FULL_SCAN_KB = 1000
+DENSE_SEARCH_PARAMS = SearchParams(
+    hnsw_ef=HNSW_EF_SEARCH,
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+)
+# Two-stage dense search (prime's fast path): a cheap int8-only candidate
+# pass with a narrow beam, then an exact float32 rerank of the candidates.
+FAST_CANDIDATES = 50
+FAST_CANDIDATE_PARAMS = SearchParams(
+    hnsw_ef=32, quantization=QuantizationSearchParams(rescore=False),
+)
+FAST_RERANK_PARAMS = SearchParams(quantization=QuantizationSearchParams(ignore=True))
+WARMUP_MIN_POINTS = 100  # below this a cold query is already fast
+TEXT_CACHE_SIZE = 256
+TEXT_CACHE_TTL = 60.0  # seconds; also invalidated on every memory write
+QUERY_CACHE_SIZE = 128
+QUERY_CACHE_TTL = 60.0  # seconds; query vectors don't depend on stored data
+EMBED_BATCH_SIZE = 32  # texts per fastembed/ONNX inference batch
+STABLE_ID_CACHE_SIZE = 4096
+
+MEMORY_GATES = ("behavioral", "relational", "epistemic", "promissory", "correction")
+SENSITIVITY_LEVELS = ("safe", "sensitive", "critical")
+FACET_LIMIT = 32  # distinct values returned per facet; ours have < 10
+RECENT_JOURNAL_LIMIT = 500  # cap on one window; it feeds a synthesis prompt
+STATS_CACHE_SIZE = 256
+ITER_PAGE_SIZE = 100
+STATS_CACHE_TTL = 60.0  # seconds; bounds staleness from other processes' writes
+
+
+def _hnsw_setting(key: str, default: int) -> int:
+    """An HNSW knob from get_qdrant_config() (CMK_HNSW_*), else the default."""
+    value = get_qdrant_config().get(key)
+    return default if value is None else value
+
+
+def _dense_search_params() -> SearchParams:
+    ef = _hnsw_setting("hnsw_ef", HNSW_EF_SEARCH)
+    if ef == HNSW_EF_SEARCH:
+        return DENSE_SEARCH_PARAMS
+    return DENSE_SEARCH_PARAMS.model_copy(update={"hnsw_ef": ef})
+
+
+@lru_cache(maxsize=STABLE_ID_CACHE_SIZE)
 def _stable_id(key: str) -> int:
-    """Deterministic point ID from a string key."""
+    """Deterministic point ID from a string key.
+
+    Stored points are addressed by these ids, so the hash can never
+    change without re-keying every collection. Memoized instead: the same
+    memory, identity and rule keys are hashed on every touch and lookup.
+    """
     digest = hashlib.sha256(key.encode()).digest()
     return struct.unpack(">Q", digest[:8])[0] >> 1
 
 
+# Enum members by stored value: a dict hit is ~10x cheaper than Enum(value),
+# and this runs once per field for every memory a list or search returns.
+_GATES = {g.value: g for g in Gate}
+_DECAY_CLASSES = {d.value: d for d in DecayClass}
+_VISIBILITIES = {v.value: v for v in Visibility}
+
+
 def _memory_from_payload(payload: dict) -> Memory:
     """Reconstruct a Memory object from a Qdrant point payload."""
-    created_ts = payload.get("created", 0)
-    accessed_ts = payload.get("last_accessed", created_ts)
-    vis_str = payload.get("visibility", "private")
-    try:
-        vis = Visibility(vis_str)
-    except ValueError:
-        vis = Visibility.private
+    get = payload.get
+    created_ts = get("created", 0)
+    accessed_ts = get("last_accessed", created_ts)
+    gate = get("gate", "epistemic")
+    decay = get("decay_class", "moderate")
     return Memory(
-        id=payload.get("memory_id", ""),
+        id=get("memory_id", ""),
         created=datetime.fromtimestamp(created_ts, tz=timezone.utc),
-        gate=Gate(payload.get("gate", "epistemic")),
-        person=payload.get("person") or None,
-        project=payload.get("project") or None,
-        confidence=payload.get("confidence", 0.9),
+        gate=_GATES.get(gate) or Gate(gate),
+        person=get("person") or None,
+        project=get("project") or None,
+        confidence=get("confidence", 0.9),
         last_accessed=datetime.fromtimestamp(accessed_ts, tz=timezone.utc),
-        access_count=payload.get("access_count", 1),
-        decay_class=DecayClass(payload.get("decay_class", "moderate")),
-        content=payload.get("content", ""),
-        pinned=payload.get("pinned", False),
-        sensitivity=payload.get("sensitivity"),
-        sensitivity_reason=payload.get("sensitivity_reason"),
-        visibility=vis,
-        team_id=payload.get("team_id") or None,
-        created_by=payload.get("created_by") or None,
+        access_count=get("access_count", 1),
+        decay_class=_DECAY_CLASSES.get(decay) or DecayClass(decay),
+        content=get("content", ""),
+        pinned=get("pinned", False),
+        sensitivity=get("sensitivity"),
+        sensitivity_reason=get("sensitivity_reason"),
+        visibility=_VISIBILITIES.get(get("visibility", "private"), Visibility.private),
+        team_id=get("team_id") or None,
+        created_by=get("created_by") or None,
     )
 
 
+def _owned_memory(points: list, user_id: str) -> Memory | None:
+    """The Memory in a retrieve result, if it is a memory `user_id` owns."""
+    if not points:
+        return None
+    payload = points[0].payload
+    if payload.get("type") != "memory" or payload.get("user_id") != user_id:
+        return None
+    return _memory_from_payload(payload)
+
+
+def _touch_operations(memories: list[Memory]) -> list[SetPayloadOperation]:
+    """One access bump per fetched memory, counted from its fetched value."""
+    now = time.time()
+    return [
+        SetPayloadOperation(set_payload=SetPayload(
+            payload={"last_accessed": now, "access_count": m.access_count + 1},
+            points=[_stable_id(m.id)],
+        ))
+        for m in memories
+    ]
+
+
 class QdrantStore:
     """Cloud-only store. Everything lives in Qdrant payloads."""
 
+    # None lets fastembed use its own default cache directory
+    _model_cache_dir: str | None = None
+
     def __init__(self, store_path: str):
         self._disabled = False
+        self._ensured = False
         self._cloud = False
         self._jina_key = ""
         self._fastembed_dense = None
         self._fastembed_sparse = None
+        self._model_cache_dir = os.path.join(store_path, MODEL_CACHE_DIR)
+        # Async client for the API hot path. Cloud only: embedded Qdrant
+        # holds an exclusive lock, so local mode reuses the sync client
+        # from a worker thread instead.
+        self.aclient: AsyncQdrantClient | None = None
+        self._text_cache = TTLCache(
+            maxsize=TEXT_CACHE_SIZE,
+            ttl=TEXT_CACHE_TTL if result_caches_enabled() else 0.0,
+        )
+        self._query_cache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+        # Rolled-up memory counts for stats views, dropped on every write
+        self._stats_cache = TTLCache(maxsize=STATS_CACHE_SIZE, ttl=STATS_CACHE_TTL)
         cfg = get_qdrant_config()
 
         if cfg["mode"] == "cloud":
@@ -111,6 +236,14 @@ class QdrantStore:
                     url=cfg["url"],
                     api_key=cfg.get("api_key", ""),
                     cloud_inference=True,
+                    prefer_grpc=cfg.get("prefer_grpc", False),
+                    timeout=30,
+                )
+                self.aclient = AsyncQdrantClient(
+                    url=cfg["url"],
+                    api_key=cfg.get("api_key", ""),
+                    cloud_inference=True,
+                    prefer_grpc=cfg.get("prefer_grpc", False),
                     timeout=30,
                 )
             except Exception as e:
@@ -135,41 +268,121 @@ class QdrantStore:
     #  Embedding helpers                                                   #
     # ------------------------------------------------------------------ #
 
+    # The background warmup thread and the first search both reach for the
+    # models; loading under a lock keeps them from loading ONNX twice.
+    _model_lock = threading.Lock()
+
     @property
     def _local_dense_model(self):
         if self._fastembed_dense is None:
-            from fastembed import TextEmbedding
-            self._fastembed_dense = TextEmbedding(LOCAL_MODEL)
+            with self._model_lock:
+                if self._fastembed_dense is None:
+                    from fastembed import TextEmbedding
+                    self._fastembed_dense = TextEmbedding(
+                        LOCAL_MODEL, cache_dir=self._model_cache_dir,
+                        providers=LOCAL_PROVIDERS,
+                    )
         return self._fastembed_dense
 
     @property
     def _local_sparse_model(self):
         if self._fastembed_sparse is None:
-            from fastembed import SparseTextEmbedding
-            self._fastembed_sparse = SparseTextEmbedding(SPARSE_MODEL)
+            with self._model_lock:
+                if self._fastembed_sparse is None:
+                    from fastembed import SparseTextEmbedding
+                    self._fastembed_sparse = SparseTextEmbedding(
+                        SPARSE_MODEL, cache_dir=self._model_cache_dir,
+                    )
         return self._fastembed_sparse
 
+    # Vectors go to qdrant-client as plain lists: its pydantic models
+    # validate a numpy array element by element, ~20x slower than tolist().
     def _embed_local(self, text: str) -> list[float]:
-        return list(self._local_dense_model.embed([text]))[0].tolist()
+        return next(iter(self._local_dense_model.embed([text]))).tolist()
 
     def _embed_sparse_local(self, text: str) -> SparseVector:
-        emb = list(self._local_sparse_model.embed([text]))[0]
+        emb = next(iter(self._local_sparse_model.embed([text])))
         return SparseVector(indices=emb.indices.tolist(), values=emb.values.tolist())
 
+    def _embed_local_many(self, texts: list[str]) -> list[list[float]]:
+        embs = self._local_dense_model.embed(texts, batch_size=EMBED_BATCH_SIZE)
+        return [emb.tolist() for emb in embs]
+
+    def _embed_sparse_local_many(self, texts: list[str]) -> list[SparseVector]:
+        embs = self._local_sparse_model.embed(texts, batch_size=EMBED_BATCH_SIZE)
+        return [
+            SparseVector(indices=emb.indices.tolist(), values=emb.values.tolist())
+            for emb in embs
+        ]
+
     def _query_sparse_local(self, text: str) -> SparseVector:
-        emb = list(self._local_sparse_model.query_embed(text))[0]
+        emb = next(iter(self._local_sparse_model.query_embed(text)))
         return SparseVector(indices=emb.indices.tolist(), values=emb.values.tolist())
 
+    @cached_property
+    def _jina_options(self) -> dict[str, dict]:
+        """Inference options per Jina task; only `task` varies per call."""
+        return {
+            task: {"jina-api-key": self._jina_key, "dimensions": JINA_DIM, "task": task}
+            for task in ("retrieval.passage", "retrieval.query")
+        }
+
     def _jina_doc(self, text: str, task: str = "retrieval.passage"):
-        return Document(
-            text=text,
-            model=JINA_MODEL,
-            options={"jina-api-key": self._jina_key, "dimensions": JINA_DIM, "task": task},
-        )
+        return Document(text=text, model=JINA_MODEL, options=self._jina_options[task])
 
     def _sparse_doc(self, text: str):
         return Document(text=text, model=BM25_CLOUD_MODEL)
 
+    def _encode_sparse(self, query: str):
+        """BM25 query vector (local) or inference Document (cloud), memoized."""
+        key = ("sparse", query)
+        sparse = self._query_cache.get(key)
+        if sparse is None:
+            if self._cloud:
+                sparse = self._sparse_doc(query)
+            else:
+                sparse = self._query_sparse_local(query)
+            self._query_cache.set(key, sparse)
+        return sparse
+
+    def encode_query(self, query: str) -> tuple:
+        """(dense, sparse) query vectors, memoized for repeated queries.
+
+        Local mode runs both fastembed models per call, so a recall that
+        repeats within the TTL skips inference entirely. Cloud mode
+        embeds server-side; it reuses the built inference Documents,
+        which are never mutated once handed to the client.
+        """
+        key = ("dense", query)
+        dense = self._query_cache.get(key)
+        if dense is None:
+            if self._cloud:
+                dense = self._jina_doc(query, task="retrieval.query")
+            else:
+                dense = self._embed_local(query)
+            self._query_cache.set(key, dense)
+        return dense, self._encode_sparse(query)
+
+    def embed_passages(self, contents: list[str]) -> None:
+        """Embed texts that are about to be stored, in one batch per model.
+
+        Local mode only. fastembed pays tokenizer and ONNX session setup
+        per call, so a caller about to write several memories (auto
+        extract) embeds them together; the inserts that follow find their
+        vectors in the cache. Cloud mode embeds server-side.
+        """
+        if self._cloud or self._disabled:
+            return
+        todo = list(dict.fromkeys(
+            c for c in contents if self._query_cache.get(("passage", c)) is None
+        ))
+        if not todo:
+            return
+        dense = self._embed_local_many(todo)
+        sparse = self._embed_sparse_local_many(todo)
+        for content, d, sp in zip(todo, dense, sparse):
+            self._query_cache.set(("passage", content), {"dense": d, "sparse": sp})
+
     def _make_vector(self, content: str, *, query: bool = False) -> dict:
         if self._cloud:
             task = "retrieval.query" if query else "retrieval.passage"
@@ -182,10 +395,17 @@ class QdrantStore:
                 "dense": self._embed_local(content),
                 "sparse": self._query_sparse_local(content),
             }
-        return {
-            "dense": self._embed_local(content),
-            "sparse": self._embed_sparse_local(content),
-        }
+        # Memoized: a remember writes the same text as a journal entry
+        # and as a memory, and embed_passages may have batched it already.
+        key = ("passage", content)
+        vector = self._query_cache.get(key)
+        if vector is None:
+            vector = {
+                "dense": self._embed_local(content),
+                "sparse": self._embed_sparse_local(content),
+            }
+            self._query_cache.set(key, vector)
+        return vector
 
     # ------------------------------------------------------------------ #
     #  Collection management                                               #
@@ -193,15 +413,25 @@ class QdrantStore:
 
     def _create_hybrid_collection(self) -> None:
         dim = JINA_DIM if self._cloud else LOCAL_DIM
-        kwargs = {}
+        m = _hnsw_setting("hnsw_m", HNSW_M)
+        ef_construct = _hnsw_setting("hnsw_ef_construct", HNSW_EF_CONSTRUCT)
         if self._cloud:
-            kwargs["hnsw_config"] = HnswConfigDiff(payload_m=16, m=0)
+            hnsw = HnswConfigDiff(
+                m=0, payload_m=m, ef_construct=ef_construct,
+                full_scan_threshold=HNSW_FULL_SCAN_KB,
+            )
+        else:
+            hnsw = HnswConfigDiff(
+                m=m, ef_construct=ef_construct,
+                full_scan_threshold=HNSW_FULL_SCAN_KB,
+            )
 
         self.client.create_collection(
             collection_name=COLLECTION,
             vectors_config={"dense": VectorParams(size=dim, distance=Distance.COSINE)},
             sparse_vectors_config={"sparse": SparseVectorParams(modifier=Modifier.IDF)},
-            **kwargs,
+            hnsw_config=hnsw,
+            quantization_config=DENSE_QUANTIZATION,
         )
 
         self._ensure_indexes()
@@ -237,21 +467,55 @@ class QdrantStore:
             except Exception:
                 pass
 
-        # Tenant index for user_id (cloud only)
-        if self._cloud:
+        # Range indexes for time-window filters and order_by (Qdrant
+        # server rejects order_by on a field without one)
+        for field in ("timestamp", "created"):
             try:
                 self.client.create_payload_index(
                     collection_name=COLLECTION,
-                    field_name="user_id",
-                    field_schema=KeywordIndexParams(
-                        type=KeywordIndexType.KEYWORD, is_tenant=True,
-                    ),
+                    field_name=field,
+                    field_schema=FloatIndexParams(type=FloatIndexType.FLOAT),
                 )
             except Exception:
                 pass
 
+        # user_id filters every query: a tenant index in cloud (co-locates
+        # each user's points), a plain keyword index locally
+        try:
+            self.client.create_payload_index(
+                collection_name=COLLECTION,
+                field_name="user_id",
+                field_schema=KeywordIndexParams(
+                    type=KeywordIndexType.KEYWORD, is_tenant=self._cloud or None,
+                ),
+            )
+        except Exception:
+            pass
+
+    def _ensure_quantization(self) -> None:
+        """Enable int8 quantization on collections created before it existed.
+
+        Cloud only: embedded Qdrant does not quantize. The server rebuilds
+        the quantized copy in the background; searches keep working.
+        """
+        if not self._cloud:
+            return
+        try:
+            config = self.client.get_collection(COLLECTION).config
+            if config.quantization_config is None:
+                self.client.update_collection(
+                    collection_name=COLLECTION,
+                    quantization_config=DENSE_QUANTIZATION,
+                )
+                log.info("enabled int8 quantization on %s", COLLECTION)
+        except Exception as e:
+            log.warning("could not enable quantization on %s: %s", COLLECTION, e)
+
     def ensure_collection(self) -> None:
-        if self._disabled:
+        """Create the collection, or bring an existing one's indexes and
+        quantization up to date. Runs its round-trips once per instance.
+        """
+        if self._disabled or self._ensured:
             return
         try:
             names = [c.name for c in self.client.get_collections().collections]
@@ -260,11 +524,41 @@ class QdrantStore:
                 log.info("created collection: %s (cloud=%s)", COLLECTION, self._cloud)
             else:
                 self._ensure_indexes()
+                self._ensure_quantization()
+            self._ensured = True
         except Exception as e:
             log.warning("collection setup failed: %s. store disabled.", e)
             self.client = None
             self._disabled = True
 
+    def warmup(self) -> None:
+        """Pay first-query costs up front in long-lived processes.
+
+        Runs a throwaway dense query so the HNSW graph and vector pages are
+        resident, and in local mode loads the fastembed models, which
+        otherwise happen on the first user recall. Failures are ignored.
+        """
+        if self._disabled:
+            return
+        dim = JINA_DIM if self._cloud else LOCAL_DIM
+        try:
+            if not self._cloud:
+                self._embed_local("warmup")
+                self._query_sparse_local("warmup")
+            points = self.client.count(collection_name=COLLECTION, exact=False).count
+            if points < WARMUP_MIN_POINTS:
+                return
+            self.client.query_points(
+                collection_name=COLLECTION,
+                query=[1.0] * dim,
+                using="dense",
+                limit=1,
+                with_payload=False,
+                search_params=SearchParams(hnsw_ef=16),
+            )
+        except Exception as e:
+            log.debug("qdrant warmup failed: %s", e)
+
     # ------------------------------------------------------------------ #
     #  Scroll helper                                                       #
     # ------------------------------------------------------------------ #
@@ -275,6 +569,7 @@ class QdrantStore:
         limit: int = 100,
         order_by: str | None = None,
         order_direction: str = "desc",
+        with_payload: bool | list[str] = True,
     ) -> list:
         """Scroll with filter, return all matching points up to limit."""
         if self._disabled:
@@ -283,7 +578,7 @@ class QdrantStore:
             "collection_name": COLLECTION,
             "scroll_filter": Filter(must=conditions),
             "limit": limit,
-            "with_payload": True,
+            "with_payload": with_payload,
             "with_vectors": False,
         }
         if order_by:
@@ -318,16 +613,14 @@ class QdrantStore:
             "edges": [],
         }
 
-    def insert_memory(
+    def _memory_point(
         self,
         memory: Memory,
-        user_id: str = "local",
+        user_id: str,
         visibility: str | None = None,
         team_id: str | None = None,
         created_by: str | None = None,
-    ) -> None:
-        if self._disabled:
-            return
+    ) -> PointStruct:
         # Apply team overrides to a copy of the memory
         if visibility or team_id or created_by:
             updates = {}
@@ -341,9 +634,43 @@ class QdrantStore:
         point_id = _stable_id(memory.id)
         payload = self._memory_payload(memory, user_id)
         vector = self._make_vector(memory.content)
+        return PointStruct(id=point_id, vector=vector, payload=payload)
+
+    def insert_memory(
+        self,
+        memory: Memory,
+        user_id: str = "local",
+        visibility: str | None = None,
+        team_id: str | None = None,
+        created_by: str | None = None,
+    ) -> None:
+        if self._disabled:
+            return
+        self._memories_changed(user_id)
         self.client.upsert(
             collection_name=COLLECTION,
-            points=[PointStruct(id=point_id, vector=vector, payload=payload)],
+            points=[self._memory_point(memory, user_id, visibility, team_id, created_by)],
+        )
+
+    async def ainsert_memory(
+        self,
+        memory: Memory,
+        user_id: str = "local",
+        visibility: str | None = None,
+        team_id: str | None = None,
+        created_by: str | None = None,
+    ) -> None:
+        if self._disabled:
+            return
+        if self.aclient is None:
+            await asyncio.to_thread(
+                self.insert_memory, memory, user_id, visibility, team_id, created_by,
+            )
+            return
+        self._memories_changed(user_id)
+        await self.aclient.upsert(
+            collection_name=COLLECTION,
+            points=[self._memory_point(memory, user_id, visibility, team_id, created_by)],
         )
 
     def get_memory(self, memory_id: str, user_id: str = "local") -> Memory | None:
@@ -358,6 +685,27 @@ class QdrantStore:
             return None
         return _memory_from_payload(points[0].payload)
 
+    def get_memories(
+        self, memory_ids: list[str], user_id: str = "local",
+    ) -> dict[str, Memory]:
+        """Memories by id in one request; ids `user_id` doesn't own are left out.
+
+        Point ids derive from memory ids, so this is a single retrieve
+        rather than one filtered scroll per id.
+        """
+        if self._disabled or not memory_ids:
+            return {}
+        points = self.client.retrieve(
+            collection_name=COLLECTION,
+            ids=[_stable_id(mid) for mid in dict.fromkeys(memory_ids)],
+            with_payload=True, with_vectors=False,
+        )
+        found = {}
+        for p in points:
+            if p.payload.get("type") == "memory" and p.payload.get("user_id") == user_id:
+                found[p.payload["memory_id"]] = _memory_from_payload(p.payload)
+        return found
+
     def list_memories(
         self,
         limit: int = 50,
@@ -384,16 +732,7 @@ class QdrantStore:
                 extra_must.append(FieldCondition(key="project", match=MatchValue(value=project)))
             combined_must = list(base_filter.must or []) + extra_must
             scroll_filter = Filter(must=combined_must, should=base_filter.should)
-            fetch_limit = offset + limit
-            results, _ = self.client.scroll(
-                collection_name=COLLECTION,
-                scroll_filter=scroll_filter,
-                limit=fetch_limit,
-                with_payload=True,
-                with_vectors=False,
-                order_by=OrderBy(key="created", direction="desc"),
-            )
-            return [_memory_from_payload(p.payload) for p in results[offset:]]
+            return self._newest_page(scroll_filter, limit, offset)
 
         conditions = [
             FieldCondition(key="type", match=MatchValue(value="memory")),
@@ -410,23 +749,129 @@ class QdrantStore:
         if team_id:
             conditions.append(FieldCondition(key="team_id", match=MatchValue(value=team_id)))
 
-        # Fetch offset + limit, then skip offset on client side
-        fetch_limit = offset + limit
-        points = self._scroll_all(conditions, limit=fetch_limit, order_by="created")
-        return [_memory_from_payload(p.payload) for p in points[offset:]]
+        return self._newest_page(Filter(must=conditions), limit, offset)
+
+    def _newest_page(
+        self, scroll_filter: Filter, limit: int, offset: int,
+    ) -> list[Memory]:
+        """One page of memories, newest first.
+
+        Qdrant can't skip rows of an order_by scroll, so later pages walk
+        past `offset` points. They walk with ids only and then retrieve
+        full payloads for the page itself, rather than shipping every
+        skipped memory's content to throw it away.
+        """
+        order_by = OrderBy(key="created", direction="desc")
+        if offset == 0:
+            points, _ = self.client.scroll(
+                collection_name=COLLECTION, scroll_filter=scroll_filter,
+                limit=limit, order_by=order_by,
+                with_payload=True, with_vectors=False,
+            )
+            return [_memory_from_payload(p.payload) for p in points]
+        points, _ = self.client.scroll(
+            collection_name=COLLECTION, scroll_filter=scroll_filter,
+            limit=offset + limit, order_by=order_by,
+            with_payload=False, with_vectors=False,
+        )
+        page_ids = [p.id for p in points[offset:]]
+        if not page_ids:
+            return []
+        by_id = {
+            p.id: p for p in self.client.retrieve(
+                collection_name=COLLECTION, ids=page_ids,
+                with_payload=True, with_vectors=False,
+            )
+        }
+        return [
+            _memory_from_payload(by_id[pid].payload)
+            for pid in page_ids if pid in by_id
+        ]
+
+    def iter_memories(
+        self, user_id: str = "local", limit: int | None = None,
+        page_size: int = ITER_PAGE_SIZE,
+    ) -> Iterator[Memory]:
+        """Yield a user's memories page by page, in point-id order.
+
+        For whole-collection passes (scan, export) that don't need the
+        newest-first ordering of list_memories: only one page of
+        payloads is held at a time, and the caller can stop early.
+        """
+        if self._disabled:
+            return
+        scroll_filter = Filter(must=[
+            FieldCondition(key="type", match=MatchValue(value="memory")),
+            FieldCondition(key="user_id", match=MatchValue(value=user_id)),
+        ])
+        remaining = limit
+        offset = None
+        while remaining is None or remaining > 0:
+            batch = page_size if remaining is None else min(page_size, remaining)
+            points, offset = self.client.scroll(
+                collection_name=COLLECTION,
+                scroll_filter=scroll_filter,
+                limit=batch,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            for p in points:
+                yield _memory_from_payload(p.payload)
+            if remaining is not None:
+                remaining -= len(points)
+            if offset is None:
+                return
 
     def delete_memory(self, memory_id: str, user_id: str = "local") -> Memory | None:
-        mem = self.get_memory(memory_id, user_id)
-        if mem is None:
+        """Delete one memory and return it, or None if `user_id` has no such memory.
+
+        The point id is derived from the memory id, so this is a lookup by
+        id and a delete by id, not two filtered scans.
+        """
+        if self._disabled:
             return None
+        point_id = _stable_id(memory_id)
+        points = self.client.retrieve(
+            collection_name=COLLECTION, ids=[point_id],
+            with_payload=True, with_vectors=False,
+        )
+        memory = _owned_memory(points, user_id)
+        if memory is not None:
+            self._memories_changed(user_id)
+            self.client.delete(collection_name=COLLECTION, points_selector=[point_id])
+        return memory
+
+    async def adelete_memory(self, memory_id: str, user_id: str = "local") -> Memory | None:
+        """Non-blocking `delete_memory` for async callers."""
+        if self._disabled:
+            return None
+        if self.aclient is None:
+            return await asyncio.to_thread(self.delete_memory, memory_id, user_id)
+        point_id = _stable_id(memory_id)
+        points = await self.aclient.retrieve(
+            collection_name=COLLECTION, ids=[point_id],
+            with_payload=True, with_vectors=False,
+        )
+        memory = _owned_memory(points, user_id)
+        if memory is not None:
+            self._memories_changed(user_id)
+            await self.aclient.delete(collection_name=COLLECTION, points_selector=[point_id])
+        return memory
+
+    def delete_memories(self, memory_ids: list[str], user_id: str = "local") -> None:
+        """Delete several of `user_id`'s memories with a single filtered delete."""
+        if self._disabled or not memory_ids:
+            return
+        self._memories_changed(user_id)
         self.client.delete(
             collection_name=COLLECTION,
             points_selector=FilterSelector(filter=Filter(must=[
-                FieldCondition(key="memory_id", match=MatchValue(value=memory_id)),
+                FieldCondition(key="type", match=MatchValue(value="memory")),
                 FieldCondition(key="user_id", match=MatchValue(value=user_id)),
+                FieldCondition(key="memory_id", match=MatchAny(any=list(memory_ids))),
             ])),
         )
-        return mem
 
     def touch_memory(self, memory_id: str, user_id: str = "local") -> None:
         if self._disabled:
@@ -435,7 +880,7 @@ class QdrantStore:
             FieldCondition(key="type", match=MatchValue(value="memory")),
             FieldCondition(key="memory_id", match=MatchValue(value=memory_id)),
             FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-        ], limit=1)
+        ], limit=1, with_payload=["access_count"])
         if not points:
             return
         pt = points[0]
@@ -447,6 +892,29 @@ class QdrantStore:
             points=[pt.id],
         )
 
+    def touch_memories(self, memories: list[Memory]) -> None:
+        """Record an access on memories the caller has just fetched.
+
+        Counts are bumped from the fetched values, so the whole set is
+        one batch request with no re-read.
+        """
+        if self._disabled or not memories:
+            return
+        self.client.batch_update_points(
+            collection_name=COLLECTION, update_operations=_touch_operations(memories),
+        )
+
+    async def atouch_memories(self, memories: list[Memory]) -> None:
+        """Non-blocking `touch_memories` for async callers."""
+        if self._disabled or not memories:
+            return
+        if self.aclient is None:
+            await asyncio.to_thread(self.touch_memories, memories)
+            return
+        await self.aclient.batch_update_points(
+            collection_name=COLLECTION, update_operations=_touch_operations(memories),
+        )
+
     def update_memory(self, memory_id: str, user_id: str = "local", **kwargs) -> None:
         if self._disabled:
             return
@@ -458,6 +926,7 @@ class QdrantStore:
         if not points:
             return
         pt = points[0]
+        self._memories_changed(user_id)
         payload_update = {}
         for field in ("content", "gate", "person", "project"):
             if field in kwargs:
@@ -480,23 +949,35 @@ class QdrantStore:
             )
 
     def set_pinned(self, memory_id: str, pinned: bool, user_id: str = "local") -> None:
+        self._set_memory_payload(memory_id, user_id, {"pinned": pinned})
+
+    def _set_memory_payload(self, memory_id: str, user_id: str, payload: dict) -> None:
+        """Write payload fields on one owned memory in a single request.
+
+        The filter selector matches by memory_id and owner server-side,
+        so there is no scroll to find the point id first, and nothing
+        happens when the memory doesn't exist.
+        """
         if self._disabled:
             return
-        points = self._scroll_all([
-            FieldCondition(key="type", match=MatchValue(value="memory")),
-            FieldCondition(key="memory_id", match=MatchValue(value=memory_id)),
-            FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-        ], limit=1)
-        if points:
-            self.client.set_payload(
-                collection_name=COLLECTION,
-                payload={"pinned": pinned},
-                points=[points[0].id],
-            )
+        self._memories_changed(user_id)
+        self.client.set_payload(
+            collection_name=COLLECTION,
+            payload=payload,
+            points=FilterSelector(filter=Filter(must=[
+                FieldCondition(key="type", match=MatchValue(value="memory")),
+                FieldCondition(key="memory_id", match=MatchValue(value=memory_id)),
+                FieldCondition(key="user_id", match=MatchValue(value=user_id)),
+            ])),
+        )
 
     def count_memories(self, user_id: str = "local") -> int:
         if self._disabled:
             return 0
+        key = ("total", user_id)
+        cached = self._stats_cache.get(key)
+        if cached is not None:
+            return cached
         result = self.client.count(
             collection_name=COLLECTION,
             count_filter=Filter(must=[
@@ -505,42 +986,64 @@ class QdrantStore:
             ]),
             exact=True,
         )
+        self._stats_cache.set(key, result.count)
         return result.count
 
-    def count_by_gate(self, user_id: str = "local") -> dict[str, int]:
+    def _facet_counts(
+        self, key: str, user_id: str, memories_only: bool = False,
+    ) -> dict[str, int]:
+        """Exact per-value counts of a keyword payload field, in one call."""
         if self._disabled:
             return {}
-        counts = {}
-        for gate in ("behavioral", "relational", "epistemic", "promissory", "correction"):
-            result = self.client.count(
-                collection_name=COLLECTION,
-                count_filter=Filter(must=[
-                    FieldCondition(key="type", match=MatchValue(value="memory")),
-                    FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-                    FieldCondition(key="gate", match=MatchValue(value=gate)),
-                ]),
-                exact=True,
+        conditions = [FieldCondition(key="user_id", match=MatchValue(value=user_id))]
+        if memories_only:
+            conditions.append(
+                FieldCondition(key="type", match=MatchValue(value="memory"))
             )
-            if result.count > 0:
-                counts[gate] = result.count
-        return counts
+        result = self.client.facet(
+            collection_name=COLLECTION,
+            key=key,
+            facet_filter=Filter(must=conditions),
+            limit=FACET_LIMIT,
+            exact=True,
+        )
+        return {hit.value: hit.count for hit in result.hits}
+
+    def count_by_type(self, user_id: str = "local") -> dict[str, int]:
+        """Points per payload type (memory, journal, identity, rule) for one user."""
+        return self._facet_counts("type", user_id)
+
+    def count_by_gate(self, user_id: str = "local") -> dict[str, int]:
+        if self._disabled:
+            return {}
+        key = ("gate", user_id)
+        cached = self._stats_cache.get(key)
+        if cached is None:
+            counts = self._facet_counts("gate", user_id, memories_only=True)
+            cached = {g: counts[g] for g in MEMORY_GATES if counts.get(g)}
+            self._stats_cache.set(key, cached)
+        return dict(cached)
+
+    def _memories_changed(self, *user_ids: str | None) -> None:
+        """Drop cached hits and counts after a write to these users' memories.
+
+        Covers the process-wide /api/search and MCP recall caches too, so
+        no write path can leave them serving stale or deleted content.
+        """
+        self._text_cache.invalidate()
+        self._stats_cache.invalidate()
+        for user_id in user_ids:
+            invalidate_search_cache(user_id)
 
     def update_sensitivity(
         self, memory_id: str, sensitivity: str, reason: str | None, user_id: str = "local",
     ) -> None:
         if self._disabled:
             return
-        points = self._scroll_all([
-            FieldCondition(key="type", match=MatchValue(value="memory")),
-            FieldCondition(key="memory_id", match=MatchValue(value=memory_id)),
-            FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-        ], limit=1)
-        if points:
-            self.client.set_payload(
-                collection_name=COLLECTION,
-                payload={"sensitivity": sensitivity, "sensitivity_reason": reason},
-                points=[points[0].id],
-            )
+        self._set_memory_payload(
+            memory_id, user_id,
+            {"sensitivity": sensitivity, "sensitivity_reason": reason},
+        )
 
     def list_memories_by_sensitivity(
         self, sensitivity: str | None, limit: int = 50, offset: int = 0, user_id: str = "local",
@@ -559,42 +1062,21 @@ class QdrantStore:
             conditions.append(
                 FieldCondition(key="sensitivity", match=MatchValue(value=sensitivity))
             )
-        fetch_limit = offset + limit
-        points = self._scroll_all(conditions, limit=fetch_limit, order_by="created")
-        return [_memory_from_payload(p.payload) for p in points[offset:]]
+        return self._newest_page(Filter(must=conditions), limit, offset)
 
     def count_by_sensitivity(self, user_id: str = "local") -> dict[str, int]:
         if self._disabled:
             return {}
-        counts = {}
-        for level in ("safe", "sensitive", "critical"):
-            result = self.client.count(
-                collection_name=COLLECTION,
-                count_filter=Filter(must=[
-                    FieldCondition(key="type", match=MatchValue(value="memory")),
-                    FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-                    FieldCondition(key="sensitivity", match=MatchValue(value=level)),
-                ]),
-                exact=True,
-            )
-            if result.count > 0:
-                counts[level] = result.count
-        return counts
+        key = ("sensitivity", user_id)
+        cached = self._stats_cache.get(key)
+        if cached is None:
+            counts = self._facet_counts("sensitivity", user_id, memories_only=True)
+            cached = {lv: counts[lv] for lv in SENSITIVITY_LEVELS if counts.get(lv)}
+            self._stats_cache.set(key, cached)
+        return dict(cached)
 
     def update_confidence(self, memory_id: str, confidence: float, user_id: str = "local") -> None:
-        if self._disabled:
-            return
-        points = self._scroll_all([
-            FieldCondition(key="type", match=MatchValue(value="memory")),
-            FieldCondition(key="memory_id", match=MatchValue(value=memory_id)),
-            FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-        ], limit=1)
-        if points:
-            self.client.set_payload(
-                collection_name=COLLECTION,
-                payload={"confidence": confidence},
-                points=[points[0].id],
-            )
+        self._set_memory_payload(memory_id, user_id, {"confidence": confidence})
 
     # ------------------------------------------------------------------ #
     #  Search                                                              #
@@ -625,82 +1107,225 @@ class QdrantStore:
             must.append(FieldCondition(key="user_id", match=MatchValue(value=user_id)))
         return Filter(must=must)
 
-    def search(
-        self, query: str, limit: int = 5, user_id: str | None = None,
-        team_id: str | None = None,
-    ) -> list[tuple[str, float]]:
-        if self._disabled:
-            return []
-
+    def _hybrid_query(
+        self, query: str, limit: int, user_id: str | None, team_id: str | None,
+    ) -> dict:
+        """query_points kwargs for dense + sparse prefetch fused with RRF."""
         query_filter = self._build_memory_filter(user_id=user_id, team_id=team_id)
 
-        if self._cloud:
-            dense_query = self._jina_doc(query, task="retrieval.query")
-            sparse_query = self._sparse_doc(query)
-        else:
-            dense_query = self._embed_local(query)
-            sparse_query = self._query_sparse_local(query)
-
+        dense_query, sparse_query = self.encode_query(query)
         prefetch_limit = max(limit * 4, 20)
 
-        results = self.client.query_points(
+        return dict(
             collection_name=COLLECTION,
             prefetch=[
-                Prefetch(query=dense_query, using="dense", limit=prefetch_limit, filter=query_filter),
+                Prefetch(
+                    query=dense_query, using="dense", limit=prefetch_limit,
+                    filter=query_filter, params=_dense_search_params(),
+                ),
                 Prefetch(query=sparse_query, using="sparse", limit=prefetch_limit, filter=query_filter),
             ],
             query=FusionQuery(fusion=Fusion.RRF),
             limit=limit,
-            with_payload=True,
+            with_payload=["memory_id"],
         )
 
-        return [(p.payload.get("memory_id", ""), p.score) for p in results.points]
-
-    def search_text(
+    def search(
         self, query: str, limit: int = 5, user_id: str | None = None,
         team_id: str | None = None,
     ) -> list[tuple[str, float]]:
         if self._disabled:
             return []
+        results = self.client.query_points(
+            **self._hybrid_query(query, limit, user_id, team_id)
+        )
+        return [(p.payload.get("memory_id", ""), p.score) for p in results.points]
+
+    def search_dense(
+        self, query: str, limit: int = 3, user_id: str | None = None,
+        candidates: int = FAST_CANDIDATES,
+    ) -> list[tuple[str, float]]:
+        """Dense-only search returning cosine scores, for low-latency callers.
+
+        The top `candidates` are found on the quantized vectors alone, then
+        only those are rescored against the full-precision vectors.
+        """
+        if self._disabled:
+            return []
+        results = self.client.query_points(
+            **self._dense_query(query, limit, user_id, candidates)
+        )
+        return [(p.payload.get("memory_id", ""), p.score) for p in results.points]
+
+    def _dense_query(
+        self, query: str, limit: int, user_id: str | None, candidates: int,
+    ) -> dict:
+        """query_points kwargs for `search_dense`'s two-stage dense search."""
+        dense_query, _ = self.encode_query(query)
+        query_filter = self._build_memory_filter(user_id=user_id)
+        return dict(
+            collection_name=COLLECTION,
+            prefetch=Prefetch(
+                query=dense_query, using="dense", limit=max(candidates, limit),
+                filter=query_filter, params=FAST_CANDIDATE_PARAMS,
+            ),
+            query=dense_query,
+            using="dense",
+            # Embedded Qdrant is always exact and warns on search_params
+            search_params=FAST_RERANK_PARAMS if self._cloud else None,
+            limit=limit,
+            with_payload=["memory_id"],
+        )
+
+    def _text_query(
+        self, query: str, limit: int, user_id: str | None, team_id: str | None,
+        with_payload: bool | list[str] | None = None, ranked: bool = True,
+    ) -> dict:
+        """query_points kwargs for BM25-ranked full-text matches.
+
+        The payload text match keeps only memories containing every query
+        term; the sparse (BM25, IDF-weighted) vector ranks them so the
+        top `limit` come back best-first instead of in storage order.
+        A query of only stopwords has an empty BM25 vector and would rank
+        nothing, so it (or `ranked=False`) runs as the bare filtered match.
+        """
         base_filter = self._build_memory_filter(user_id=user_id, team_id=team_id)
         # Add text match to the must conditions
         text_cond = FieldCondition(key="content", match=MatchText(text=query))
         combined_must = list(base_filter.must or []) + [text_cond]
-        scroll_filter = Filter(must=combined_must, should=base_filter.should)
-        results, _ = self.client.scroll(
+        kwargs = dict(
             collection_name=COLLECTION,
-            scroll_filter=scroll_filter,
+            query_filter=Filter(must=combined_must, should=base_filter.should),
             limit=limit,
-            with_payload=True,
-            with_vectors=False,
+            with_payload=["memory_id"] if with_payload is None else with_payload,
+        )
+        if ranked:
+            sparse = self._encode_sparse(query)
+            if not isinstance(sparse, SparseVector) or sparse.indices:
+                kwargs.update(query=sparse, using="sparse")
+        return kwargs
+
+    def _text_points(
+        self, query: str, limit: int, user_id: str | None, team_id: str | None,
+        with_payload: bool | list[str] | None = None,
+    ) -> list:
+        kwargs = self._text_query(query, limit, user_id, team_id, with_payload)
+        points = self.client.query_points(**kwargs).points
+        # Cloud BM25 is computed server-side, so an empty query vector
+        # only shows up as no hits; retry as the unranked match.
+        if not points and self._cloud and "query" in kwargs:
+            points = self.client.query_points(**self._text_query(
+                query, limit, user_id, team_id, with_payload, ranked=False,
+            )).points
+        return points
+
+    async def _atext_points(
+        self, query: str, limit: int, user_id: str | None, team_id: str | None,
+    ) -> list:
+        """`_text_points` on the async client."""
+        kwargs = self._text_query(query, limit, user_id, team_id)
+        points = (await self.aclient.query_points(**kwargs)).points
+        if not points and self._cloud and "query" in kwargs:
+            points = (await self.aclient.query_points(**self._text_query(
+                query, limit, user_id, team_id, ranked=False,
+            ))).points
+        return points
+
+    def search_text(
+        self, query: str, limit: int = 5, user_id: str | None = None,
+        team_id: str | None = None,
+    ) -> list[tuple[str, float]]:
+        if self._disabled:
+            return []
+        key = (query, limit, user_id, team_id)
+        hits = self._text_cache.get(key)
+        if hits is None:
+            points = self._text_points(query, limit, user_id, team_id)
+            hits = [(p.payload.get("memory_id", ""), p.score) for p in points]
+            self._text_cache.set(key, hits)
+        return list(hits)
+
+    async def asearch(
+        self, query: str, limit: int = 5, user_id: str | None = None,
+        team_id: str | None = None,
+    ) -> list[tuple[str, float]]:
+        """Non-blocking `search` for async callers (API, MCP server)."""
+        if self._disabled:
+            return []
+        if self.aclient is None:
+            return await asyncio.to_thread(self.search, query, limit, user_id, team_id)
+        results = await self.aclient.query_points(
+            **self._hybrid_query(query, limit, user_id, team_id)
+        )
+        return [(p.payload.get("memory_id", ""), p.score) for p in results.points]
+
+    async def asearch_dense(
+        self, query: str, limit: int = 3, user_id: str | None = None,
+        candidates: int = FAST_CANDIDATES,
+    ) -> list[tuple[str, float]]:
+        """Non-blocking `search_dense` for async callers."""
+        if self._disabled:
+            return []
+        if self.aclient is None:
+            return await asyncio.to_thread(
+                self.search_dense, query, limit, user_id, candidates,
+            )
+        results = await self.aclient.query_points(
+            **self._dense_query(query, limit, user_id, candidates)
         )
-        return [(p.payload.get("memory_id", ""), 1.0) for p in results]
+        return [(p.payload.get("memory_id", ""), p.score) for p in results.points]
+
+    async def asearch_text(
+        self, query: str, limit: int = 5, user_id: str | None = None,
+        team_id: str | None = None,
+    ) -> list[tuple[str, float]]:
+        """Non-blocking `search_text` for async callers."""
+        if self._disabled:
+            return []
+        if self.aclient is None:
+            return await asyncio.to_thread(
+                self.search_text, query, limit, user_id, team_id,
+            )
+        key = (query, limit, user_id, team_id)
+        hits = self._text_cache.get(key)
+        if hits is None:
+            points = await self._atext_points(query, limit, user_id, team_id)
+            hits = [(p.payload.get("memory_id", ""), p.score) for p in points]
+            self._text_cache.set(key, hits)
+        return list(hits)
+
+    async def aclose(self) -> None:
+        if self.aclient is not None:
+            await self.aclient.close()
 
     def search_fts(
         self, query: str, limit: int = 10, user_id: str = "local",
         team_id: str | None = None,
     ) -> list[Memory]:
-        """Full-text search returning Memory objects (replaces SQLite FTS5)."""
-        hits = self.search_text(query, limit=limit, user_id=user_id, team_id=team_id)
-        results = []
-        for mid, _ in hits:
-            mem = self.get_memory(mid, user_id)
-            if mem is None and team_id:
-                # Try team lookup if private lookup failed
-                mem = self.get_memory(mid, user_id=f"team:{team_id}")
-            if mem:
-                results.append(mem)
-        return results
+        """Full-text search returning Memory objects (replaces SQLite FTS5).
+
+        One BM25-ranked query that returns full payloads; the memory
+        filter already admits the caller's own and their team's points,
+        so there is no per-hit lookup.
+        """
+        if self._disabled:
+            return []
+        points = self._text_points(query, limit, user_id, team_id, with_payload=True)
+        return [_memory_from_payload(p.payload) for p in points]
 
     def find_recent_in_context(
         self,
         exclude_id: str,
-        cutoff: str,
+        cutoff: float | str,
         person: str | None,
         project: str | None,
         user_id: str = "local",
     ) -> str | None:
-        """Find the most recent memory matching person/project since cutoff."""
+        """Find the most recent memory matching person/project since cutoff.
+
+        `cutoff` is epoch seconds, compared directly against the stored
+        `created` float; an ISO string is still accepted and parsed.
+        """
         if self._disabled:
             return None
         conditions = [
@@ -712,16 +1337,23 @@ class QdrantStore:
         if project:
             conditions.append(FieldCondition(key="project", match=MatchValue(value=project)))
 
-        # Parse ISO cutoff to timestamp
-        try:
-            cutoff_ts = datetime.fromisoformat(cutoff).timestamp()
+        cutoff_ts: float | None
+        if isinstance(cutoff, (int, float)):
+            cutoff_ts = cutoff
+        else:
+            try:
+                cutoff_ts = datetime.fromisoformat(cutoff).timestamp()
+            except (ValueError, TypeError):
+                cutoff_ts = None
+        if cutoff_ts is not None:
             conditions.append(
                 FieldCondition(key="created", range=Range(gte=cutoff_ts))
             )
-        except (ValueError, TypeError):
-            pass
 
-        points = self._scroll_all(conditions, limit=10, order_by="created")
+        # The newest two are enough: at most one of them is exclude_id
+        points = self._scroll_all(
+            conditions, limit=2, order_by="created", with_payload=["memory_id"],
+        )
         for pt in points:
             mid = pt.payload.get("memory_id", "")
             if mid and mid != exclude_id:
@@ -732,34 +1364,57 @@ class QdrantStore:
     #  User migration                                                      #
     # ------------------------------------------------------------------ #
 
-    def migrate_user_id(self, from_id: str, to_id: str) -> int:
+    def migrate_user_id(
+        self, from_id: str, to_id: str, count: int | None = None,
+    ) -> int:
+        """Reassign every point owned by `from_id`; returns how many moved.
+
+        One batch_update_points request, applied server-side however many
+        points the user has. Pass `count` when the caller has already
+        counted from_id's points to skip the recount.
+
+        Identity cards are keyed by a per-user point id, so a moved card
+        is re-keyed to `to_id`'s id; if `to_id` already has a card it
+        wins and from_id's is dropped.
+        """
         if self._disabled:
             return 0
-        migrated = 0
-        offset = None
-        while True:
-            results, offset = self.client.scroll(
-                collection_name=COLLECTION,
-                scroll_filter=Filter(must=[
-                    FieldCondition(key="user_id", match=MatchValue(value=from_id))
-                ]),
-                limit=100,
-                offset=offset,
-                with_payload=True,
-                with_vectors=False,
-            )
-            if not results:
-                break
-            point_ids = [p.id for p in results]
-            self.client.set_payload(
-                collection_name=COLLECTION,
-                payload={"user_id": to_id},
-                points=point_ids,
+        owned = Filter(must=[
+            FieldCondition(key="user_id", match=MatchValue(value=from_id)),
+        ])
+        if count is None:
+            count = self.client.count(
+                collection_name=COLLECTION, count_filter=owned, exact=True,
+            ).count
+        if not count:
+            return 0
+        self._memories_changed(from_id, to_id)
+        source_id = self._identity_point_id(from_id)
+        target_id = self._identity_point_id(to_id)
+        cards = {
+            p.id: p for p in self.client.retrieve(
+                collection_name=COLLECTION, ids=[source_id, target_id],
+                with_payload=True, with_vectors=True,
             )
-            migrated += len(results)
-            if offset is None:
-                break
-        return migrated
+        }
+        operations: list = []
+        source = cards.get(source_id)
+        if source is not None:
+            if target_id not in cards:
+                operations.append(UpsertOperation(upsert=PointsList(points=[
+                    PointStruct(
+                        id=target_id, vector=source.vector,
+                        payload={**source.payload, "user_id": to_id},
+                    ),
+                ])))
+            operations.append(DeleteOperation(delete=PointIdsList(points=[source_id])))
+        operations.append(SetPayloadOperation(set_payload=SetPayload(
+            payload={"user_id": to_id}, filter=owned,
+        )))
+        self.client.batch_update_points(
+            collection_name=COLLECTION, update_operations=operations,
+        )
+        return count
 
     # ------------------------------------------------------------------ #
     #  Delete (by filter)                                                  #
@@ -773,6 +1428,7 @@ class QdrantStore:
         ]
         if user_id:
             conditions.append(FieldCondition(key="user_id", match=MatchValue(value=user_id)))
+        self._memories_changed(user_id)
         self.client.delete(
             collection_name=COLLECTION,
             points_selector=FilterSelector(filter=Filter(must=conditions)),
@@ -786,7 +1442,18 @@ class QdrantStore:
         self, from_id: str, to_id: str, relation: str, user_id: str = "local",
     ) -> None:
         """Append an edge to the from_id memory's edges payload array."""
-        if self._disabled:
+        self.add_edges(from_id, [(to_id, relation)], user_id=user_id)
+
+    def add_edges(
+        self, from_id: str, edges: list[tuple[str, str]],
+        user_id: str = "local",
+    ) -> None:
+        """Append (to_id, relation) edges to from_id in one payload write.
+
+        Duplicates, against the stored array or within `edges`, are
+        skipped.
+        """
+        if self._disabled or not edges:
             return
         points = self._scroll_all([
             FieldCondition(key="type", match=MatchValue(value="memory")),
@@ -796,15 +1463,21 @@ class QdrantStore:
         if not points:
             return
         pt = points[0]
-        edges = pt.payload.get("edges") or []
-        # Avoid duplicate edges
-        for e in edges:
-            if e.get("to") == to_id and e.get("relation") == relation:
-                return
-        edges.append({"to": to_id, "relation": relation})
+        stored = pt.payload.get("edges") or []
+        seen = {(e.get("to"), e.get("relation")) for e in stored}
+        added = []
+        for to_id, relation in edges:
+            if (to_id, relation) in seen:
+                continue
+            seen.add((to_id, relation))
+            added.append({"to": to_id, "relation": relation})
+        if not added:
+            return
+        # Edges show up in recall's graph results
+        invalidate_search_cache(user_id)
         self.client.set_payload(
             collection_name=COLLECTION,
-            payload={"edges": edges},
+            payload={"edges": stored + added},
             points=[pt.id],
         )
 
@@ -813,6 +1486,9 @@ class QdrantStore:
     ) -> list[dict]:
         """BFS traversal of inline edges up to `depth` hops.
 
+        One scroll per level: the points fetched as results at depth d
+        already carry the edges that form level d+1.
+
         Returns list of dicts with keys: id, content, gate, relation, depth.
         """
         if self._disabled:
@@ -821,43 +1497,51 @@ class QdrantStore:
         visited: set[str] = {memory_id}
         results: list[dict] = []
         frontier = [memory_id]
+        payloads = self._fetch_memory_payloads(frontier, user_id)
 
         for d in range(1, depth + 1):
-            next_frontier = []
+            hops: list[tuple[str, str]] = []
             for mid in frontier:
-                points = self._scroll_all([
-                    FieldCondition(key="type", match=MatchValue(value="memory")),
-                    FieldCondition(key="memory_id", match=MatchValue(value=mid)),
-                    FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-                ], limit=1)
-                if not points:
+                if mid not in payloads:
                     continue
-                edges = points[0].payload.get("edges") or []
-                for edge in edges:
+                for edge in payloads[mid].get("edges") or []:
                     target = edge.get("to", "")
                     if target in visited:
                         continue
                     visited.add(target)
-                    next_frontier.append(target)
-                    # Fetch target memory for result
-                    target_pts = self._scroll_all([
-                        FieldCondition(key="type", match=MatchValue(value="memory")),
-                        FieldCondition(key="memory_id", match=MatchValue(value=target)),
-                        FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-                    ], limit=1)
-                    if target_pts:
-                        tp = target_pts[0].payload
-                        results.append({
-                            "id": target,
-                            "content": tp.get("content", ""),
-                            "gate": tp.get("gate", ""),
-                            "relation": edge.get("relation", ""),
-                            "depth": d,
-                        })
-            frontier = next_frontier
+                    hops.append((target, edge.get("relation", "")))
+            if not hops:
+                break
+            frontier = [t for t, _ in hops]
+            payloads = self._fetch_memory_payloads(frontier, user_id)
+            for target, relation in hops:
+                tp = payloads.get(target)
+                if tp is None:
+                    continue
+                results.append({
+                    "id": target,
+                    "content": tp.get("content", ""),
+                    "gate": tp.get("gate", ""),
+                    "relation": relation,
+                    "depth": d,
+                })
 
         return results
 
+    def _fetch_memory_payloads(
+        self, memory_ids: list[str], user_id: str,
+    ) -> dict[str, dict]:
+        """Map memory_id -> payload (edges, content, gate) in one scroll."""
+        if not memory_ids:
+            return {}
+        points = self._scroll_all([
+            FieldCondition(key="type", match=MatchValue(value="memory")),
+            FieldCondition(key="memory_id", match=MatchAny(any=memory_ids)),
+            FieldCondition(key="user_id", match=MatchValue(value=user_id)),
+        ], limit=len(memory_ids),
+            with_payload=["memory_id", "edges", "content", "gate"])
+        return {p.payload["memory_id"]: p.payload for p in points}
+
     def auto_link(
         self, memory_id: str, person: str | None, project: str | None,
         user_id: str = "local",
@@ -879,12 +1563,8 @@ class QdrantStore:
         key = f"journal:{user_id}:{timestamp}:{content[:50]}"
         return _stable_id(key)
 
-    def insert_journal(self, entry: JournalEntry, user_id: str = "local") -> None:
-        if self._disabled:
-            return
+    def _journal_point(self, entry: JournalEntry, user_id: str) -> PointStruct:
         ts = entry.timestamp.timestamp()
-        date_str = entry.timestamp.strftime("%Y-%m-%d")
-        point_id = self._journal_point_id(user_id, ts, entry.content)
         payload = {
             "type": "journal",
             "user_id": user_id,
@@ -893,25 +1573,47 @@ class QdrantStore:
             "person": entry.person,
             "project": entry.project,
             "timestamp": ts,
-            "date": date_str,
+            "date": entry.timestamp.strftime("%Y-%m-%d"),
         }
-        vector = self._make_vector(entry.content)
+        return PointStruct(
+            id=self._journal_point_id(user_id, ts, entry.content),
+            vector=self._make_vector(entry.content),
+            payload=payload,
+        )
+
+    def insert_journal(self, entry: JournalEntry, user_id: str = "local") -> None:
+        if self._disabled:
+            return
         self.client.upsert(
             collection_name=COLLECTION,
-            points=[PointStruct(id=point_id, vector=vector, payload=payload)],
+            points=[self._journal_point(entry, user_id)],
         )
 
-    def insert_journal_raw(
+    async def ainsert_journal(self, entry: JournalEntry, user_id: str = "local") -> None:
+        """Non-blocking `insert_journal` for async callers (MCP tools).
+
+        Local mode embeds on a worker thread, so the event loop keeps
+        serving other tool calls during the ONNX pass and the upsert.
+        """
+        if self._disabled:
+            return
+        if self.aclient is None:
+            await asyncio.to_thread(self.insert_journal, entry, user_id)
+            return
+        await self.aclient.upsert(
+            collection_name=COLLECTION,
+            points=[self._journal_point(entry, user_id)],
+        )
+
+    def _journal_raw_point(
         self,
         date: str,
         gate: Gate,
         content: str,
-        person: str | None = None,
-        project: str | None = None,
-        user_id: str = "local",
-    ) -> None:
-        if self._disabled:
-            return
+        person: str | None,
+        project: str | None,
+        user_id: str,
+    ) -> PointStruct:
         ts = time.time()
         point_id = self._journal_point_id(user_id, ts, content)
         payload = {
@@ -925,19 +1627,55 @@ class QdrantStore:
             "date": date,
         }
         vector = self._make_vector(content)
+        return PointStruct(id=point_id, vector=vector, payload=payload)
+
+    def insert_journal_raw(
+        self,
+        date: str,
+        gate: Gate,
+        content: str,
+        person: str | None = None,
+        project: str | None = None,
+        user_id: str = "local",
+    ) -> None:
+        if self._disabled:
+            return
         self.client.upsert(
             collection_name=COLLECTION,
-            points=[PointStruct(id=point_id, vector=vector, payload=payload)],
+            points=[self._journal_raw_point(date, gate, content, person, project, user_id)],
         )
 
-    def recent_journal(self, days: int = 3, user_id: str = "local") -> list[dict]:
+    def insert_journal_raw_many(
+        self, entries: list[tuple[str, Gate, str]], user_id: str = "local",
+    ) -> None:
+        """Insert several (date, gate, content) journal entries in one upsert.
+
+        Embeds all of them in one batch first (see embed_passages).
+        """
+        if self._disabled or not entries:
+            return
+        self.embed_passages([content for _, _, content in entries])
+        self.client.upsert(
+            collection_name=COLLECTION,
+            points=[
+                self._journal_raw_point(date, gate, content, None, None, user_id)
+                for date, gate, content in entries
+            ],
+        )
+
+    def recent_journal(
+        self, days: int = 3, user_id: str = "local",
+        limit: int = RECENT_JOURNAL_LIMIT,
+    ) -> list[dict]:
+        """Journal entries from the last `days` days, newest first."""
         if self._disabled:
             return []
-        limit = days * 20
+        cutoff_ts = time.time() - days * 86400
         points = self._scroll_all(
             [
                 FieldCondition(key="type", match=MatchValue(value="journal")),
                 FieldCondition(key="user_id", match=MatchValue(value=user_id)),
+                FieldCondition(key="timestamp", range=Range(gte=cutoff_ts)),
             ],
             limit=limit,
             order_by="timestamp",
@@ -955,6 +1693,54 @@ class QdrantStore:
         ], limit=500)
         return [p.payload for p in points]
 
+    def concat_journal_for_dates(
+        self, dates: list[str], user_id: str = "local",
+    ) -> dict[str, str]:
+        """Journal text per date as newline-joined "[gate] content" lines.
+
+        One scroll that only pulls the three payload fields needed, for
+        callers (digest) that feed the text straight to the LLM.
+        """
+        if self._disabled or not dates:
+            return {}
+        points = self._scroll_all([
+            FieldCondition(key="type", match=MatchValue(value="journal")),
+            FieldCondition(key="user_id", match=MatchValue(value=user_id)),
+            FieldCondition(key="date", match=MatchAny(any=list(dates))),
+        ], limit=500 * len(dates), with_payload=["date", "gate", "content"])
+        lines: dict[str, list[str]] = {}
+        for p in points:
+            pl = p.payload
+            lines.setdefault(pl.get("date", ""), []).append(
+                f"[{pl.get('gate', '')}] {pl.get('content', '')}"
+            )
+        return {date: "\n".join(ls) for date, ls in lines.items()}
+
+    def instructions_version(
+        self, user_id: str = "local", recent: int = 8, observations: int = 0,
+    ) -> list:
+        """Fingerprint of what `bootstrap` would return, in one batch query.
+
+        Runs bootstrap's requests but reads only the identity's
+        last_updated and the ids of the checkpoint, context and
+        observation entries, so it changes whenever the instructions
+        built from them would (a write, an archive, a newer checkpoint).
+        JSON-friendly, so callers can store it next to the cached text.
+        """
+        if self._disabled:
+            return []
+        results = self.client.query_batch_points(
+            collection_name=COLLECTION,
+            requests=self._bootstrap_requests(
+                user_id, recent, observations, versions_only=True,
+            ),
+        )
+        identity = results[0].points
+        return [
+            identity[0].payload.get("last_updated", 0.0) if identity else 0.0,
+            *([p.id for p in r.points] for r in results[1:]),
+        ]
+
     def latest_checkpoint(self, user_id: str = "local") -> dict | None:
         if self._disabled:
             return None
@@ -981,19 +1767,20 @@ class QdrantStore:
             FieldCondition(key="type", match=MatchValue(value="journal")),
             FieldCondition(key="user_id", match=MatchValue(value=user_id)),
             FieldCondition(key="timestamp", range=Range(lt=cutoff_ts)),
-        ], limit=1000)
+        ], limit=1000, with_payload=["date"])
         dates = sorted({p.payload.get("date", "") for p in points if p.payload.get("date")})
         return dates
 
-    def archive_journal_date(self, date: str, user_id: str = "local") -> None:
-        if self._disabled:
+    def archive_journal_dates(self, dates: list[str], user_id: str = "local") -> None:
+        """Archive journal entries for several dates with a single delete."""
+        if self._disabled or not dates:
             return
         self.client.delete(
             collection_name=COLLECTION,
             points_selector=FilterSelector(filter=Filter(must=[
                 FieldCondition(key="type", match=MatchValue(value="journal")),
                 FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-                FieldCondition(key="date", match=MatchValue(value=date)),
+                FieldCondition(key="date", match=MatchAny(any=list(dates))),
             ])),
         )
 
@@ -1004,6 +1791,16 @@ class QdrantStore:
     def _identity_point_id(self, user_id: str) -> int:
         return _stable_id(f"identity:{user_id}")
 
+    @staticmethod
+    def _identity_from_payload(p: dict) -> IdentityCard:
+        last_updated = p.get("last_updated", 0)
+        return IdentityCard(
+            person=p.get("person"),
+            project=p.get("project"),
+            content=p.get("content", ""),
+            last_updated=datetime.fromtimestamp(last_updated, tz=timezone.utc),
+        )
+
     def get_identity(self, user_id: str = "local") -> IdentityCard | None:
         if self._disabled:
             return None
@@ -1013,13 +1810,84 @@ class QdrantStore:
         ], limit=1)
         if not points:
             return None
-        p = points[0].payload
-        last_updated = p.get("last_updated", 0)
-        return IdentityCard(
-            person=p.get("person"),
-            project=p.get("project"),
-            content=p.get("content", ""),
-            last_updated=datetime.fromtimestamp(last_updated, tz=timezone.utc),
+        return self._identity_from_payload(points[0].payload)
+
+    def _bootstrap_requests(
+        self, user_id: str, recent: int, observations: int,
+        versions_only: bool = False,
+    ) -> list[QueryRequest]:
+        """Identity, latest checkpoint, recent context and (if asked for)
+        observations, as batch requests.
+
+        `versions_only` trims the payloads to what `instructions_version`
+        compares: the identity's last_updated and the journal point ids.
+        """
+        user = FieldCondition(key="user_id", match=MatchValue(value=user_id))
+        journal = FieldCondition(key="type", match=MatchValue(value="journal"))
+        newest = OrderByQuery(order_by=OrderBy(key="timestamp", direction="desc"))
+        entry_payload = False if versions_only else ["gate", "content"]
+        requests = [
+            QueryRequest(
+                filter=Filter(must=[
+                    FieldCondition(key="type", match=MatchValue(value="identity")),
+                    user,
+                ]),
+                limit=1, with_payload=["last_updated"] if versions_only else True,
+            ),
+            QueryRequest(
+                query=newest,
+                filter=Filter(must=[
+                    journal, user,
+                    FieldCondition(key="gate", match=MatchValue(value="checkpoint")),
+                ]),
+                limit=1, with_payload=False if versions_only else True,
+            ),
+            QueryRequest(
+                query=newest,
+                filter=Filter(
+                    must=[journal, user],
+                    must_not=[FieldCondition(
+                        key="gate", match=MatchAny(any=["checkpoint", "observation"]),
+                    )],
+                ),
+                limit=recent, with_payload=entry_payload,
+            ),
+        ]
+        if observations:
+            requests.append(QueryRequest(
+                query=newest,
+                filter=Filter(must=[
+                    journal, user,
+                    FieldCondition(key="gate", match=MatchValue(value="observation")),
+                ]),
+                limit=observations, with_payload=entry_payload,
+            ))
+        return requests
+
+    def bootstrap(
+        self, user_id: str = "local", recent: int = 8, observations: int = 0,
+    ) -> tuple[IdentityCard | None, dict | None, list[dict], list[dict]]:
+        """(identity, latest checkpoint, recent context, observations).
+
+        One batch query for everything the MCP server instructions need.
+        Recent context is the newest `recent` journal entries that are
+        neither checkpoints nor observations; the newest `observations`
+        observation entries are fetched only when asked for. Gate filters
+        and limits run server-side, so nothing is read just to be dropped.
+        """
+        if self._disabled:
+            return None, None, [], []
+        requests = self._bootstrap_requests(user_id, recent, observations)
+        results = self.client.query_batch_points(
+            collection_name=COLLECTION, requests=requests,
+        )
+        identity, checkpoint, context = results[:3]
+        return (
+            self._identity_from_payload(identity.points[0].payload)
+            if identity.points else None,
+            checkpoint.points[0].payload if checkpoint.points else None,
+            [p.payload for p in context.points],
+            [p.payload for p in results[3].points] if observations else [],
         )
 
     def set_identity(self, card: IdentityCard, user_id: str = "local") -> None:
@@ -1039,6 +1907,7 @@ class QdrantStore:
             collection_name=COLLECTION,
             points=[PointStruct(id=point_id, vector=vector, payload=payload)],
         )
+        invalidate_identity_cache(user_id)
 
     # ------------------------------------------------------------------ #
     #  Rules                                                               #
@@ -1125,7 +1994,7 @@ class QdrantStore:
             FieldCondition(key="type", match=MatchValue(value="rule")),
             FieldCondition(key="rule_id", match=MatchValue(value=rule_id)),
             FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-        ], limit=1)
+        ], limit=1, with_payload=False)
         if not points:
             return False
         self.client.set_payload(
@@ -1142,7 +2011,7 @@ class QdrantStore:
             FieldCondition(key="type", match=MatchValue(value="rule")),
             FieldCondition(key="rule_id", match=MatchValue(value=rule_id)),
             FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-        ], limit=1)
+        ], limit=1, with_payload=False)
         if not points:
             return False
         self.client.delete(
@@ -1162,7 +2031,7 @@ class QdrantStore:
             FieldCondition(key="type", match=MatchValue(value="rule")),
             FieldCondition(key="rule_id", match=MatchValue(value=rule_id)),
             FieldCondition(key="user_id", match=MatchValue(value=user_id)),
-        ], limit=1)
+        ], limit=1, with_payload=False)
         if points:
             self.client.set_payload(
                 collection_name=COLLECTION,
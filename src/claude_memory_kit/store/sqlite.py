@@ -1,26 +1,163 @@
-"""SQLite store for auth data only (users, API keys, teams).
+"""SQLite store for auth data (users, API keys, teams) and small counters.
 
 Memory storage moved to Qdrant in v0.2.0. This module retains schema
 migrations for backward compatibility and provides auth-related tables.
 """
 
+import json
 import os
+import queue
 import sqlite3
-from datetime import datetime, timezone
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+BUSY_TIMEOUT_MS = 5000
+READ_POOL_SIZE = 4
+# last_used is for "when was this key last seen" in key listings; a
+# minute of slack spares the auth hot path a write on every request.
+LAST_USED_RESOLUTION = timedelta(seconds=60)
+# Prepared statements kept per connection, keyed by SQL text. Every query
+# below is a literal with bound parameters, so each one is parsed and
+# planned once per connection; this leaves headroom over the ~40 the
+# module issues (migrations included) so hot lookups are never evicted.
+STATEMENT_CACHE_SIZE = 256
+
+
+def _now_iso() -> str:
+    """Current UTC time as fixed-width ISO 8601 text.
+
+    Plain isoformat() drops the fraction when microseconds happen to be 0,
+    and `ORDER BY created` compares these columns as strings.
+    """
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        db_path, check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    # Several processes share index.db; wait out a competing writer
+    # instead of failing with "database is locked".
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
 
 
 class SqliteStore:
-    def __init__(self, store_path: str):
+    """Auth tables behind one writer connection and a small reader pool.
+
+    Under WAL, readers never wait on the writer, so concurrent API key
+    lookups from the HTTP server don't queue behind a key insert or a
+    counter update. Writes are serialized on `conn` by a lock.
+    """
+
+    def __init__(self, store_path: str, readers: int = READ_POOL_SIZE):
         os.makedirs(store_path, exist_ok=True)
         db_path = os.path.join(store_path, "index.db")
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.conn = _connect(db_path)
+        # WAL lets the API server, MCP server and CLI read while one of them
+        # writes; NORMAL sync is durable across app crashes under WAL.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._write_lock = threading.RLock()
+        self._txn = threading.local()
+        self._columns: dict[str, frozenset[str]] = {}
+        self._readers: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        for _ in range(readers):
+            reader = _connect(db_path)
+            reader.execute("PRAGMA query_only=1")
+            self._readers.put(reader)
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection for the duration of the block."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _scalar(self, sql: str, params: tuple = ()):
+        """First column of the first row, or None.
+
+        Runs on a cursor without the Row factory: these lookups read one
+        value by position, so wrapping the row in sqlite3.Row is waste.
+        """
+        with self._read() as c:
+            cur = c.cursor()
+            cur.row_factory = None
+            row = cur.execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer for the block and commit when it exits.
+
+        Inside `transaction()` the commit is left to the outer block.
+        """
+        with self._write_lock:
+            if getattr(self._txn, "active", False):
+                yield self.conn
+                return
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several writes into one BEGIN IMMEDIATE ... COMMIT.
+
+        Methods called inside skip their own commit, so N writes cost
+        one fsync instead of N. Rolls everything back if the block
+        raises. Reads inside the block still go to the pool and see
+        only committed rows.
+        """
+        with self._write_lock:
+            if getattr(self._txn, "active", False):
+                yield
+                return
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._txn.active = True
+            try:
+                yield
+            except BaseException:
+                self.conn.rollback()
+                raise
+            else:
+                self.conn.commit()
+            finally:
+                self._txn.active = False
 
     # Current schema version. Bump when adding new migrations.
-    SCHEMA_VERSION = 6
+    SCHEMA_VERSION = 8
 
     def migrate(self) -> None:
-        """Run all pending schema migrations in order."""
+        """Run all pending schema migrations in order.
+
+        Every CLI call and server start lands here, so an up-to-date
+        database is detected with one read on a pooled connection and
+        never takes the write lock.
+        """
+        if self._current_schema_version() >= self.SCHEMA_VERSION:
+            return
+        with self._write():
+            self._migrate()
+
+    def _current_schema_version(self) -> int:
+        try:
+            version = self._scalar("SELECT version FROM schema_version WHERE id = 1")
+        except sqlite3.OperationalError:  # fresh database
+            return 0
+        return version or 0
+
+    def _migrate(self) -> None:
         current = self._get_schema_version()
         migrations = [
             self._migration_1_initial_schema,
@@ -29,12 +166,13 @@ class SqliteStore:
             self._migration_4_indexes,
             self._migration_5_fts,
             self._migration_6_teams,
+            self._migration_7_counters,
+            self._migration_8_pending_batches,
         ]
         for i, fn in enumerate(migrations, start=1):
             if current < i:
                 fn()
         self._set_schema_version(self.SCHEMA_VERSION)
-        self.conn.commit()
 
     def _get_schema_version(self) -> int:
         """Get current schema version, creating tracking table if needed."""
@@ -177,15 +315,11 @@ class SqliteStore:
         ]
         for table, col, typedef in columns:
             if not self._has_column(table, col):
-                self.conn.execute(
-                    f"ALTER TABLE {table} ADD COLUMN {col} {typedef}"
-                )
+                self._add_column(table, col, typedef)
 
     def _migration_3_add_pinned(self) -> None:
         if not self._has_column("memories", "pinned"):
-            self.conn.execute(
-                "ALTER TABLE memories ADD COLUMN pinned INTEGER DEFAULT 0"
-            )
+            self._add_column("memories", "pinned", "INTEGER DEFAULT 0")
 
     def _migration_4_indexes(self) -> None:
         self.conn.executescript("""
@@ -283,13 +417,47 @@ class SqliteStore:
                 ON team_members(user_id);
         """)
 
+    def _migration_7_counters(self) -> None:
+        """Per-user counters that must survive server restarts."""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS counters (
+                user_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, name)
+            );
+        """)
+
+    def _migration_8_pending_batches(self) -> None:
+        """Anthropic message batches submitted but not yet applied, with
+        the memory ids each one queued (JSON array)."""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pending_batches (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                created TEXT NOT NULL,
+                memory_ids TEXT NOT NULL DEFAULT '[]'
+            );
+            CREATE INDEX IF NOT EXISTS idx_pending_batches_user
+                ON pending_batches(user_id, kind);
+        """)
+
     # ------------------------------------------------------------------ #
     #  Helpers                                                             #
     # ------------------------------------------------------------------ #
 
     def _has_column(self, table: str, column: str) -> bool:
-        cols = self.conn.execute(f"PRAGMA table_info({table})").fetchall()
-        return any(c[1] == column for c in cols)
+        """Column lookup, one PRAGMA per table (see `_add_column`)."""
+        cols = self._columns.get(table)
+        if cols is None:
+            rows = self.conn.execute(f"PRAGMA table_info({table})").fetchall()
+            cols = self._columns[table] = frozenset(r[1] for r in rows)
+        return column in cols
+
+    def _add_column(self, table: str, column: str, typedef: str) -> None:
+        self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {typedef}")
+        self._columns.pop(table, None)
 
     # ------------------------------------------------------------------ #
     #  Users                                                               #
@@ -299,21 +467,22 @@ class SqliteStore:
         self, user_id: str, email: str | None = None,
         name: str = "", plan: str = "free",
     ) -> None:
-        now = datetime.now(timezone.utc).isoformat()
-        self.conn.execute(
-            "INSERT INTO users (id, email, name, plan, created, last_seen) "
-            "VALUES (?, ?, ?, ?, ?, ?) "
-            "ON CONFLICT(id) DO UPDATE SET "
-            "last_seen = ?, name = COALESCE(?, name), "
-            "email = COALESCE(?, email)",
-            (user_id, email, name, plan, now, now, now, name, email),
-        )
-        self.conn.commit()
+        now = _now_iso()
+        with self._write() as c:
+            c.execute(
+                "INSERT INTO users (id, email, name, plan, created, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET "
+                "last_seen = ?, name = COALESCE(?, name), "
+                "email = COALESCE(?, email)",
+                (user_id, email, name, plan, now, now, now, name, email),
+            )
 
     def get_user(self, user_id: str) -> dict | None:
-        row = self.conn.execute(
-            "SELECT * FROM users WHERE id = ?", (user_id,)
-        ).fetchone()
+        with self._read() as c:
+            row = c.execute(
+                "SELECT * FROM users WHERE id = ?", (user_id,)
+            ).fetchone()
         return dict(row) if row else None
 
     # ------------------------------------------------------------------ #
@@ -324,44 +493,52 @@ class SqliteStore:
         self, key_id: str, user_id: str, key_hash: str,
         prefix: str, name: str = "",
     ) -> None:
-        now = datetime.now(timezone.utc).isoformat()
-        self.conn.execute(
-            "INSERT INTO api_keys "
-            "(id, user_id, name, key_hash, prefix, created) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (key_id, user_id, name, key_hash, prefix, now),
-        )
-        self.conn.commit()
+        now = _now_iso()
+        with self._write() as c:
+            c.execute(
+                "INSERT INTO api_keys "
+                "(id, user_id, name, key_hash, prefix, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key_id, user_id, name, key_hash, prefix, now),
+            )
 
     def get_api_key_by_hash(self, key_hash: str) -> dict | None:
-        row = self.conn.execute(
-            "SELECT * FROM api_keys "
-            "WHERE key_hash = ? AND revoked = 0",
-            (key_hash,),
-        ).fetchone()
-        if row:
-            self.conn.execute(
-                "UPDATE api_keys SET last_used = ? WHERE id = ?",
-                (datetime.now(timezone.utc).isoformat(), row["id"]),
-            )
-            self.conn.commit()
-        return dict(row) if row else None
+        with self._read() as c:
+            row = c.execute(
+                "SELECT * FROM api_keys "
+                "WHERE key_hash = ? AND revoked = 0",
+                (key_hash,),
+            ).fetchone()
+        if row is None:
+            return None
+        now = datetime.now(timezone.utc)
+        last_used = row["last_used"]
+        if last_used is None or (
+            now - datetime.fromisoformat(last_used) >= LAST_USED_RESOLUTION
+        ):
+            with self._write() as c:
+                c.execute(
+                    "UPDATE api_keys SET last_used = ? WHERE id = ?",
+                    (now.isoformat(timespec="microseconds"), row["id"]),
+                )
+        return dict(row)
 
     def list_api_keys(self, user_id: str) -> list[dict]:
-        rows = self.conn.execute(
-            "SELECT id, name, prefix, created, last_used, revoked "
-            "FROM api_keys WHERE user_id = ? ORDER BY created DESC",
-            (user_id,),
-        ).fetchall()
+        with self._read() as c:
+            rows = c.execute(
+                "SELECT id, name, prefix, created, last_used, revoked "
+                "FROM api_keys WHERE user_id = ? ORDER BY created DESC",
+                (user_id,),
+            ).fetchall()
         return [dict(r) for r in rows]
 
     def revoke_api_key(self, key_id: str, user_id: str) -> bool:
-        cur = self.conn.execute(
-            "UPDATE api_keys SET revoked = 1 "
-            "WHERE id = ? AND user_id = ?",
-            (key_id, user_id),
-        )
-        self.conn.commit()
+        with self._write() as c:
+            cur = c.execute(
+                "UPDATE api_keys SET revoked = 1 "
+                "WHERE id = ? AND user_id = ?",
+                (key_id, user_id),
+            )
         return cur.rowcount > 0
 
     # ------------------------------------------------------------------ #
@@ -369,85 +546,143 @@ class SqliteStore:
     # ------------------------------------------------------------------ #
 
     def create_team(self, team_id: str, name: str, created_by: str) -> dict:
-        now = datetime.now(timezone.utc).isoformat()
-        self.conn.execute(
-            "INSERT INTO teams (id, name, created_by, created) "
-            "VALUES (?, ?, ?, ?)",
-            (team_id, name, created_by, now),
-        )
-        # Auto-add creator as owner
-        self.conn.execute(
-            "INSERT INTO team_members (team_id, user_id, role, joined) "
-            "VALUES (?, ?, 'owner', ?)",
-            (team_id, created_by, now),
-        )
-        self.conn.commit()
+        now = _now_iso()
+        with self._write() as c:
+            c.execute(
+                "INSERT INTO teams (id, name, created_by, created) "
+                "VALUES (?, ?, ?, ?)",
+                (team_id, name, created_by, now),
+            )
+            # Auto-add creator as owner
+            c.execute(
+                "INSERT INTO team_members (team_id, user_id, role, joined) "
+                "VALUES (?, ?, 'owner', ?)",
+                (team_id, created_by, now),
+            )
         return {"id": team_id, "name": name, "created_by": created_by, "created": now}
 
     def get_team(self, team_id: str) -> dict | None:
-        row = self.conn.execute(
-            "SELECT * FROM teams WHERE id = ?", (team_id,)
-        ).fetchone()
+        with self._read() as c:
+            row = c.execute(
+                "SELECT * FROM teams WHERE id = ?", (team_id,)
+            ).fetchone()
         return dict(row) if row else None
 
     def list_user_teams(self, user_id: str) -> list[dict]:
-        rows = self.conn.execute(
-            "SELECT t.*, tm.role FROM teams t "
-            "JOIN team_members tm ON t.id = tm.team_id "
-            "WHERE tm.user_id = ? ORDER BY t.created DESC",
-            (user_id,),
-        ).fetchall()
+        with self._read() as c:
+            rows = c.execute(
+                "SELECT t.*, tm.role FROM teams t "
+                "JOIN team_members tm ON t.id = tm.team_id "
+                "WHERE tm.user_id = ? ORDER BY t.created DESC",
+                (user_id,),
+            ).fetchall()
         return [dict(r) for r in rows]
 
     def add_team_member(
         self, team_id: str, user_id: str, role: str = "member",
     ) -> None:
-        now = datetime.now(timezone.utc).isoformat()
-        self.conn.execute(
-            "INSERT OR REPLACE INTO team_members (team_id, user_id, role, joined) "
-            "VALUES (?, ?, ?, ?)",
-            (team_id, user_id, role, now),
-        )
-        self.conn.commit()
+        now = _now_iso()
+        with self._write() as c:
+            c.execute(
+                "INSERT OR REPLACE INTO team_members (team_id, user_id, role, joined) "
+                "VALUES (?, ?, ?, ?)",
+                (team_id, user_id, role, now),
+            )
 
     def remove_team_member(self, team_id: str, user_id: str) -> bool:
-        cur = self.conn.execute(
-            "DELETE FROM team_members WHERE team_id = ? AND user_id = ?",
-            (team_id, user_id),
-        )
-        self.conn.commit()
+        with self._write() as c:
+            cur = c.execute(
+                "DELETE FROM team_members WHERE team_id = ? AND user_id = ?",
+                (team_id, user_id),
+            )
         return cur.rowcount > 0
 
     def list_team_members(self, team_id: str) -> list[dict]:
-        rows = self.conn.execute(
-            "SELECT tm.user_id, tm.role, tm.joined, u.email, u.name "
-            "FROM team_members tm "
-            "LEFT JOIN users u ON tm.user_id = u.id "
-            "WHERE tm.team_id = ? ORDER BY tm.joined",
-            (team_id,),
-        ).fetchall()
+        with self._read() as c:
+            rows = c.execute(
+                "SELECT tm.user_id, tm.role, tm.joined, u.email, u.name "
+                "FROM team_members tm "
+                "LEFT JOIN users u ON tm.user_id = u.id "
+                "WHERE tm.team_id = ? ORDER BY tm.joined",
+                (team_id,),
+            ).fetchall()
         return [dict(r) for r in rows]
 
     def is_team_member(self, team_id: str, user_id: str) -> bool:
-        row = self.conn.execute(
+        return self._scalar(
             "SELECT 1 FROM team_members WHERE team_id = ? AND user_id = ?",
             (team_id, user_id),
-        ).fetchone()
-        return row is not None
+        ) is not None
 
     def get_member_role(self, team_id: str, user_id: str) -> str | None:
-        row = self.conn.execute(
+        return self._scalar(
             "SELECT role FROM team_members WHERE team_id = ? AND user_id = ?",
             (team_id, user_id),
-        ).fetchone()
-        return row[0] if row else None
+        )
 
     def delete_team(self, team_id: str) -> bool:
-        self.conn.execute(
-            "DELETE FROM team_members WHERE team_id = ?", (team_id,)
-        )
-        cur = self.conn.execute(
-            "DELETE FROM teams WHERE id = ?", (team_id,)
-        )
-        self.conn.commit()
+        with self._write() as c:
+            c.execute(
+                "DELETE FROM team_members WHERE team_id = ?", (team_id,)
+            )
+            cur = c.execute(
+                "DELETE FROM teams WHERE id = ?", (team_id,)
+            )
         return cur.rowcount > 0
+
+    # ------------------------------------------------------------------ #
+    #  Counters                                                            #
+    # ------------------------------------------------------------------ #
+
+    def get_counter(self, user_id: str, name: str) -> int:
+        value = self._scalar(
+            "SELECT value FROM counters WHERE user_id = ? AND name = ?",
+            (user_id, name),
+        )
+        return value or 0
+
+    def set_counter(self, user_id: str, name: str, value: int) -> None:
+        with self._write() as c:
+            c.execute(
+                "INSERT INTO counters (user_id, name, value) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id, name) DO UPDATE SET value = excluded.value",
+                (user_id, name, value),
+            )
+
+    # ------------------------------------------------------------------ #
+    #  Pending batches                                                     #
+    # ------------------------------------------------------------------ #
+
+    def add_pending_batch(
+        self, batch_id: str, user_id: str, kind: str,
+        memory_ids: list[str] | None = None,
+    ) -> None:
+        with self._write() as c:
+            c.execute(
+                "INSERT OR REPLACE INTO pending_batches "
+                "(id, user_id, kind, created, memory_ids) VALUES (?, ?, ?, ?, ?)",
+                (batch_id, user_id, kind, _now_iso(), json.dumps(memory_ids or [])),
+            )
+
+    def list_pending_batches(self, user_id: str, kind: str) -> list[str]:
+        """Batch ids of one kind awaiting results, oldest first."""
+        with self._read() as c:
+            rows = c.execute(
+                "SELECT id FROM pending_batches WHERE user_id = ? AND kind = ? "
+                "ORDER BY created",
+                (user_id, kind),
+            ).fetchall()
+        return [r["id"] for r in rows]
+
+    def pending_batch_memory_ids(self, user_id: str, kind: str) -> set[str]:
+        """Memory ids already queued in this user's pending batches."""
+        with self._read() as c:
+            rows = c.execute(
+                "SELECT memory_ids FROM pending_batches WHERE user_id = ? AND kind = ?",
+                (user_id, kind),
+            ).fetchall()
+        return {mid for r in rows for mid in json.loads(r["memory_ids"])}
+
+    def delete_pending_batch(self, batch_id: str) -> None:
+        with self._write() as c:
+            c.execute("DELETE FROM pending_batches WHERE id = ?", (batch_id,))
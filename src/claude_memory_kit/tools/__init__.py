@@ -6,5 +6,7 @@ from .forget import do_forget
 from .auto_extract import do_auto_extract
 from .prime import do_prime
 from .scan import do_scan
-from .classify import classify_memories, classify_single, reclassify_memory
+from .classify import (
+    classify_memories, classify_single, poll_classification_batches, reclassify_memory,
+)
 from .checkpoint import do_checkpoint
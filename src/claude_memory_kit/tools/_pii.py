@@ -26,25 +26,64 @@ PII_PATTERNS: list[tuple[str, re.Pattern]] = [
     ("Phone number (US)", re.compile(r"\b(?:\+1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b")),
 ]
 
+# What a match cannot occur without. The digit, email and keyword patterns
+# have no literal prefix for the regex engine to skip ahead to, so each
+# costs tens of microseconds even on clean text; a substring test rules
+# them out first for the many memories with no digits, "@" or keyword.
+_REQUIRES = {
+    "Generic secret": "keyword",
+    "Credit card (Visa)": "digit",
+    "Credit card (MC)": "digit",
+    "SSN": "digit",
+    "Phone number (US)": "digit",
+    "Email address": "at",
+}
+_SECRET_WORDS = ("passw", "secret", "token")
+
+# Warning per label, built once rather than formatted on every hit
+PII_MESSAGES: dict[str, str] = {
+    label: f"This memory appears to contain a {label}. Consider removing sensitive data."
+    for label, _ in PII_PATTERNS
+}
+
+
+def candidate_patterns(text: str) -> list[tuple[str, re.Pattern]]:
+    """The PII_PATTERNS entries that could match `text`, in order."""
+    present = {
+        # \d also matches non-ASCII digits
+        "digit": not text.isascii() or any(d in text for d in "0123456789"),
+        "at": "@" in text,
+        "keyword": any(w in text.casefold() for w in _SECRET_WORDS),
+    }
+    return [
+        (label, pattern) for label, pattern in PII_PATTERNS
+        if present.get(_REQUIRES.get(label), True)
+    ]
+
+
+_NON_DIGITS = re.compile(r"[^0-9]")
+# ASCII digit d -> Luhn-doubled value of d (2d, minus 9 when over 9)
+_LUHN_DOUBLED = bytes.maketrans(b"0123456789", bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9]))
+
 
 def luhn_check(num_str: str) -> bool:
-    """Verify a number string passes the Luhn algorithm."""
-    digits = [int(d) for d in num_str if d.isdigit()]
+    """Verify a number string passes the Luhn algorithm.
+
+    Non-digits are ignored. Works on the ASCII bytes: the undoubled
+    digits are summed straight from their byte values, the doubled ones
+    through a translate table, so there is no per-digit Python loop.
+    """
+    digits = _NON_DIGITS.sub("", num_str).encode()
     if len(digits) < 13:
         return False
-    checksum = 0
-    for i, d in enumerate(reversed(digits)):
-        if i % 2 == 1:
-            d *= 2
-            if d > 9:
-                d -= 9
-        checksum += d
+    kept = digits[-1::-2]
+    checksum = sum(kept) - 48 * len(kept) + sum(digits[-2::-2].translate(_LUHN_DOUBLED))
     return checksum % 10 == 0
 
 
 def check_pii(content: str) -> str | None:
     """Quick check for PII patterns. Returns warning string or None."""
-    for label, pattern in PII_PATTERNS:
+    for label, pattern in candidate_patterns(content):
         if pattern.search(content):
-            return f"This memory appears to contain a {label}. Consider removing sensitive data."
+            return PII_MESSAGES[label]
     return None
@@ -19,6 +19,11 @@ async def do_auto_extract(
     if not memories:
         return "No memories worth keeping from this transcript."
 
+    try:
+        store.qdrant.embed_passages([mem.get("content", "") for mem in memories])
+    except Exception as e:
+        log.warning("batch embedding failed: %s", e)
+
     saved = []
     for mem in memories:
         try:
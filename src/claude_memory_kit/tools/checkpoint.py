@@ -36,5 +36,5 @@ async def do_checkpoint(
         gate=Gate.checkpoint,
         content=summary,
     )
-    store.qdrant.insert_journal(entry, user_id=user_id)
+    await store.qdrant.ainsert_journal(entry, user_id=user_id)
     return "Checkpoint saved. This will be loaded at the start of your next session."
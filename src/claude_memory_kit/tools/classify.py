@@ -1,14 +1,58 @@
 """Opus-powered sensitivity classification for memories."""
 
+import asyncio
 import json
 import logging
+import re
 
+from ..cache import classification_cache, make_key, normalize_query
 from ..config import get_api_key
-from ..extract import _call_anthropic
+from ..extract import _call_anthropic, _fetch_message_batch, _submit_message_batch
 from ..store import Store
+from ._pii import check_pii
 
 log = logging.getLogger("cmk")
 
+MAX_CONCURRENT_BATCHES = 5
+CLASSIFY_BATCH_KIND = "classify"
+
+# Topics the classifier would rate above "safe". Memories with none of
+# these and no PII pattern hit are marked safe without a model call, so
+# the list errs wide: a false hit only costs a model call. The first
+# group matches word prefixes, the second whole words (short ones that
+# would otherwise hit "moment", "song" or "crypto").
+_SENSITIVE_HINTS = re.compile(
+    r"(?i)\b(?:"
+    # credentials and money
+    r"passw|api[_ -]?key|secret|token|credential|ssn|social security|credit card|"
+    r"bank|salary|income|debt|loan|mortgage|tax|fired|laid off|unemploy|"
+    # health
+    r"health|medical|medication|diagnos|therap|doctor|hospital|illness|pregnan|"
+    r"cancer|chemo|surgery|disease|disorder|adhd|autis|addict|sober|rehab|"
+    r"alcohol|suicid|self[- ]harm|funeral|passed away|"
+    # emotional states
+    r"depress|anxi|lonel|grief|griev|upset|afraid|scared|ashamed|embarrass|"
+    r"heartbr|stressed|feeling|struggl|"
+    # relationships and family
+    r"divorce|girlfriend|boyfriend|wife|husband|breakup|broke up|dating|"
+    r"marri|affair|famil|mother|father|sibling|grand(?:ma|pa|mother|father)|"
+    r"cousin|in-law|"
+    # identity, beliefs, private opinions
+    r"lesbian|bisexual|queer|transgender|nonbinary|sexual|coming out|not out|"
+    r"relig|faith|church|mosque|synagogue|pray|politic|democrat|republican|"
+    r"immigra|ethnic|disabilit|secretly|privately|confiden|don'?t tell|"
+    r"opinion|believ|"
+    # legal
+    r"lawsuit|legal|court|arrest"
+    r")"
+    r"|\b(?:"
+    r"sister|brother|mom|mum|dad|parents|son|daughter|kids?|children|uncle|aunt|"
+    r"ex|crush|cry|cried|crying|sad|hurt|angry|died|death|feels?|felt|"
+    r"gay|trans|vote[ds]?|hates?|thinks|boss"
+    r")\b"
+)
+PREFILTER_REASON = "pre-filter: no sensitive tokens"
+
 CLASSIFY_PROMPT = """You are a privacy classifier for a personal memory system.
 Analyze each memory and classify its sensitivity level.
 
@@ -44,19 +88,55 @@ Return JSON only, no other text:
 {"level": "safe", "reason": "General technical preference"}"""
 
 
+def _content_key(content: str) -> str:
+    return make_key(normalize_query(content))
+
+
+def _apply_cached(store: Store, memories: list, counts: dict, user_id: str) -> list:
+    """Apply cached verdicts for repeated content; return the memories left."""
+    remaining = []
+    for mem in memories:
+        cached = classification_cache.get(_content_key(mem.content))
+        if cached is None:
+            remaining.append(mem)
+            continue
+        store.qdrant.update_sensitivity(
+            mem.id, cached["level"], cached["reason"], user_id=user_id,
+        )
+        counts[cached["level"]] += 1
+    return remaining
+
+
+def _maybe_sensitive(content: str) -> bool:
+    return bool(_SENSITIVE_HINTS.search(content)) or check_pii(content) is not None
+
+
+_DECODER = json.JSONDecoder()
+
+
+def _decode_from(text: str, opener: str):
+    """Decode the JSON value starting at the first `opener`, or None.
+
+    raw_decode parses in place and stops at the value's end, so prose
+    around the JSON costs neither a substring copy nor a second parse.
+    """
+    start = text.find(opener)
+    if start < 0:
+        return None
+    try:
+        return _DECODER.raw_decode(text, start)[0]
+    except json.JSONDecodeError:
+        return None
+
+
 def _parse_json_array(text: str) -> list[dict]:
     """Parse JSON array from LLM response, with fallback extraction."""
     try:
         return json.loads(text)
     except json.JSONDecodeError:
-        start = text.find("[")
-        end = text.rfind("]")
-        if start >= 0 and end > start:
-            try:
-                return json.loads(text[start : end + 1])
-            except json.JSONDecodeError:
-                pass
-    return []
+        pass
+    found = _decode_from(text, "[")
+    return found if isinstance(found, list) else []
 
 
 def _parse_json_object(text: str) -> dict:
@@ -64,14 +144,9 @@ def _parse_json_object(text: str) -> dict:
     try:
         return json.loads(text)
     except json.JSONDecodeError:
-        start = text.find("{")
-        end = text.rfind("}")
-        if start >= 0 and end > start:
-            try:
-                return json.loads(text[start : end + 1])
-            except json.JSONDecodeError:
-                pass
-    return {}
+        pass
+    found = _decode_from(text, "{")
+    return found if isinstance(found, dict) else {}
 
 
 async def classify_single(
@@ -92,6 +167,14 @@ async def classify_single(
     if not mem:
         return {"level": "unknown", "reason": "memory not found"}
 
+    key = _content_key(mem.content)
+    cached = classification_cache.get(key)
+    if cached is not None:
+        store.qdrant.update_sensitivity(
+            memory_id, cached["level"], cached["reason"], user_id=user_id,
+        )
+        return dict(cached)
+
     try:
         text = await _call_anthropic(
             CLASSIFY_SINGLE_PROMPT,
@@ -105,6 +188,7 @@ async def classify_single(
 
         if level in ("safe", "sensitive", "critical"):
             store.qdrant.update_sensitivity(memory_id, level, reason, user_id=user_id)
+            classification_cache.set(key, {"level": level, "reason": reason})
             return {"level": level, "reason": reason}
 
         return {"level": "unknown", "reason": "invalid classification response"}
@@ -118,6 +202,7 @@ async def classify_memories(
     user_id: str = "local",
     batch_size: int = 20,
     force: bool = False,
+    use_batch_api: bool = False,
 ) -> str:
     """Batch-classify memories for sensitivity using Opus.
 
@@ -125,7 +210,13 @@ async def classify_memories(
         store: Memory store instance.
         user_id: User to classify for.
         batch_size: Memories per API call.
-        force: If True, re-classify all memories (not just unclassified).
+        force: If True, re-classify all memories (not just unclassified)
+            with the model, bypassing cached verdicts and the keyword
+            pre-filter.
+        use_batch_api: Queue one request per memory on the Message Batches
+            API (half price, results within 24h) instead of waiting on
+            live calls. Results are applied by `poll_classification_batches`.
+            Needs a direct Anthropic key; cloud keys use live calls.
 
     Returns summary string.
     """
@@ -145,21 +236,72 @@ async def classify_memories(
 
     total = len(memories)
     counts = {"safe": 0, "sensitive": 0, "critical": 0, "failed": 0}
+    # Repeated content reuses the earlier verdict
+    if not force:
+        memories = _apply_cached(store, memories, counts, user_id)
+        # Most memories ("prefers dark mode") have nothing worth a model call
+        flagged = []
+        for mem in memories:
+            if _maybe_sensitive(mem.content):
+                flagged.append(mem)
+            else:
+                store.qdrant.update_sensitivity(
+                    mem.id, "safe", PREFILTER_REASON, user_id=user_id,
+                )
+                counts["safe"] += 1
+        memories = flagged
+
+    if memories and use_batch_api and not api_key.startswith("cmk-sk-"):
+        # Queued memories stay unclassified until polled; don't pay twice
+        queued = store.auth_db.pending_batch_memory_ids(user_id, CLASSIFY_BATCH_KIND)
+        memories = [m for m in memories if m.id not in queued]
+        if not memories:
+            return (
+                "All unclassified memories are already queued.\n"
+                "Run `cmk classify --poll` to apply the results once they end."
+            )
+        batch_id = await _submit_message_batch(
+            [
+                (m.id, CLASSIFY_SINGLE_PROMPT, f"Memory content:\n{m.content}")
+                for m in memories
+            ],
+            api_key,
+            max_tokens=256,
+        )
+        store.auth_db.add_pending_batch(
+            batch_id, user_id, CLASSIFY_BATCH_KIND, [m.id for m in memories],
+        )
+        return (
+            f"Queued {len(memories)} memories for classification (batch {batch_id}).\n"
+            "Run `cmk classify --poll` to apply the results once it ends."
+        )
+
+    # Batches are independent; overlap the LLM calls, capped for rate limits
+    batches = [
+        memories[i : i + batch_size] for i in range(0, len(memories), batch_size)
+    ]
+    sem = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
 
-    # Process in batches
-    for i in range(0, total, batch_size):
-        batch = memories[i : i + batch_size]
+    async def _classify(batch: list) -> str:
         batch_text = "\n".join(
             f"[{m.id}] {m.content}" for m in batch
         )
-
-        try:
-            text = await _call_anthropic(
+        async with sem:
+            return await _call_anthropic(
                 CLASSIFY_PROMPT,
                 f"Memories to classify:\n{batch_text}",
                 api_key,
                 max_tokens=2048,
             )
+
+    responses = await asyncio.gather(
+        *(_classify(batch) for batch in batches), return_exceptions=True,
+    )
+
+    for batch, text in zip(batches, responses):
+        try:
+            if isinstance(text, BaseException):
+                raise text
             results = _parse_json_array(text)
 
             # Index results by id for lookup
@@ -168,9 +310,12 @@ async def classify_memories(
             for mem in batch:
                 r = by_id.get(mem.id)
                 if r and r.get("level") in ("safe", "sensitive", "critical"):
+                    reason = r.get("reason", "")
                     store.qdrant.update_sensitivity(
-                        mem.id, r["level"], r.get("reason", ""),
-                        user_id=user_id,
+                        mem.id, r["level"], reason, user_id=user_id,
+                    )
+                    classification_cache.set(
+                        _content_key(mem.content), {"level": r["level"], "reason": reason},
                     )
                     counts[r["level"]] += 1
                 else:
@@ -180,7 +325,11 @@ async def classify_memories(
             log.warning("batch classification failed: %s", e)
             counts["failed"] += len(batch)
 
-    parts = [f"Classified {total} memories:"]
+    return _summary(f"Classified {total} memories:", counts)
+
+
+def _summary(title: str, counts: dict) -> str:
+    parts = [title]
     for level in ("safe", "sensitive", "critical"):
         if counts[level]:
             parts.append(f"  {level}: {counts[level]}")
@@ -189,6 +338,70 @@ async def classify_memories(
     return "\n".join(parts)
 
 
+async def poll_classification_batches(
+    store: Store,
+    user_id: str = "local",
+) -> str:
+    """Apply the results of finished classification batches.
+
+    Batches still processing stay pending for the next poll. Requests
+    that errored inside a finished batch leave their memory unclassified,
+    so the next `classify_memories` run picks it up again.
+    """
+    api_key = get_api_key()
+    if not api_key:
+        return "No API key configured. Cannot classify memories."
+
+    pending = store.auth_db.list_pending_batches(user_id, CLASSIFY_BATCH_KIND)
+    if not pending:
+        return "No classification batches pending."
+
+    counts = {"safe": 0, "sensitive": 0, "critical": 0, "failed": 0}
+    finished: list[str] = []
+    for batch_id in pending:
+        try:
+            texts = await _fetch_message_batch(batch_id, api_key)
+        except Exception as e:
+            log.warning("polling batch %s failed: %s", batch_id, e)
+            continue
+        if texts is None:
+            continue
+        # Contents for the classification cache, in one lookup
+        mems = store.qdrant.get_memories(list(texts), user_id=user_id)
+        for memory_id, text in texts.items():
+            result = _parse_json_object(text)
+            level = result.get("level")
+            if level in ("safe", "sensitive", "critical"):
+                reason = result.get("reason", "")
+                store.qdrant.update_sensitivity(
+                    memory_id, level, reason, user_id=user_id,
+                )
+                if memory_id in mems:
+                    classification_cache.set(
+                        _content_key(mems[memory_id].content),
+                        {"level": level, "reason": reason},
+                    )
+                counts[level] += 1
+            else:
+                counts["failed"] += 1
+        finished.append(batch_id)
+
+    # Re-applying a batch is harmless, so a crash before this point only
+    # costs a repeat poll; one commit covers every finished batch.
+    with store.auth_db.transaction():
+        for batch_id in finished:
+            store.auth_db.delete_pending_batch(batch_id)
+
+    applied = len(finished)
+    waiting = len(pending) - applied
+    if not applied:
+        return f"{waiting} classification batches still processing."
+    summary = _summary(f"Applied {applied} classification batches:", counts)
+    if waiting:
+        summary += f"\n{waiting} still processing."
+    return summary
+
+
 async def reclassify_memory(
     store: Store,
     memory_id: str,
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from ..store import Store
@@ -10,12 +11,14 @@ async def do_forget(
     user_id: str = "local", team_id: str | None = None,
 ) -> str:
     # Try private namespace first
-    memory = store.qdrant.delete_memory(memory_id, user_id=user_id)
+    memory = await store.qdrant.adelete_memory(memory_id, user_id=user_id)
 
     # If not found and team_id is set, try team namespace
     if memory is None and team_id:
         # Look up the memory to check creator before deleting
-        team_mem = store.qdrant.get_memory(memory_id, user_id=f"team:{team_id}")
+        team_mem = await asyncio.to_thread(
+            store.qdrant.get_memory, memory_id, user_id=f"team:{team_id}",
+        )
         if team_mem:
             created_by = getattr(team_mem, "created_by", None)
             if created_by and created_by != user_id:
@@ -26,7 +29,7 @@ async def do_forget(
                         f"Cannot delete team memory {memory_id}: "
                         "only the creator or a team admin can delete it."
                     )
-            memory = store.qdrant.delete_memory(
+            memory = await store.qdrant.adelete_memory(
                 memory_id, user_id=f"team:{team_id}",
             )
 
@@ -1,6 +1,9 @@
+import asyncio
 import logging
+import weakref
 from datetime import datetime, timezone
 
+from ..cache import identity_cache
 from ..config import get_api_key
 from ..extract import regenerate_identity
 from ..store import Store
@@ -8,21 +11,41 @@ from ..types import IdentityCard
 
 log = logging.getLogger("cmk")
 
+# One lock per user while someone holds it, so concurrent calls share a read
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _read_identity(store: Store, user_id: str) -> str | None:
+    """Identity card plus recent journal context, or None without a card."""
+    identity = store.qdrant.get_identity(user_id=user_id)
+    if not identity:
+        return None
+    # Append recent journal context
+    recent = store.qdrant.recent_journal(days=2, user_id=user_id, limit=10)
+    if not recent:
+        return identity.content
+    lines = [f"[{e['gate']}] {e['content']}\n" for e in recent[:10]]
+    return identity.content + "\n\n---\nRecent context:\n" + "".join(lines)
+
 
 async def do_identity(
     store: Store, onboard_response: str | None = None,
     user_id: str = "local",
 ) -> str:
     # If identity exists, return it
-    identity = store.qdrant.get_identity(user_id=user_id)
-    if identity:
-        output = identity.content
-        # Append recent journal context
-        recent = store.qdrant.recent_journal(days=2, user_id=user_id)
-        if recent:
-            output += "\n\n---\nRecent context:\n"
-            for e in recent[:10]:
-                output += f"[{e['gate']}] {e['content']}\n"
+    output = identity_cache.get(user_id)
+    if output is not None:
+        return output
+    lock = _locks.get(user_id)
+    if lock is None:
+        lock = _locks[user_id] = asyncio.Lock()
+    async with lock:
+        output = identity_cache.get(user_id)
+        if output is None:
+            output = await asyncio.to_thread(_read_identity, store, user_id)
+            if output is not None:
+                identity_cache.set(user_id, output)
+    if output is not None:
         return output
 
     # No identity yet. Create a basic one from the onboard response or
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from ..store import Store
@@ -8,26 +9,25 @@ log = logging.getLogger("cmk")
 async def do_prime(
     store: Store, message: str, user_id: str = "local"
 ) -> str:
-    """Proactive recall. Hybrid search (dense + sparse, RRF) top 3."""
+    """Proactive recall. Fast path: two-stage dense search, top 3 by cosine."""
     try:
-        results = store.qdrant.search(message, limit=3, user_id=user_id)
+        results = await store.qdrant.asearch_dense(message, limit=3, user_id=user_id)
     except Exception as e:
-        log.warning("prime hybrid search failed: %s", e)
+        log.warning("prime dense search failed: %s", e)
         return "No relevant memories found."
 
     if not results:
         return "No relevant memories found."
 
-    lines = []
-    for mem_id, score in results:
-        if score < 0.3:
-            continue
-        full = store.qdrant.get_memory(mem_id, user_id=user_id)
-        if full:
-            store.qdrant.touch_memory(mem_id, user_id=user_id)
-            lines.append(
-                f"[{full.gate.value}, relevance={score:.2f}] {full.content}"
-            )
+    relevant = [(mem_id, score) for mem_id, score in results if score >= 0.3]
+    fulls = await asyncio.to_thread(
+        store.qdrant.get_memories, [mem_id for mem_id, _ in relevant], user_id=user_id,
+    )
+    lines = [
+        f"[{fulls[mem_id].gate.value}, relevance={score:.2f}] {fulls[mem_id].content}"
+        for mem_id, score in relevant if mem_id in fulls
+    ]
+    await store.qdrant.atouch_memories(list(fulls.values()))
 
     if not lines:
         return "No relevant memories found."
@@ -5,6 +5,19 @@ from ..store import Store
 
 log = logging.getLogger("cmk")
 
+RRF_K = 60
+RECALL_LIMIT = 10
+TEXT_LIMIT = 5
+
+
+def rrf_fuse(*ranked_lists: list[tuple[str, float]]) -> list[tuple[str, float]]:
+    """Reciprocal rank fusion: score[id] += 1 / (k + rank), rank from 1."""
+    fused: dict[str, float] = {}
+    for ranked in ranked_lists:
+        for rank, (mem_id, _) in enumerate(ranked, start=1):
+            fused[mem_id] = fused.get(mem_id, 0.0) + 1.0 / (RRF_K + rank)
+    return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
+
 
 async def do_recall(
     store: Store, query: str, user_id: str = "local",
@@ -21,62 +34,80 @@ async def do_recall(
             return "[team] "
         return "[private] "
 
-    def _get_memory(mem_id):
-        """Look up memory by id, trying private then team namespace."""
-        mem = store.qdrant.get_memory(mem_id, user_id=user_id)
-        if mem is None and team_id:
-            mem = store.qdrant.get_memory(mem_id, user_id=f"team:{team_id}")
-        return mem
+    def _get_memories(mem_ids):
+        """Look up memories by id, trying private then team namespace."""
+        mems = store.qdrant.get_memories(mem_ids, user_id=user_id)
+        missing = [mid for mid in mem_ids if mid not in mems]
+        if missing and team_id:
+            mems.update(store.qdrant.get_memories(missing, user_id=f"team:{team_id}"))
+        return mems
+
+    # 1. Hybrid (dense + sparse) and text search run concurrently,
+    #    then the two ranked lists are fused with RRF.
+    async def _run(label, fn, limit):
+        try:
+            return await fn(query, limit, user_id, team_id)
+        except Exception as e:
+            log.warning("%s search failed: %s", label, e)
+            return []
 
-    # 1. Hybrid search (dense + sparse with RRF fusion) via Qdrant
+    searches = [_run("hybrid", store.qdrant.asearch, RECALL_LIMIT)]
+    if not store.qdrant._disabled:
+        searches.append(_run("text", store.qdrant.asearch_text, TEXT_LIMIT))
+    ranked = await asyncio.gather(*searches)
+    vec_results = ranked[0]
+    text_results = ranked[1] if len(ranked) > 1 else []
+    vec_scores = dict(vec_results)
+    fused = [mem_id for mem_id, _ in rrf_fuse(vec_results, text_results)[:RECALL_LIMIT]]
+
+    # 2. Hydrate the fused hits in one lookup; if it fails, only the
+    #    graph fallback below can still answer.
     try:
-        vec_results = await asyncio.to_thread(
-            store.qdrant.search, query, 10, user_id, team_id
+        fulls = await asyncio.to_thread(_get_memories, fused)
+    except Exception as e:
+        log.warning("memory lookup failed: %s", e)
+        fulls = {}
+    found = []
+    for mem_id in fused:
+        seen_ids.add(mem_id)
+        full = fulls.get(mem_id)
+        if not full:
+            continue
+        found.append(full)
+        person = full.person or "?"
+        tag = _source_tag(full)
+        if mem_id in vec_scores:
+            label = f"score={vec_scores[mem_id]:.2f}"
+        else:
+            label = "text"
+        results.append(
+            f"{tag}[{full.gate.value}, {label}] "
+            f"({full.created:%Y-%m-%d}, {person}) "
+            f"{full.content}\n  id: {full.id}"
         )
-        for mem_id, score in vec_results:
-            if mem_id not in seen_ids:
-                seen_ids.add(mem_id)
-                full = _get_memory(mem_id)
-                if full:
-                    store.qdrant.touch_memory(mem_id, user_id=user_id)
-                    person = full.person or "?"
-                    tag = _source_tag(full)
-                    results.append(
-                        f"{tag}[{full.gate.value}, score={score:.2f}] "
-                        f"({full.created:%Y-%m-%d}, {person}) "
-                        f"{full.content}\n  id: {full.id}"
-                    )
+    # One batched access bump; a failure only loses the access counts
+    try:
+        await store.qdrant.atouch_memories(found)
     except Exception as e:
-        log.warning("hybrid search failed: %s", e)
+        log.warning("touch failed: %s", e)
 
-    # 2. Text search fallback when hybrid returned nothing
-    if not results and not store.qdrant._disabled:
-        try:
-            text_results = await asyncio.to_thread(
-                store.qdrant.search_text, query, 5, user_id, team_id
-            )
-            for mem_id, score in text_results:
-                if mem_id not in seen_ids:
-                    seen_ids.add(mem_id)
-                    full = _get_memory(mem_id)
-                    if full:
-                        store.qdrant.touch_memory(mem_id, user_id=user_id)
-                        person = full.person or "?"
-                        tag = _source_tag(full)
-                        results.append(
-                            f"{tag}[{full.gate.value}, text] "
-                            f"({full.created:%Y-%m-%d}, {person}) "
-                            f"{full.content}\n  id: {full.id}"
-                        )
-        except Exception as e:
-            log.warning("text search failed: %s", e)
-
-    # 3. Graph traversal for sparse results
+    # 3. Graph traversal for sparse results from the top two found hits,
+    #    one task per seed
     if len(results) < 3:
-        for mid in list(seen_ids)[:2]:
-            related = store.qdrant.find_related(
-                mid, depth=2, user_id=user_id
-            )
+        seeds = [mem.id for mem in found[:2]]
+        traversals = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    store.qdrant.find_related, mid, depth=2, user_id=user_id,
+                )
+                for mid in seeds
+            ),
+            return_exceptions=True,
+        )
+        for mid, related in zip(seeds, traversals):
+            if isinstance(related, Exception):
+                log.warning("graph traversal failed for %s: %s", mid, related)
+                continue
             for rel in related:
                 rid = rel["id"]
                 if rid not in seen_ids:
@@ -2,7 +2,7 @@ import logging
 from datetime import datetime, timezone
 
 from ..config import get_api_key
-from ..consolidation.decay import is_fading
+from ..consolidation.decay import fading_mask
 from ..consolidation.digest import consolidate_journals
 from ..extract import regenerate_identity
 from ..store import Store
@@ -27,15 +27,15 @@ async def do_reflect(store: Store, user_id: str = "local") -> str:
     else:
         report.append("No API key. Skipping journal consolidation.")
 
-    # 2. Apply decay: delete fading memories
-    fading_count = 0
+    # 2. Apply decay: delete fading memories in one request
     all_memories = store.qdrant.list_memories(limit=500, user_id=user_id)
-    for mem in all_memories:
-        if is_fading(mem):
-            store.qdrant.delete_memory(mem.id, user_id=user_id)
-            fading_count += 1
-    if fading_count:
-        report.append(f"Archived {fading_count} fading memories.")
+    fading_ids = [
+        mem.id for mem, fading in zip(all_memories, fading_mask(all_memories))
+        if fading
+    ]
+    if fading_ids:
+        store.qdrant.delete_memories(fading_ids, user_id=user_id)
+        report.append(f"Archived {len(fading_ids)} fading memories.")
 
     # 3. Regenerate identity card from recent memories
     if api_key:
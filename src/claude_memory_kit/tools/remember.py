@@ -50,12 +50,12 @@ async def do_remember(
         person=person,
         project=project,
     )
-    store.qdrant.insert_journal(entry, user_id=user_id)
+    await store.qdrant.ainsert_journal(entry, user_id=user_id)
 
     # 2. Insert memory (full metadata in Qdrant payload)
     if visibility == "team" and not team_id:
         return "Cannot save team memory: no team configured. Run 'cmk team join <id>' first."
-    store.qdrant.insert_memory(
+    await store.qdrant.ainsert_memory(
         memory, user_id=user_id,
         visibility=visibility if visibility != "private" else None,
         team_id=team_id if visibility == "team" else None,
@@ -68,7 +68,7 @@ async def do_remember(
     # 4. Contradiction check via vectors
     warning = ""
     try:
-        similar = store.qdrant.search(content, limit=3, user_id=user_id, team_id=team_id)
+        similar = await store.qdrant.asearch(content, limit=3, user_id=user_id, team_id=team_id)
         for sid, score in similar:
             if sid != mem_id and score > 0.85:
                 existing = store.qdrant.get_memory(sid, user_id=user_id)
@@ -82,15 +82,16 @@ async def do_remember(
     except Exception as e:
         log.warning("contradiction check failed: %s", e)
 
+    # Edges from this memory, written in one payload update after step 6
+    edges: list[tuple[str, str]] = []
+
     # 5. Correction gate: create CONTRADICTS edge, downgrade old
     if gate == Gate.correction:
         try:
-            similar = store.qdrant.search(content, limit=1, user_id=user_id)
+            similar = await store.qdrant.asearch(content, limit=1, user_id=user_id)
             for sid, score in similar:
                 if sid != mem_id and score > 0.5:
-                    store.qdrant.add_edge(
-                        mem_id, sid, "CONTRADICTS", user_id=user_id
-                    )
+                    edges.append((sid, "CONTRADICTS"))
                     old = store.qdrant.get_memory(sid, user_id=user_id)
                     if old:
                         store.qdrant.update_confidence(
@@ -102,18 +103,22 @@ async def do_remember(
     # 6. Memory chains: FOLLOWS edge for same person+project within 24h
     if person or project:
         try:
-            cutoff = (now - timedelta(hours=24)).isoformat()
+            cutoff = (now - timedelta(hours=24)).timestamp()
             recent_id = store.qdrant.find_recent_in_context(
                 exclude_id=mem_id, cutoff=cutoff,
                 person=person, project=project, user_id=user_id,
             )
             if recent_id:
-                store.qdrant.add_edge(
-                    mem_id, recent_id, "FOLLOWS", user_id=user_id
-                )
+                edges.append((recent_id, "FOLLOWS"))
         except Exception as e:
             log.warning("memory chain failed: %s", e)
 
+    if edges:
+        try:
+            store.qdrant.add_edges(mem_id, edges, user_id=user_id)
+        except Exception as e:
+            log.warning("edge write failed: %s", e)
+
     # 7. PII detection
     pii_warning = check_pii(content)
     if pii_warning:
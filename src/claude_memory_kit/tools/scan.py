@@ -1,8 +1,7 @@
-import re
 import logging
 
 from ..store import Store
-from ._pii import PII_PATTERNS, luhn_check
+from ._pii import candidate_patterns, luhn_check
 
 log = logging.getLogger("cmk")
 
@@ -10,13 +9,11 @@ log = logging.getLogger("cmk")
 def scan_content(text: str) -> list[dict]:
     """Scan a string for PII/sensitive data patterns. Returns list of findings."""
     findings = []
-    for label, pattern in PII_PATTERNS:
+    for label, pattern in candidate_patterns(text):
         for match in pattern.finditer(text):
             # For credit card patterns, verify with Luhn
-            if label.startswith("Credit card"):
-                digits = re.sub(r"\D", "", match.group())
-                if not luhn_check(digits):
-                    continue
+            if label.startswith("Credit card") and not luhn_check(match.group()):
+                continue
             findings.append({
                 "type": label,
                 "match": match.group()[:40],
@@ -29,10 +26,10 @@ async def do_scan(
     store: Store, user_id: str = "local", limit: int = 500
 ) -> str:
     """Scan all memories for PII/sensitive data patterns."""
-    memories = store.qdrant.list_memories(limit=limit, user_id=user_id)
-
+    scanned = 0
     flagged = []
-    for mem in memories:
+    for mem in store.qdrant.iter_memories(user_id=user_id, limit=limit):
+        scanned += 1
         findings = scan_content(mem.content)
         if findings:
             types = sorted(set(f["type"] for f in findings))
@@ -45,9 +42,9 @@ async def do_scan(
             })
 
     if not flagged:
-        return f"Scanned {len(memories)} memories. No sensitive data patterns found."
+        return f"Scanned {scanned} memories. No sensitive data patterns found."
 
-    lines = [f"Scanned {len(memories)} memories. Found {len(flagged)} with potential sensitive data:\n"]
+    lines = [f"Scanned {scanned} memories. Found {len(flagged)} with potential sensitive data:\n"]
     for item in flagged:
         types_str = ", ".join(item["types"])
         lines.append(
@@ -2,6 +2,7 @@
 
 import os
 import tempfile
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -14,6 +15,34 @@ os.environ["BETTER_AUTH_SECRET"] = ""
 os.environ["DATABASE_URL"] = ""
 
 
+@pytest.fixture(autouse=True)
+def _clear_config_cache():
+    """Config getters are cached per process; tests change env freely."""
+    from claude_memory_kit.config import clear_config_cache
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+@pytest.fixture(autouse=True)
+def _clear_synthesis_cache():
+    """Synthesis, search, recall, classification and identity results are
+    memoized process-wide; isolate each test."""
+    from claude_memory_kit.cache import (
+        classification_cache, identity_cache, recall_cache, search_cache,
+        synthesis_cache,
+    )
+    caches = (
+        synthesis_cache, search_cache, recall_cache, classification_cache,
+        identity_cache,
+    )
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
 @pytest.fixture
 def tmp_store_path(tmp_path):
     """Return a fresh temp directory for store data."""
@@ -35,9 +64,14 @@ def qdrant_db():
     from qdrant_client import QdrantClient
     from qdrant_client.models import SparseVector
     from claude_memory_kit.store.qdrant_store import QdrantStore
+    from claude_memory_kit.cache import TTLCache
 
     qs = QdrantStore.__new__(QdrantStore)
     qs.client = QdrantClient(":memory:")
+    qs.aclient = None
+    qs._text_cache = TTLCache()
+    qs._query_cache = TTLCache()
+    qs._stats_cache = TTLCache()
     qs._cloud = False
     qs._disabled = False
     qs._jina_key = ""
@@ -52,6 +86,7 @@ def qdrant_db():
             "sparse": SparseVector(indices=[0], values=[1.0]),
         }
     qs._make_vector = _fake_vector
+    qs.embed_passages = MagicMock()
 
     return qs
 
@@ -10,6 +10,7 @@ from fastapi.testclient import TestClient
 
 from claude_memory_kit.api.app import app, _auth, _get_store
 from claude_memory_kit.auth import LOCAL_USER
+from claude_memory_kit.store import StoreCounts
 from claude_memory_kit.types import (
     Memory, Gate, DecayClass, IdentityCard,
 )
@@ -51,8 +52,8 @@ def setup_store(qdrant_db, db, monkeypatch):
     store = MagicMock()
     store.qdrant = qdrant_db
     store.auth_db = db
-    store.count_user_data.return_value = {"total": 0, "memories": 0}
-    store.migrate_user_data.return_value = {"memories": 0}
+    store.count_user_data.return_value = StoreCounts()
+    store.migrate_user_data.return_value = StoreCounts()
     app.state.store = store
     return store
 
@@ -159,7 +160,10 @@ def test_get_memory(client, qdrant_db):
     qdrant_db.insert_memory(mem)
     resp = client.get("/api/memories/mem_get_001")
     assert resp.status_code == 200
-    assert resp.json()["id"] == "mem_get_001"
+    assert resp.headers["content-type"] == "application/json"
+    data = resp.json()
+    assert data["id"] == "mem_get_001"
+    assert datetime.fromisoformat(data["created"]) == mem.created
 
 
 def test_get_memory_not_found(client):
@@ -211,6 +215,19 @@ def test_list_memories_with_filters(client, qdrant_db):
     assert all(m["gate"] == "behavioral" for m in mems)
 
 
+def test_list_memories_serialized_as_json(client, qdrant_db):
+    mem = _make_memory(id="m_json", gate=Gate.relational, person="Alice")
+    qdrant_db.insert_memory(mem)
+    resp = client.get("/api/memories")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    [item] = resp.json()["memories"]
+    assert item["id"] == "m_json"
+    assert item["gate"] == "relational"
+    assert item["decay_class"] == mem.decay_class.value
+    assert datetime.fromisoformat(item["created"]).tzinfo is not None
+
+
 # ---- Pin ----
 
 def test_pin_memory(client, qdrant_db):
@@ -250,6 +267,23 @@ def test_search(client, setup_store):
         assert "result" in resp.json()
 
 
+def test_search_cached_per_user_and_normalized_query(client):
+    with patch("claude_memory_kit.api.app.do_recall", new_callable=AsyncMock) as mock_recall:
+        mock_recall.return_value = "found 1 result"
+        client.post("/api/search", json={"query": "Coffee"})
+        resp = client.post("/api/search", json={"query": "  coffee "})
+        assert resp.json() == {"result": "found 1 result"}
+        assert mock_recall.await_count == 1
+
+        client.post("/api/memories", json={"content": "likes tea", "gate": "behavioral"})
+        client.post("/api/search", json={"query": "coffee"})
+        assert mock_recall.await_count == 2
+
+    stats = client.get("/api/stats").json()["search_cache"]
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == round(1 / 3, 3)
+
+
 def test_search_empty_query(client):
     resp = client.post("/api/search", json={"query": ""})
     assert resp.status_code == 422
@@ -421,6 +455,7 @@ def test_get_stats(client, qdrant_db):
     assert "total" in data
     assert "by_gate" in data
     assert "has_identity" in data
+    assert data["synthesis_cache"] == {"hits": 0, "misses": 0, "size": 0, "hit_rate": 0.0}
 
 
 def test_get_stats_with_data(client, qdrant_db):
@@ -564,7 +599,7 @@ def test_claim_local_as_authenticated_user(client, setup_store):
         "id": "user_claim_001", "email": "claimer@example.com",
         "name": "Claimer", "plan": "free",
     }
-    setup_store.count_user_data.return_value = {"total": 0}
+    setup_store.count_user_data.return_value = StoreCounts()
     try:
         resp = client.post("/api/claim-local")
         assert resp.status_code == 200
@@ -579,8 +614,8 @@ def test_claim_local_with_data(client, setup_store):
         "id": "user_claim_002", "email": "c2@example.com",
         "name": "C2", "plan": "free",
     }
-    setup_store.count_user_data.return_value = {"total": 5, "memories": 5}
-    setup_store.migrate_user_data.return_value = {"memories": 5}
+    setup_store.count_user_data.return_value = StoreCounts(memories=5)
+    setup_store.migrate_user_data.return_value = StoreCounts(memories=5)
     try:
         resp = client.post("/api/claim-local")
         assert resp.status_code == 200
@@ -608,6 +643,7 @@ def test_lifespan_runs(monkeypatch):
     import asyncio
 
     mock_store = MagicMock()
+    mock_store.qdrant.aclose = AsyncMock()
     with patch("claude_memory_kit.api.app.Store", return_value=mock_store), \
          patch("claude_memory_kit.api.app.get_store_path", return_value="/tmp/test"):
         async def _run():
@@ -625,6 +661,7 @@ def test_lifespan_auth_warning(monkeypatch):
     import asyncio
 
     mock_store = MagicMock()
+    mock_store.qdrant.aclose = AsyncMock()
     with patch("claude_memory_kit.api.app.Store", return_value=mock_store), \
          patch("claude_memory_kit.api.app.get_store_path", return_value="/tmp/test"):
         async def _run():
@@ -642,6 +679,7 @@ def test_lifespan_auth_enabled(monkeypatch):
     import asyncio
 
     mock_store = MagicMock()
+    mock_store.qdrant.aclose = AsyncMock()
     with patch("claude_memory_kit.api.app.Store", return_value=mock_store), \
          patch("claude_memory_kit.api.app.get_store_path", return_value="/tmp/test"):
         async def _run():
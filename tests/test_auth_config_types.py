@@ -220,6 +220,14 @@ class TestConfig:
         path = config_module.get_store_path()
         assert path == "/tmp/custom-store"
 
+    def test_get_store_path_cached_until_cleared(self, monkeypatch):
+        monkeypatch.setenv("MEMORY_STORE_PATH", "/tmp/first-store")
+        assert config_module.get_store_path() == "/tmp/first-store"
+        monkeypatch.setenv("MEMORY_STORE_PATH", "/tmp/second-store")
+        assert config_module.get_store_path() == "/tmp/first-store"
+        config_module.clear_config_cache()
+        assert config_module.get_store_path() == "/tmp/second-store"
+
     def test_get_qdrant_config_local(self, monkeypatch):
         monkeypatch.setenv("QDRANT_URL", "")
         cfg = config_module.get_qdrant_config()
@@ -234,6 +242,22 @@ class TestConfig:
         assert cfg["url"] == "https://my-cluster.qdrant.io"
         assert cfg["api_key"] == "qdrant-key-123"
         assert cfg["jina_api_key"] == "jina-key-456"
+        assert cfg["prefer_grpc"] is True
+
+    def test_get_qdrant_config_grpc_opt_out(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_URL", "https://my-cluster.qdrant.io")
+        monkeypatch.setenv("CMK_QDRANT_GRPC", "false")
+        assert config_module.get_qdrant_config()["prefer_grpc"] is False
+
+    def test_get_qdrant_config_hnsw_overrides(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_URL", "")
+        monkeypatch.setenv("CMK_HNSW_M", "24")
+        monkeypatch.setenv("CMK_HNSW_EF", "128")
+        monkeypatch.setenv("CMK_HNSW_EF_CONSTRUCT", "lots")
+        cfg = config_module.get_qdrant_config()
+        assert cfg["hnsw_m"] == 24
+        assert cfg["hnsw_ef"] == 128
+        assert cfg["hnsw_ef_construct"] is None
 
     def test_get_qdrant_config_placeholder_url(self, monkeypatch):
         monkeypatch.setenv("QDRANT_URL", "<your-qdrant-url>")
@@ -451,6 +475,21 @@ class TestCliAuth:
         result = cli_auth.load_credentials()
         assert result is None
 
+    def test_load_credentials_cached_until_saved(self, monkeypatch, tmp_path):
+        creds_file = tmp_path / "credentials.json"
+        creds_file.write_text(json.dumps({"user_id": "u1"}))
+        monkeypatch.setattr(cli_auth, "CREDENTIALS_DIR", str(tmp_path))
+        monkeypatch.setattr(cli_auth, "CREDENTIALS_FILE", str(creds_file))
+
+        creds = cli_auth.load_credentials()
+        creds["user_id"] = "mutated"
+        creds_file.write_text(json.dumps({"user_id": "u2"}))
+        # Served from cache, unaffected by the caller's edit
+        assert cli_auth.load_credentials() == {"user_id": "u1"}
+
+        cli_auth._save_credentials({"user_id": "u3"})
+        assert cli_auth.load_credentials() == {"user_id": "u3"}
+
     def test_save_credentials_writes_file(self, monkeypatch, tmp_path):
         creds_dir = tmp_path / "creds-dir"
         creds_file = creds_dir / "credentials.json"
@@ -9,6 +9,7 @@ from fastapi import HTTPException
 
 from claude_memory_kit import auth as auth_module
 from claude_memory_kit import extract as extract_module
+from claude_memory_kit.store import StoreCounts
 
 
 # ===========================================================================
@@ -344,9 +345,12 @@ class TestStoreInit:
         store = Store("/tmp/test-store")
         assert store.path == "/tmp/test-store"
         mock_sqlite_cls.assert_called_once_with("/tmp/test-store")
-        mock_qdrant_cls.assert_called_once_with("/tmp/test-store")
         assert store.auth_db is mock_sqlite_cls.return_value
+        # Qdrant is opened lazily, once
+        mock_qdrant_cls.assert_not_called()
+        assert store.qdrant is mock_qdrant_cls.return_value
         assert store.qdrant is mock_qdrant_cls.return_value
+        mock_qdrant_cls.assert_called_once_with("/tmp/test-store")
 
     @pytest.mark.asyncio
     @patch("claude_memory_kit.store.QdrantStore")
@@ -367,11 +371,14 @@ class TestStoreInit:
         from claude_memory_kit.store import Store
 
         store = Store("/tmp/test-store")
-        store.qdrant.count_memories.return_value = 5
+        store.qdrant.count_by_type.return_value = {"memory": 5, "journal": 2, "rule": 1}
         counts = store.count_user_data("user_1")
-        store.qdrant.count_memories.assert_called_once_with(user_id="user_1")
-        assert counts["memories"] == 5
-        assert counts["total"] == 5
+        store.qdrant.count_by_type.assert_called_once_with(user_id="user_1")
+        assert counts == StoreCounts(memories=5, journal=2, rules=1)
+        assert counts.total == 8
+        assert counts.to_dict() == {
+            "memories": 5, "journal": 2, "identity": 0, "rules": 1, "total": 8,
+        }
 
     @patch("claude_memory_kit.store.QdrantStore")
     @patch("claude_memory_kit.store.SqliteStore")
@@ -380,12 +387,42 @@ class TestStoreInit:
         from claude_memory_kit.store import Store
 
         store = Store("/tmp/test-store")
+        store.qdrant.count_by_type.return_value = {"memory": 5}
         store.qdrant.migrate_user_id.return_value = 5
 
         result = store.migrate_user_data("old_user", "new_user")
-        store.qdrant.migrate_user_id.assert_called_once_with("old_user", "new_user")
-        assert result["memories"] == 5
-        assert result["total"] == 5
+        store.qdrant.count_by_type.assert_called_once_with(user_id="old_user")
+        store.qdrant.migrate_user_id.assert_called_once_with("old_user", "new_user", count=5)
+        assert result == StoreCounts(memories=5)
+
+    @patch("claude_memory_kit.store.QdrantStore")
+    @patch("claude_memory_kit.store.SqliteStore")
+    def test_migrate_user_data_nothing_to_move(
+        self, mock_sqlite_cls, mock_qdrant_cls, monkeypatch,
+    ):
+        monkeypatch.setenv("DATABASE_URL", "")
+        from claude_memory_kit.store import Store
+
+        store = Store("/tmp/test-store")
+        store.qdrant.count_by_type.return_value = {}
+
+        assert store.migrate_user_data("old_user", "new_user") == StoreCounts()
+        store.qdrant.migrate_user_id.assert_not_called()
+
+    @patch("claude_memory_kit.store.QdrantStore")
+    @patch("claude_memory_kit.store.SqliteStore")
+    def test_migrate_user_data_with_known_counts(
+        self, mock_sqlite_cls, mock_qdrant_cls, monkeypatch,
+    ):
+        monkeypatch.setenv("DATABASE_URL", "")
+        from claude_memory_kit.store import Store
+
+        store = Store("/tmp/test-store")
+        counts = StoreCounts(memories=2, rules=1)
+
+        assert store.migrate_user_data("old_user", "new_user", counts=counts) == counts
+        store.qdrant.count_by_type.assert_not_called()
+        store.qdrant.migrate_user_id.assert_called_once_with("old_user", "new_user", count=3)
 
 
 # ===========================================================================
@@ -464,6 +501,65 @@ class TestCallAnthropic:
         assert call_kwargs[1]["json"]["max_tokens"] == 512
 
 
+class TestMessageBatches:
+    """Cover Message Batches submission and result collection."""
+
+    @staticmethod
+    def _client(mock_client_cls):
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client_cls.return_value = mock_client
+        return mock_client
+
+    @pytest.mark.asyncio
+    @patch("claude_memory_kit.extract.get_model", return_value="claude-opus-4-6")
+    @patch("claude_memory_kit.extract.httpx.AsyncClient")
+    async def test_submit(self, mock_client_cls, mock_get_model):
+        client = self._client(mock_client_cls)
+        client.post.return_value = MagicMock(
+            status_code=200, json=MagicMock(return_value={"id": "msgbatch_1"}),
+        )
+        batch_id = await extract_module._submit_message_batch(
+            [("mem_1", "sys", "hello")], "sk-ant-key", max_tokens=256,
+        )
+        assert batch_id == "msgbatch_1"
+        url = client.post.call_args.args[0]
+        body = client.post.call_args.kwargs["json"]
+        assert url.endswith("/v1/messages/batches")
+        assert body["requests"][0]["custom_id"] == "mem_1"
+        assert body["requests"][0]["params"]["max_tokens"] == 256
+
+    @pytest.mark.asyncio
+    @patch("claude_memory_kit.extract.httpx.AsyncClient")
+    async def test_fetch_in_progress(self, mock_client_cls):
+        client = self._client(mock_client_cls)
+        client.get.return_value = MagicMock(
+            status_code=200,
+            json=MagicMock(return_value={"processing_status": "in_progress"}),
+        )
+        assert await extract_module._fetch_message_batch("msgbatch_1", "k") is None
+        client.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("claude_memory_kit.extract.httpx.AsyncClient")
+    async def test_fetch_ended_keeps_succeeded(self, mock_client_cls):
+        client = self._client(mock_client_cls)
+        results = "\n".join(json.dumps(r) for r in [
+            {"custom_id": "mem_1", "result": {
+                "type": "succeeded", "message": {"content": [{"text": "ok"}]},
+            }},
+            {"custom_id": "mem_2", "result": {"type": "errored"}},
+        ])
+        client.get.side_effect = [
+            MagicMock(status_code=200, json=MagicMock(return_value={
+                "processing_status": "ended", "results_url": "https://r",
+            })),
+            MagicMock(status_code=200, text=results),
+        ]
+        assert await extract_module._fetch_message_batch("msgbatch_1", "k") == {"mem_1": "ok"}
+
+
 class TestExtractMemories:
     """Cover extract_memories JSON parsing including fallback."""
 
@@ -522,9 +618,37 @@ class TestConsolidateEntries:
             "Journal entries:\nentry1\nentry2",
             "key",
             max_tokens=1024,
+            model=extract_module.get_model(),
         )
 
 
+    @pytest.mark.asyncio
+    @patch("claude_memory_kit.extract._call_anthropic")
+    async def test_consolidate_entries_memoized(self, mock_call):
+        mock_call.return_value = "digest"
+        first = await extract_module.consolidate_entries("same week", "key")
+        second = await extract_module.consolidate_entries("same week", "key")
+        assert first == second == "digest"
+        mock_call.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("claude_memory_kit.extract._call_anthropic")
+    async def test_memo_keyed_on_resolved_model(self, mock_call):
+        mock_call.return_value = "digest"
+        with patch.object(extract_module, "get_model", side_effect=["m-a", "m-b"]):
+            await extract_module.consolidate_entries("same week", "key")
+            await extract_module.consolidate_entries("same week", "key")
+        assert [c.kwargs["model"] for c in mock_call.call_args_list] == ["m-a", "m-b"]
+
+    @pytest.mark.asyncio
+    @patch("claude_memory_kit.extract._call_anthropic")
+    async def test_empty_answer_not_cached(self, mock_call):
+        mock_call.side_effect = ["", "digest"]
+        assert await extract_module.consolidate_entries("week", "key") == ""
+        assert await extract_module.consolidate_entries("week", "key") == "digest"
+        assert mock_call.call_count == 2
+
+
 class TestRegenerateIdentity:
     """Cover regenerate_identity calls _call_anthropic."""
 
@@ -539,4 +663,5 @@ class TestRegenerateIdentity:
             "Memories:\nmemory1\nmemory2",
             "key",
             max_tokens=512,
+            model=extract_module.get_model(),
         )
@@ -0,0 +1,91 @@
+"""Tests for the in-process TTL/LRU cache (cache.py)."""
+
+from unittest.mock import patch
+
+from claude_memory_kit.cache import TTLCache, make_key, normalize_query
+
+
+class TestMakeKey:
+    def test_stable_and_part_sensitive(self):
+        assert make_key("model", "prompt") == make_key("model", "prompt")
+        assert make_key("model", "prompt") != make_key("modelp", "rompt")
+
+
+class TestNormalizeQuery:
+    def test_case_width_and_whitespace_folded(self):
+        assert normalize_query("  Ｐｙｔｈｏｎ TIPS ") == "python tips"
+
+
+class TestTTLCache:
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        assert cache.get("k") is None
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "hit_rate": 0.5}
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=4, ttl=10)
+        with patch("claude_memory_kit.cache.time.monotonic", return_value=100.0):
+            cache.set("k", "v")
+        with patch("claude_memory_kit.cache.time.monotonic", return_value=109.0):
+            assert cache.get("k") == "v"
+        with patch("claude_memory_kit.cache.time.monotonic", return_value=110.0):
+            assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_zero_ttl_stores_nothing(self):
+        cache = TTLCache(maxsize=4, ttl=0)
+        cache.set("k", "v")
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # a is now most recent
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_invalidate_keeps_counters(self):
+        cache = TTLCache()
+        cache.set(("q", 5), 1)
+        cache.get(("q", 5))
+        cache.invalidate()
+        assert cache.get(("q", 5)) is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 0, "hit_rate": 0.5}
+
+    def test_clear_resets_counters(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.get("a")
+        cache.clear()
+        assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "hit_rate": 0.0}
+
+    def test_concurrent_get_set_invalidate(self):
+        import threading
+
+        cache = TTLCache(maxsize=64, ttl=60)
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(2000):
+                    key = ("sparse", i % 32)
+                    cache.set(key, n)
+                    cache.get(key)
+                    if i % 50 == 0:
+                        cache.invalidate(lambda k: k[1] % 2 == 0)
+            except Exception as e:  # pragma: no cover - the failure mode
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert len(cache) <= 64
@@ -1,13 +1,16 @@
 """Tests for the CMK CLI (click commands)."""
 
 import asyncio
+import os
 from unittest.mock import MagicMock, AsyncMock, patch, PropertyMock
 from datetime import datetime, timezone
 
 import click
+import pytest
 from click.testing import CliRunner
 
 from claude_memory_kit.cli import main
+from claude_memory_kit.store import StoreCounts
 from claude_memory_kit.types import IdentityCard
 
 
@@ -306,6 +309,20 @@ class TestClassify:
             len(mock_classify.call_args.args) >= 3 and mock_classify.call_args.args[2] is True
         )
 
+    def test_classify_poll(self):
+        runner = CliRunner()
+        store = _make_mock_store()
+        with patch(STORE_PATCH, return_value=store), \
+             patch(USER_PATCH, return_value="local"), \
+             patch("claude_memory_kit.tools.classify.poll_classification_batches",
+                   new_callable=AsyncMock, return_value="Applied 1 classification batches:") as poll, \
+             patch("claude_memory_kit.tools.classify.classify_memories") as live:
+            result = runner.invoke(main, ["classify", "--poll"])
+        assert result.exit_code == 0
+        assert "Applied 1" in result.output
+        poll.assert_awaited_once_with(store, user_id="local")
+        live.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # serve
@@ -336,6 +353,33 @@ class TestServe:
             log_level="info",
         )
 
+    def test_serve_workers_in_cloud_mode(self):
+        runner = CliRunner()
+        with patch("uvicorn.run") as mock_uvicorn, \
+             patch("claude_memory_kit.cli.is_cloud_mode", return_value=True), \
+             patch("claude_memory_kit.cli.os.cpu_count", return_value=8), \
+             patch.dict("os.environ", {}, clear=False):
+            runner.invoke(main, ["serve", "--workers", "3"])
+            runner.invoke(main, ["serve", "--workers", "0"])
+            assert os.environ["CMK_RESULT_CACHE"] == "false"
+        assert mock_uvicorn.call_args_list[0].kwargs["workers"] == 3
+        assert mock_uvicorn.call_args_list[1].kwargs["workers"] == 4
+
+    def test_serve_rejects_negative_workers(self):
+        runner = CliRunner()
+        with patch("uvicorn.run") as mock_uvicorn:
+            result = runner.invoke(main, ["serve", "--workers", "-1"])
+        assert result.exit_code != 0
+        mock_uvicorn.assert_not_called()
+
+    def test_serve_workers_ignored_in_local_mode(self):
+        runner = CliRunner()
+        with patch("uvicorn.run") as mock_uvicorn, \
+             patch("claude_memory_kit.cli.is_cloud_mode", return_value=False):
+            result = runner.invoke(main, ["serve", "--workers", "4"])
+        assert result.exit_code == 0
+        assert "workers" not in mock_uvicorn.call_args.kwargs
+
 
 # ---------------------------------------------------------------------------
 # mcp
@@ -457,7 +501,7 @@ class TestClaim:
     def test_claim_no_local_data(self):
         runner = CliRunner()
         store = _make_mock_store()
-        store.count_user_data.return_value = {"total": 0}
+        store.count_user_data.return_value = StoreCounts()
         with patch(USER_PATCH, return_value="user_abc"), \
              patch(STORE_PATCH, return_value=store):
             result = runner.invoke(main, ["claim"])
@@ -467,40 +511,25 @@ class TestClaim:
     def test_claim_confirmed(self):
         runner = CliRunner()
         store = _make_mock_store()
-        store.count_user_data.return_value = {
-            "total": 5,
-            "memories": 3,
-            "journal": 1,
-            "edges": 1,
-            "archive": 0,
-        }
-        store.migrate_user_data.return_value = {
-            "memories": 3,
-            "journal": 1,
-            "edges": 1,
-            "archive": 0,
-            "vectors": 3,
-        }
+        store.count_user_data.return_value = StoreCounts(memories=3, journal=1)
+        store.migrate_user_data.return_value = StoreCounts(memories=3, journal=1)
         with patch(USER_PATCH, return_value="user_abc"), \
              patch(STORE_PATCH, return_value=store):
             result = runner.invoke(main, ["claim"], input="y\n")
         assert result.exit_code == 0
-        assert "Found 5 local items" in result.output
+        assert "Found 4 local items" in result.output
+        assert "journal: 1" in result.output
         assert "memories: 3" in result.output
         assert "Migrated" in result.output
         assert "Done" in result.output
-        store.migrate_user_data.assert_called_once_with("local", "user_abc")
+        store.migrate_user_data.assert_called_once_with(
+            "local", "user_abc", counts=store.count_user_data.return_value,
+        )
 
     def test_claim_cancelled(self):
         runner = CliRunner()
         store = _make_mock_store()
-        store.count_user_data.return_value = {
-            "total": 5,
-            "memories": 3,
-            "journal": 1,
-            "edges": 1,
-            "archive": 0,
-        }
+        store.count_user_data.return_value = StoreCounts(memories=3, journal=1)
         with patch(USER_PATCH, return_value="user_abc"), \
              patch(STORE_PATCH, return_value=store):
             result = runner.invoke(main, ["claim"], input="n\n")
@@ -512,32 +541,15 @@ class TestClaim:
         """Tables with count 0 should not be printed in the summary."""
         runner = CliRunner()
         store = _make_mock_store()
-        store.count_user_data.return_value = {
-            "total": 2,
-            "memories": 2,
-            "journal": 0,
-            "edges": 0,
-            "archive": 0,
-        }
-        store.migrate_user_data.return_value = {
-            "memories": 2,
-            "journal": 0,
-            "edges": 0,
-            "archive": 0,
-            "vectors": 2,
-        }
+        store.count_user_data.return_value = StoreCounts(memories=2)
+        store.migrate_user_data.return_value = StoreCounts(memories=2)
         with patch(USER_PATCH, return_value="user_abc"), \
              patch(STORE_PATCH, return_value=store):
             result = runner.invoke(main, ["claim"], input="y\n")
         assert result.exit_code == 0
-        # journal/edges/archive with 0 should not appear in the initial listing
-        lines = result.output.split("\n")
-        listing_lines = [l for l in lines if l.strip().startswith("journal:") or l.strip().startswith("edges:") or l.strip().startswith("archive:")]
-        # In the initial section they shouldn't appear (count == 0)
-        # but in the migrated section, 0 counts are also skipped
-        for l in listing_lines:
-            # If any of these lines exist, they should not show ": 0"
-            pass  # The code uses `if count > 0` so 0 lines won't appear
+        assert result.output.count("memories: 2") == 2
+        for name in ("journal", "identity", "rules"):
+            assert f"{name}:" not in result.output
 
 
 # ---------------------------------------------------------------------------
@@ -555,7 +567,7 @@ class TestExport:
     def test_export_no_cloud_data(self):
         runner = CliRunner()
         store = _make_mock_store()
-        store.count_user_data.return_value = {"total": 0}
+        store.count_user_data.return_value = StoreCounts()
         with patch(USER_PATCH, return_value="user_abc"), \
              patch(STORE_PATCH, return_value=store):
             result = runner.invoke(main, ["export"])
@@ -565,39 +577,23 @@ class TestExport:
     def test_export_confirmed(self):
         runner = CliRunner()
         store = _make_mock_store()
-        store.count_user_data.return_value = {
-            "total": 4,
-            "memories": 2,
-            "journal": 1,
-            "edges": 1,
-            "archive": 0,
-        }
-        store.migrate_user_data.return_value = {
-            "memories": 2,
-            "journal": 1,
-            "edges": 1,
-            "archive": 0,
-            "vectors": 2,
-        }
+        store.count_user_data.return_value = StoreCounts(memories=2, journal=1)
+        store.migrate_user_data.return_value = StoreCounts(memories=2, journal=1)
         with patch(USER_PATCH, return_value="user_abc"), \
              patch(STORE_PATCH, return_value=store):
             result = runner.invoke(main, ["export"], input="y\n")
         assert result.exit_code == 0
-        assert "Found 4 cloud items" in result.output
+        assert "Found 3 cloud items" in result.output
         assert "Exported" in result.output
         assert "Done" in result.output
-        store.migrate_user_data.assert_called_once_with("user_abc", "local")
+        store.migrate_user_data.assert_called_once_with(
+            "user_abc", "local", counts=store.count_user_data.return_value,
+        )
 
     def test_export_cancelled(self):
         runner = CliRunner()
         store = _make_mock_store()
-        store.count_user_data.return_value = {
-            "total": 3,
-            "memories": 3,
-            "journal": 0,
-            "edges": 0,
-            "archive": 0,
-        }
+        store.count_user_data.return_value = StoreCounts(memories=3)
         with patch(USER_PATCH, return_value="user_abc"), \
              patch(STORE_PATCH, return_value=store):
             result = runner.invoke(main, ["export"], input="n\n")
@@ -662,6 +658,44 @@ class TestGetStore:
         mock_instance.qdrant.ensure_collection.assert_called_once()
         assert result is mock_instance
 
+    def test_get_store_auth_only_skips_qdrant(self):
+        from claude_memory_kit.cli import _get_store
+        with patch("claude_memory_kit.cli.get_store_path", return_value="/tmp/test-cmk"), \
+             patch("claude_memory_kit.cli.Store") as MockStore:
+            mock_instance = MagicMock()
+            MockStore.return_value = mock_instance
+            _get_store(memories=False)
+        mock_instance.auth_db.migrate.assert_called_once()
+        mock_instance.qdrant.ensure_collection.assert_not_called()
+
+
+    def test_cli_import_does_not_load_qdrant(self):
+        import subprocess
+        import sys
+        code = (
+            "import sys, claude_memory_kit.cli; "
+            "print('qdrant_client' in sys.modules)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True,
+            check=True,
+        )
+        assert out.stdout.strip() == "False"
+
+    @pytest.mark.parametrize("module,heavy", [
+        ("claude_memory_kit.tools", "numpy"),
+        ("claude_memory_kit.flow.hook", "pydantic"),
+    ])
+    def test_import_defers_heavy_dependency(self, module, heavy):
+        import subprocess
+        import sys
+        code = f"import sys, {module}; print({heavy!r} in sys.modules)"
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True,
+            check=True,
+        )
+        assert out.stdout.strip() == "False"
+
 
 # ---------------------------------------------------------------------------
 # edge cases: user_id propagation
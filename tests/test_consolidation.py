@@ -12,6 +12,8 @@ from claude_memory_kit.consolidation.decay import (
     compute_decay_score,
     _recency,
     _frequency,
+    compute_decay_scores_bulk,
+    fading_mask,
     is_fading,
 )
 from claude_memory_kit.consolidation.digest import consolidate_journals
@@ -144,6 +146,40 @@ class TestIsFading:
         assert is_fading(aged) is False
 
 
+class TestBulkDecay:
+    """compute_decay_scores_bulk / fading_mask agree with the scalar versions."""
+
+    def _mixed(self, make_memory):
+        now = datetime.now(timezone.utc)
+        mems = []
+        for i, (gate, days, access) in enumerate([
+            (Gate.behavioral, 0, 1),
+            (Gate.behavioral, 200, 1),
+            (Gate.promissory, 9999, 0),
+            (Gate.relational, 400, 3),
+            (Gate.epistemic, 60, 100),
+        ]):
+            mem = make_memory(id=f"m{i}", gate=gate, access_count=access)
+            mems.append(mem.model_copy(
+                update={"last_accessed": now - timedelta(days=days)}
+            ))
+        return mems
+
+    def test_scores_match_scalar(self, make_memory):
+        mems = self._mixed(make_memory)
+        bulk = compute_decay_scores_bulk(mems)
+        for mem, score in zip(mems, bulk):
+            assert score == pytest.approx(compute_decay_score(mem), rel=1e-6)
+
+    def test_mask_matches_is_fading(self, make_memory):
+        mems = self._mixed(make_memory)
+        assert list(fading_mask(mems)) == [is_fading(m) for m in mems]
+
+    def test_empty(self):
+        assert len(compute_decay_scores_bulk([])) == 0
+        assert len(fading_mask([])) == 0
+
+
 # ---------------------------------------------------------------------------
 # digest.py tests (uses mock db since consolidate_journals is duck-typed)
 # ---------------------------------------------------------------------------
@@ -154,14 +190,16 @@ def _make_mock_db(stale_dates=None, entries_by_date=None):
     db = MagicMock()
     db.stale_journal_dates.return_value = stale_dates or []
 
-    def _journal_by_date(date, user_id="local"):
-        if entries_by_date:
-            return entries_by_date.get(date, [])
-        return []
+    def _concat_journal_for_dates(dates, user_id="local"):
+        entries_by = entries_by_date or {}
+        return {
+            d: "\n".join(f"[{e['gate']}] {e['content']}" for e in entries_by[d])
+            for d in dates if entries_by.get(d)
+        }
 
-    db.journal_by_date.side_effect = _journal_by_date
-    db.insert_journal_raw = MagicMock()
-    db.archive_journal_date = MagicMock()
+    db.concat_journal_for_dates.side_effect = _concat_journal_for_dates
+    db.insert_journal_raw_many = MagicMock()
+    db.archive_journal_dates = MagicMock()
     return db
 
 
@@ -216,9 +254,10 @@ class TestConsolidateJournals:
         ):
             await consolidate_journals(db, api_key="fake-key", user_id="local")
 
-        db.insert_journal_raw.assert_called_once()
-        call_kwargs = db.insert_journal_raw.call_args
-        assert "Digest text here." in call_kwargs.kwargs.get("content", call_kwargs.args[2] if len(call_kwargs.args) > 2 else "")
+        db.insert_journal_raw_many.assert_called_once()
+        [(_, gate, content)] = db.insert_journal_raw_many.call_args.args[0]
+        assert gate == Gate.digest
+        assert "Digest text here." in content
 
     @pytest.mark.asyncio
     async def test_original_entries_archived(self):
@@ -235,7 +274,7 @@ class TestConsolidateJournals:
         ):
             await consolidate_journals(db, api_key="fake-key", user_id="local")
 
-        db.archive_journal_date.assert_called_once_with(old_date, user_id="local")
+        db.archive_journal_dates.assert_called_once_with([old_date], user_id="local")
 
     @pytest.mark.asyncio
     async def test_multiple_weeks_consolidated_separately(self):
@@ -260,7 +299,66 @@ class TestConsolidateJournals:
 
         assert result is not None
         assert "Consolidated" in result
-        assert db.insert_journal_raw.call_count >= 1
+        # Both digests written in one call
+        db.insert_journal_raw_many.assert_called_once()
+        assert len(db.insert_journal_raw_many.call_args.args[0]) == 2
+        # Both dates fetched in one call and archived in one call
+        db.concat_journal_for_dates.assert_called_once()
+        assert set(db.concat_journal_for_dates.call_args.args[0]) == {date_week1, date_week2}
+        db.archive_journal_dates.assert_called_once()
+        assert set(db.archive_journal_dates.call_args.args[0]) == {date_week1, date_week2}
+
+    @pytest.mark.asyncio
+    async def test_weeks_synthesized_concurrently_with_cap(self):
+        import asyncio
+        from claude_memory_kit.consolidation import digest as digest_mod
+
+        now = datetime.now(timezone.utc)
+        dates = [(now - timedelta(days=20 + 7 * i)).strftime("%Y-%m-%d") for i in range(8)]
+        entries = {d: [{"gate": "epistemic", "content": f"note {d}"}] for d in dates}
+        db = _make_mock_db(stale_dates=dates, entries_by_date=entries)
+
+        in_flight = 0
+        peak = 0
+
+        async def _slow(entries_text, api_key):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "digest"
+
+        with patch.object(digest_mod, "consolidate_entries", side_effect=_slow):
+            result = await consolidate_journals(db, api_key="k", user_id="local")
+
+        assert "Consolidated 8 weeks" in result
+        assert 1 < peak <= digest_mod.MAX_CONCURRENT_DIGESTS
+
+    @pytest.mark.asyncio
+    async def test_failed_week_raises_after_saving_others(self):
+        from claude_memory_kit.consolidation import digest as digest_mod
+
+        now = datetime.now(timezone.utc)
+        good = (now - timedelta(days=20)).strftime("%Y-%m-%d")
+        bad = (now - timedelta(days=40)).strftime("%Y-%m-%d")
+        entries = {
+            good: [{"gate": "epistemic", "content": "good week"}],
+            bad: [{"gate": "epistemic", "content": "bad week"}],
+        }
+        db = _make_mock_db(stale_dates=[good, bad], entries_by_date=entries)
+
+        async def _maybe_fail(entries_text, api_key):
+            if "bad week" in entries_text:
+                raise RuntimeError("rate limited")
+            return "digest"
+
+        with patch.object(digest_mod, "consolidate_entries", side_effect=_maybe_fail):
+            with pytest.raises(RuntimeError, match="rate limited"):
+                await consolidate_journals(db, api_key="k", user_id="local")
+
+        assert len(db.insert_journal_raw_many.call_args.args[0]) == 1
+        db.archive_journal_dates.assert_called_once_with([good], user_id="local")
 
     @pytest.mark.asyncio
     async def test_user_isolation(self):
@@ -279,7 +377,7 @@ class TestConsolidateJournals:
 
         assert result is not None
         db.stale_journal_dates.assert_called_with(max_age_days=14, user_id="user_a")
-        db.archive_journal_date.assert_called_with(old_date, user_id="user_a")
+        db.archive_journal_dates.assert_called_with([old_date], user_id="user_a")
 
     @pytest.mark.asyncio
     async def test_digest_date_key_is_iso_week(self):
@@ -296,17 +394,17 @@ class TestConsolidateJournals:
         ):
             await consolidate_journals(db, api_key="fake-key", user_id="local")
 
-        call_kwargs = db.insert_journal_raw.call_args
-        # The date arg should be in ISO week format
-        date_arg = call_kwargs.kwargs.get("date", call_kwargs.args[0] if call_kwargs.args else "")
+        # The date of each digest row should be in ISO week format
+        [(date_arg, _, _)] = db.insert_journal_raw_many.call_args.args[0]
         assert "-W" in date_arg
 
     @pytest.mark.asyncio
     async def test_empty_combined_entries_skipped(self):
-        """If stale dates exist but journal_by_date returns empty, no digest."""
+        """If stale dates exist but concat_journal_for_dates returns empty, no digest."""
         old_date = (datetime.now(timezone.utc) - timedelta(days=20)).strftime("%Y-%m-%d")
         db = _make_mock_db(stale_dates=[old_date], entries_by_date={old_date: []})
 
         result = await consolidate_journals(db, api_key="fake-key", user_id="local")
         assert result is None
-        db.insert_journal_raw.assert_not_called()
+        db.insert_journal_raw_many.assert_not_called()
+        db.archive_journal_dates.assert_not_called()
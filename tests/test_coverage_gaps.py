@@ -924,9 +924,11 @@ class TestRecallCoverageGaps:
         store = _make_store(qdrant_db)
         # Mock qdrant to make hybrid search return nothing, text search raise
         store.qdrant = MagicMock(wraps=qdrant_db)
-        store.qdrant.search.return_value = []
+        store.qdrant.asearch = AsyncMock(return_value=[])
         store.qdrant._disabled = False
-        store.qdrant.search_text.side_effect = RuntimeError("text index broken")
+        store.qdrant.asearch_text = AsyncMock(
+            side_effect=RuntimeError("text index broken")
+        )
         store.qdrant.find_related.return_value = []
         result = await do_recall(store, "test query", user_id="local")
         assert "No memories found" in result
@@ -951,10 +953,10 @@ class TestDigestCoverageGaps:
 
     @pytest.mark.asyncio
     async def test_empty_combined_entries_skips_week(self, db):
-        """combined list is empty for a week (journal_by_date returns empty)."""
+        """combined list is empty for a week (concat_journal_for_dates returns empty)."""
         from claude_memory_kit.consolidation.digest import consolidate_journals
         db.stale_journal_dates = MagicMock(return_value=["2025-01-01"])
-        db.journal_by_date = MagicMock(return_value=[])
+        db.concat_journal_for_dates = MagicMock(return_value={})
         result = await consolidate_journals(db, api_key="test-key", user_id="local")
         assert result is None
 
@@ -963,7 +965,7 @@ class TestDigestCoverageGaps:
         """digests_written is empty after processing all weeks."""
         from claude_memory_kit.consolidation.digest import consolidate_journals
         db.stale_journal_dates = MagicMock(return_value=["2025-01-06", "2025-01-07"])
-        db.journal_by_date = MagicMock(return_value=[])
+        db.concat_journal_for_dates = MagicMock(return_value={})
         result = await consolidate_journals(db, api_key="test-key", user_id="local")
         assert result is None
 
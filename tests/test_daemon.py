@@ -0,0 +1,166 @@
+"""Tests for the local CLI daemon (daemon.py) and its CLI wiring."""
+
+import asyncio
+import socket
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from claude_memory_kit import daemon
+from claude_memory_kit.cli import main
+
+
+@pytest.fixture
+def sock_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEMORY_STORE_PATH", str(tmp_path))
+    return tmp_path
+
+
+# ---------------------------------------------------------------------------
+# run_command
+# ---------------------------------------------------------------------------
+
+class TestRunCommand:
+    @pytest.mark.asyncio
+    async def test_remember_dispatch(self):
+        store = MagicMock()
+        with patch("claude_memory_kit.tools.remember.do_remember",
+                   new_callable=AsyncMock, return_value="ok") as m:
+            out = await daemon.run_command(
+                store, "remember",
+                {"content": "likes tea", "gate": "behavioral"}, "u1",
+            )
+        assert out == "ok"
+        m.assert_awaited_once_with(
+            store, "likes tea", "behavioral", None, None, user_id="u1",
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cmd,target,args", [
+        ("recall", "recall.do_recall", {"query": "q"}),
+        ("reflect", "reflect.do_reflect", {}),
+        ("identity", "identity.do_identity", {}),
+        ("forget", "forget.do_forget", {"memory_id": "m", "reason": "r"}),
+        ("extract", "auto_extract.do_auto_extract", {"transcript": "t"}),
+        ("prime", "prime.do_prime", {"message": "hi"}),
+        ("scan", "scan.do_scan", {}),
+        ("classify", "classify.classify_memories", {"force": True}),
+    ])
+    async def test_each_command_dispatches(self, cmd, target, args):
+        with patch(f"claude_memory_kit.tools.{target}",
+                   new_callable=AsyncMock, return_value=cmd) as m:
+            out = await daemon.run_command(MagicMock(), cmd, args, "local")
+        assert out == cmd
+        m.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unknown_command_raises(self):
+        with pytest.raises(daemon.DaemonError):
+            await daemon.run_command(MagicMock(), "nope", {}, "local")
+
+
+# ---------------------------------------------------------------------------
+# client / server
+# ---------------------------------------------------------------------------
+
+class TestClientServer:
+    def test_request_without_socket_returns_none(self, sock_dir):
+        assert daemon.request("recall", {"query": "x"}, "local") is None
+        assert daemon.is_running() is False
+
+    def test_request_with_stale_socket_returns_none(self, sock_dir):
+        (sock_dir / daemon.SOCKET_NAME).write_text("")
+        assert daemon.request("recall", {"query": "x"}, "local") is None
+        assert daemon.is_running() is False
+
+    @pytest.mark.parametrize("reply", [b"", b'{"result": "cut'])
+    def test_lost_reply_raises_instead_of_none(self, sock_dir, reply):
+        path = str(sock_dir / daemon.SOCKET_NAME)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+
+        def _die_after_request():
+            conn, _ = listener.accept()
+            conn.recv(65536)
+            conn.sendall(reply)
+            conn.close()
+
+        t = threading.Thread(target=_die_after_request)
+        t.start()
+        try:
+            with pytest.raises(daemon.DaemonError):
+                daemon.request("remember", {"content": "x", "gate": "epistemic"}, "u1")
+        finally:
+            t.join()
+            listener.close()
+
+    @pytest.mark.asyncio
+    async def test_roundtrip(self, sock_dir):
+        store = MagicMock()
+        server = asyncio.create_task(daemon.serve(store, idle_timeout=0.5))
+        for _ in range(50):
+            if daemon.is_running():
+                break
+            await asyncio.sleep(0.02)
+
+        with patch("claude_memory_kit.tools.recall.do_recall",
+                   new_callable=AsyncMock, return_value="Found 1 memories") as m:
+            out = await asyncio.to_thread(
+                daemon.request, "recall", {"query": "tea"}, "u1",
+            )
+        assert out == "Found 1 memories"
+        m.assert_awaited_once_with(store, "tea", user_id="u1")
+
+        with pytest.raises(daemon.DaemonError):
+            await asyncio.to_thread(daemon.request, "bogus", {}, "u1")
+
+        await server
+        assert not (sock_dir / daemon.SOCKET_NAME).exists()
+
+
+# ---------------------------------------------------------------------------
+# CLI wiring
+# ---------------------------------------------------------------------------
+
+class TestCliDaemonMode:
+    def test_uses_daemon_when_enabled(self, monkeypatch):
+        monkeypatch.setenv("CMK_DAEMON", "1")
+        runner = CliRunner()
+        with patch("claude_memory_kit.daemon.spawn", return_value=True), \
+             patch("claude_memory_kit.daemon.request",
+                   return_value="from daemon") as req, \
+             patch("claude_memory_kit.cli._get_store") as get_store, \
+             patch("claude_memory_kit.cli.get_user_id", return_value="u1"):
+            result = runner.invoke(main, ["recall", "tea"])
+        assert result.exit_code == 0
+        assert "from daemon" in result.output
+        req.assert_called_once_with("recall", {"query": "tea"}, "u1")
+        get_store.assert_not_called()
+
+    def test_falls_back_inline_when_daemon_unavailable(self, monkeypatch):
+        monkeypatch.setenv("CMK_DAEMON", "1")
+        runner = CliRunner()
+        with patch("claude_memory_kit.daemon.spawn", return_value=False), \
+             patch("claude_memory_kit.cli._get_store", return_value=MagicMock()), \
+             patch("claude_memory_kit.cli.get_user_id", return_value="local"), \
+             patch("claude_memory_kit.tools.recall.do_recall",
+                   new_callable=AsyncMock, return_value="inline result"):
+            result = runner.invoke(main, ["recall", "tea"])
+        assert result.exit_code == 0
+        assert "inline result" in result.output
+
+    def test_daemon_error_is_not_rerun_inline(self, monkeypatch):
+        monkeypatch.setenv("CMK_DAEMON", "1")
+        runner = CliRunner()
+        with patch("claude_memory_kit.daemon.spawn", return_value=True), \
+             patch("claude_memory_kit.daemon.request",
+                   side_effect=daemon.DaemonError("daemon closed the connection")), \
+             patch("claude_memory_kit.cli._get_store") as get_store, \
+             patch("claude_memory_kit.cli.get_user_id", return_value="u1"):
+            result = runner.invoke(main, ["remember", "likes tea", "--gate", "behavioral"])
+        assert result.exit_code == 1
+        assert "daemon closed the connection" in result.output
+        get_store.assert_not_called()
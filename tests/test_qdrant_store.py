@@ -2,12 +2,13 @@
 
 import time
 from datetime import datetime, timedelta, timezone
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from qdrant_client import QdrantClient
-from qdrant_client.models import FieldCondition, MatchValue
+from qdrant_client.models import FieldCondition, MatchValue, SparseVector
 
+from claude_memory_kit.cache import TTLCache
 from claude_memory_kit.store.qdrant_store import QdrantStore, _stable_id, _memory_from_payload
 from claude_memory_kit.types import DecayClass, Gate, IdentityCard, JournalEntry, Memory
 
@@ -19,11 +20,16 @@ def store():
         mock_cfg.return_value = {"mode": "local"}
         qs = object.__new__(QdrantStore)
         qs._disabled = False
+        qs._ensured = False
         qs._cloud = False
         qs._jina_key = ""
         qs._fastembed_dense = None
         qs._fastembed_sparse = None
         qs.client = QdrantClient(":memory:")
+        qs.aclient = None
+        qs._text_cache = TTLCache()
+        qs._query_cache = TTLCache()
+        qs._stats_cache = TTLCache()
         qs.ensure_collection()
         yield qs
 
@@ -61,6 +67,11 @@ class TestStableId:
     def test_different_inputs(self):
         assert _stable_id("mem_a") != _stable_id("mem_b")
 
+    def test_ids_never_change(self):
+        # Existing points are addressed by these ids
+        assert _stable_id("mem_123") == 6981239876106639704
+        assert 0 <= _stable_id("identity:local") < 2**63
+
 
 class TestMemoryFromPayload:
     def test_round_trip(self):
@@ -119,6 +130,18 @@ class TestInsertAndGetMemory:
         store.insert_memory(mem, user_id="user_a")
         assert store.get_memory(mem.id, user_id="user_b") is None
 
+    def test_get_memories_in_one_retrieve(self, store: QdrantStore):
+        store.insert_memory(_make_memory("mem_a"), user_id="user1")
+        store.insert_memory(_make_memory("mem_b"), user_id="user1")
+        store.insert_memory(_make_memory("mem_c"), user_id="user2")
+        with patch.object(store.client, "retrieve", wraps=store.client.retrieve) as retrieve:
+            found = store.get_memories(["mem_a", "mem_b", "mem_c", "missing"], user_id="user1")
+        assert set(found) == {"mem_a", "mem_b"}
+        assert retrieve.call_count == 1
+
+    def test_get_memories_empty(self, store: QdrantStore):
+        assert store.get_memories([], user_id="user1") == {}
+
 
 class TestDeleteMemory:
     def test_delete_returns_memory(self, store: QdrantStore):
@@ -134,6 +157,59 @@ class TestDeleteMemory:
     def test_delete_nonexistent(self, store: QdrantStore):
         assert store.delete_memory("nope", user_id="u1") is None
 
+    def test_delete_by_point_id(self, store: QdrantStore):
+        mem = _make_memory()
+        store.insert_memory(mem, user_id="u1")
+
+        with patch.object(store.client, "scroll") as scroll:
+            assert store.delete_memory(mem.id, user_id="u1").id == mem.id
+        scroll.assert_not_called()
+
+    def test_delete_other_users_memory(self, store: QdrantStore):
+        mem = _make_memory()
+        store.insert_memory(mem, user_id="u1")
+
+        assert store.delete_memory(mem.id, user_id="u2") is None
+        assert store.get_memory(mem.id, user_id="u1") is not None
+
+
+class TestDeleteMemories:
+    def test_deletes_only_owned_ids(self, store: QdrantStore):
+        for mem_id, user in (("mem_a", "u1"), ("mem_b", "u1"), ("mem_c", "u1"), ("mem_d", "u2")):
+            store.insert_memory(_make_memory(mem_id), user_id=user)
+        with patch.object(store.client, "delete", wraps=store.client.delete) as delete:
+            store.delete_memories(["mem_a", "mem_b", "mem_d"], user_id="u1")
+        assert delete.call_count == 1
+        assert [m.id for m in store.list_memories(user_id="u1")] == ["mem_c"]
+        assert store.get_memory("mem_d", user_id="u2") is not None
+
+    def test_empty_is_noop(self, store: QdrantStore):
+        with patch.object(store.client, "delete") as delete:
+            store.delete_memories([], user_id="u1")
+        delete.assert_not_called()
+
+
+class TestSearchCacheInvalidation:
+    @pytest.mark.parametrize("write", [
+        lambda s: s.update_memory("m1", user_id="u1", content="[REDACTED]"),
+        lambda s: s.update_sensitivity("m1", "sensitive", "reclassified", user_id="u1"),
+        lambda s: s.set_pinned("m1", True, user_id="u1"),
+        lambda s: s.delete_memories(["m1"], user_id="u1"),
+        lambda s: s.add_edge("m1", "m2", "RELATED_TO", user_id="u1"),
+    ])
+    def test_memory_writes_drop_cached_results(self, store: QdrantStore, write):
+        from claude_memory_kit.cache import recall_cache, search_cache
+        store.insert_memory(_make_memory("m1"), user_id="u1")
+        search_cache.set(("u1", "q"), "old")
+        search_cache.set(("u2", "q"), "other user")
+        recall_cache.set(("u1", None, "q"), "old")
+        recall_cache.set(("u2", "team1", "q"), "team view")
+        write(store)
+        assert search_cache.get(("u1", "q")) is None
+        assert recall_cache.get(("u1", None, "q")) is None
+        assert recall_cache.get(("u2", "team1", "q")) is None
+        assert search_cache.get(("u2", "q")) == "other user"
+
 
 class TestListMemories:
     def test_list_basic(self, store: QdrantStore):
@@ -170,6 +246,21 @@ class TestListMemories:
         page2 = store.list_memories(limit=2, offset=2, user_id="u1")
         assert len(page2) == 2
 
+    def test_later_pages_skip_payloads(self, store: QdrantStore):
+        now = datetime.now(timezone.utc)
+        for i in range(5):
+            mem = _make_memory(mem_id=f"mem_{i}")
+            mem.created = now - timedelta(minutes=i)
+            store.insert_memory(mem, user_id="u1")
+
+        with patch.object(store.client, "scroll",
+                          wraps=store.client.scroll) as scroll:
+            page = store.list_memories(limit=2, offset=2, user_id="u1")
+        assert [m.id for m in page] == ["mem_2", "mem_3"]
+        assert scroll.call_args.kwargs["with_payload"] is False
+        assert [m.id for m in store.list_memories(limit=2, offset=4, user_id="u1")] == ["mem_4"]
+        assert store.list_memories(limit=2, offset=9, user_id="u1") == []
+
 
 class TestTouchMemory:
     def test_increments_access_count(self, store: QdrantStore):
@@ -180,9 +271,33 @@ class TestTouchMemory:
         result = store.get_memory(mem.id, user_id="u1")
         assert result.access_count == 2
 
+    def test_fetches_only_access_count(self, store: QdrantStore):
+        store.insert_memory(_make_memory(), user_id="u1")
+        with patch.object(store.client, "scroll", wraps=store.client.scroll) as scroll:
+            store.touch_memory("mem_test_001", user_id="u1")
+        assert scroll.call_args.kwargs["with_payload"] == ["access_count"]
+
     def test_touch_nonexistent(self, store: QdrantStore):
         store.touch_memory("nope", user_id="u1")  # should not raise
 
+    def test_touch_memories_in_one_update(self, store: QdrantStore):
+        mems = [_make_memory("mem_a"), _make_memory("mem_b")]
+        for mem in mems:
+            store.insert_memory(mem, user_id="u1")
+        with patch.object(store.client, "batch_update_points",
+                          wraps=store.client.batch_update_points) as batch:
+            store.touch_memories(mems)
+        assert batch.call_count == 1
+        found = store.get_memories(["mem_a", "mem_b"], user_id="u1")
+        assert [m.access_count for m in found.values()] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_atouch_memories_local(self, store: QdrantStore):
+        mem = _make_memory()
+        store.insert_memory(mem, user_id="u1")
+        await store.atouch_memories([mem])
+        assert store.get_memory(mem.id, user_id="u1").access_count == 2
+
 
 class TestUpdateMemory:
     def test_update_content(self, store: QdrantStore):
@@ -227,15 +342,78 @@ class TestCountMemories:
         assert store.count_memories(user_id="u1") == 1
 
 
+class TestCountByType:
+    def test_counts_each_type_for_user(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="u1")
+        store.insert_memory(_make_memory(mem_id="m2"), user_id="u1")
+        store.insert_memory(_make_memory(mem_id="m3"), user_id="u2")
+        store.insert_journal_raw("2026-01-15", Gate.digest, "digest", user_id="u1")
+        assert store.count_by_type(user_id="u1") == {"memory": 2, "journal": 1}
+
+
+class TestIterMemories:
+    def test_pages_through_all_memories(self, store: QdrantStore):
+        for i in range(7):
+            store.insert_memory(_make_memory(mem_id=f"m{i}"), user_id="u1")
+        store.insert_memory(_make_memory(mem_id="other"), user_id="u2")
+
+        with patch.object(store.client, "scroll",
+                          wraps=store.client.scroll) as scroll:
+            ids = {m.id for m in store.iter_memories(user_id="u1", page_size=3)}
+        assert ids == {f"m{i}" for i in range(7)}
+        assert scroll.call_count == 3
+        assert all(c.kwargs["limit"] == 3 for c in scroll.call_args_list)
+
+    def test_limit_stops_early(self, store: QdrantStore):
+        for i in range(7):
+            store.insert_memory(_make_memory(mem_id=f"m{i}"), user_id="u1")
+        mems = list(store.iter_memories(user_id="u1", limit=4, page_size=3))
+        assert len(mems) == 4
+
+
+class TestPinned:
+    def test_set_pinned_single_request(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="u1")
+        with patch.object(store.client, "scroll") as scroll:
+            store.set_pinned("m1", True, user_id="u1")
+        scroll.assert_not_called()
+        assert store.get_memory("m1", user_id="u1").pinned is True
+
+    def test_set_pinned_other_owner_untouched(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="u1")
+        store.set_pinned("m1", True, user_id="u2")
+        store.set_pinned("missing", True, user_id="u1")
+        assert store.get_memory("m1", user_id="u1").pinned is False
+
+
 class TestCountByGate:
     def test_count_by_gate(self, store: QdrantStore):
         store.insert_memory(_make_memory(mem_id="m1", gate=Gate.epistemic), user_id="u1")
         store.insert_memory(_make_memory(mem_id="m2", gate=Gate.epistemic), user_id="u1")
         store.insert_memory(_make_memory(mem_id="m3", gate=Gate.relational), user_id="u1")
 
-        counts = store.count_by_gate(user_id="u1")
-        assert counts.get("epistemic") == 2
-        assert counts.get("relational") == 1
+        with patch.object(store.client, "count") as count:
+            counts = store.count_by_gate(user_id="u1")
+        count.assert_not_called()  # one facet, not a count per gate
+        assert counts == {"epistemic": 2, "relational": 1}
+
+    def test_counts_cached_until_memory_write(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", gate=Gate.epistemic), user_id="u1")
+        assert store.count_by_gate(user_id="u1") == {"epistemic": 1}
+        assert store.count_memories(user_id="u1") == 1
+
+        with patch.object(store.client, "facet") as facet, \
+             patch.object(store.client, "count") as count:
+            assert store.count_by_gate(user_id="u1") == {"epistemic": 1}
+            assert store.count_memories(user_id="u1") == 1
+        facet.assert_not_called()
+        count.assert_not_called()
+
+        store.insert_memory(_make_memory(mem_id="m2", gate=Gate.epistemic), user_id="u1")
+        assert store.count_by_gate(user_id="u1") == {"epistemic": 2}
+        assert store.count_memories(user_id="u1") == 2
+        store.delete_memory("m1", user_id="u1")
+        assert store.count_by_gate(user_id="u1") == {"epistemic": 1}
 
 
 class TestSensitivity:
@@ -287,6 +465,55 @@ class TestSearchText:
         assert len(results) >= 1
         assert any(mid == "m1" for mid, _ in results)
 
+    def test_repeat_query_served_from_cache(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", content="python async programming"), user_id="u1")
+        first = store.search_text("python", user_id="u1")
+        with patch.object(store.client, "query_points") as qp:
+            assert store.search_text("python", user_id="u1") == first
+        qp.assert_not_called()
+
+    def test_writes_invalidate_cache(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", content="python async programming"), user_id="u1")
+        assert len(store.search_text("python", user_id="u1")) == 1
+        store.insert_memory(_make_memory(mem_id="m2", content="python typing"), user_id="u1")
+        assert len(store.search_text("python", user_id="u1")) == 2
+        store.update_memory("m2", user_id="u1", content="rust typing")
+        assert len(store.search_text("python", user_id="u1")) == 1
+        store.delete_memory("m1", user_id="u1")
+        assert store.search_text("python", user_id="u1") == []
+
+    def test_matches_all_terms_ranked_by_bm25(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", content="python and rust"), user_id="u1")
+        store.insert_memory(_make_memory(mem_id="m2", content="python only"), user_id="u1")
+        with patch.object(store.client, "query_points", wraps=store.client.query_points) as qp:
+            hits = store.search_text("python rust", user_id="u1")
+        assert [mid for mid, _ in hits] == ["m1"]
+        assert hits[0][1] > 0
+        assert qp.call_args.kwargs["using"] == "sparse"
+
+    def test_stopword_only_query_falls_back_to_text_match(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", content="to be or not to be"), user_id="u1")
+        empty = SparseVector(indices=[], values=[])
+        with patch.object(store, "_encode_sparse", return_value=empty), \
+             patch.object(store.client, "query_points", wraps=store.client.query_points) as qp:
+            hits = store.search_text("to be", user_id="u1")
+        assert [mid for mid, _ in hits] == ["m1"]
+        assert "query" not in qp.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_cloud_empty_ranked_result_retries_unranked(self, store: QdrantStore):
+        point = MagicMock(payload={"memory_id": "m1"}, score=1.0)
+        store._cloud = True
+        store.aclient = AsyncMock()
+        store.aclient.query_points.side_effect = [
+            MagicMock(points=[]), MagicMock(points=[point]),
+        ]
+        with patch.object(store, "_encode_sparse", return_value=MagicMock()):
+            assert await store.asearch_text("to be", user_id="u1") == [("m1", 1.0)]
+        first, second = store.aclient.query_points.call_args_list
+        assert first.kwargs["using"] == "sparse"
+        assert "query" not in second.kwargs
+
     def test_search_fts_returns_memories(self, store: QdrantStore):
         store.insert_memory(_make_memory(mem_id="m1", content="vector database qdrant"), user_id="u1")
 
@@ -294,6 +521,319 @@ class TestSearchText:
         assert len(results) >= 1
         assert results[0].id == "m1"
 
+    def test_search_fts_single_query(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", content="qdrant filters"), user_id="u1")
+        store.insert_memory(
+            _make_memory(mem_id="t1", content="team qdrant notes"),
+            user_id="team:t", visibility="team", team_id="t",
+        )
+        with patch.object(store.client, "scroll") as scroll:
+            results = store.search_fts("qdrant", user_id="u1", team_id="t")
+        scroll.assert_not_called()
+        assert {m.id for m in results} == {"m1", "t1"}
+
+
+class TestSearchDense:
+    def test_returns_user_memories_by_cosine(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", content="python async programming"), user_id="u1")
+        store.insert_memory(_make_memory(mem_id="m2", content="python async programming"), user_id="u2")
+
+        hits = store.search_dense("python async programming", user_id="u1")
+        assert [mid for mid, _ in hits] == ["m1"]
+        assert hits[0][1] == pytest.approx(1.0, abs=1e-3)
+
+    def test_quantized_candidates_then_full_precision_rerank(self, store: QdrantStore):
+        store._cloud = True
+        dense = store._embed_local("anything")
+        with patch.object(store, "encode_query", return_value=(dense, None)), \
+             patch.object(store.client, "query_points", wraps=store.client.query_points) as qp:
+            store.search_dense("anything", limit=3, user_id="u1")
+        kwargs = qp.call_args.kwargs
+        assert kwargs["prefetch"].limit == 50
+        assert kwargs["prefetch"].params.quantization.rescore is False
+        assert kwargs["search_params"].quantization.ignore is True
+        assert kwargs["limit"] == 3
+
+
+class TestWarmup:
+    def test_warmup_queries_dense_index(self, store: QdrantStore, monkeypatch):
+        monkeypatch.setattr("claude_memory_kit.store.qdrant_store.WARMUP_MIN_POINTS", 1)
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="u1")
+        with patch.object(store.client, "query_points", wraps=store.client.query_points) as qp:
+            store.warmup()
+        qp.assert_called_once()
+        assert qp.call_args.kwargs["using"] == "dense"
+        assert qp.call_args.kwargs["limit"] == 1
+        assert qp.call_args.kwargs["search_params"].hnsw_ef == 16
+
+    def test_warmup_skips_query_on_small_collection(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="u1")
+        with patch.object(store, "_embed_local", wraps=store._embed_local) as embed, \
+             patch.object(store.client, "query_points") as qp:
+            store.warmup()
+        embed.assert_called_once_with("warmup")
+        qp.assert_not_called()
+
+    def test_warmup_swallows_errors(self, store: QdrantStore):
+        store.client = MagicMock()
+        store.client.query_points.side_effect = RuntimeError("cold")
+        store.warmup()  # should not raise
+
+    def test_warmup_disabled_noop(self):
+        qs = object.__new__(QdrantStore)
+        qs._disabled = True
+        qs.client = None
+        qs.warmup()
+
+
+class TestCollectionConfig:
+    @pytest.mark.parametrize("cloud,m,payload_m", [(False, 16, None), (True, 0, 16)])
+    def test_hnsw_config(self, cloud, m, payload_m):
+        qs = object.__new__(QdrantStore)
+        qs._cloud = cloud
+        qs.client = MagicMock()
+        qs._create_hybrid_collection()
+        hnsw = qs.client.create_collection.call_args.kwargs["hnsw_config"]
+        assert (hnsw.m, hnsw.payload_m) == (m, payload_m)
+        assert hnsw.ef_construct == 64
+        assert hnsw.full_scan_threshold == 1000
+        user_idx = [
+            c.kwargs for c in qs.client.create_payload_index.call_args_list
+            if c.kwargs["field_name"] == "user_id"
+        ]
+        assert len(user_idx) == 1
+        assert bool(user_idx[0]["field_schema"].is_tenant) is cloud
+
+    def test_hnsw_overrides_from_env(self, monkeypatch):
+        monkeypatch.setenv("CMK_HNSW_M", "24")
+        monkeypatch.setenv("CMK_HNSW_EF_CONSTRUCT", "200")
+        qs = object.__new__(QdrantStore)
+        qs._cloud = False
+        qs.client = MagicMock()
+        qs._create_hybrid_collection()
+        hnsw = qs.client.create_collection.call_args.kwargs["hnsw_config"]
+        assert (hnsw.m, hnsw.ef_construct) == (24, 200)
+
+    def test_search_ef_override(self, store: QdrantStore):
+        with patch("claude_memory_kit.store.qdrant_store.get_qdrant_config",
+                   return_value={"mode": "local", "hnsw_ef": 128}), \
+             patch.object(store.client, "query_points", wraps=store.client.query_points) as qp:
+            store.search("anything", user_id="u1")
+        dense, _ = qp.call_args.kwargs["prefetch"]
+        assert dense.params.hnsw_ef == 128
+        assert dense.params.quantization.rescore is True
+
+    def test_search_fetches_only_memory_id(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", content="python async"), user_id="u1")
+        with patch.object(store.client, "query_points", wraps=store.client.query_points) as qp:
+            assert [mid for mid, _ in store.search("python", user_id="u1")] == ["m1"]
+            store.search_text("python", user_id="u1")
+        for call in qp.call_args_list:
+            assert call.kwargs["with_payload"] == ["memory_id"]
+
+    def test_collection_created_with_int8_dense(self):
+        qs = object.__new__(QdrantStore)
+        qs._cloud = False
+        qs._fastembed_dense = None
+        qs.client = MagicMock()
+        qs._create_hybrid_collection()
+        cfg = qs.client.create_collection.call_args.kwargs["quantization_config"]
+        assert cfg.scalar.type == "int8"
+        assert cfg.scalar.quantile == 0.99
+        assert cfg.scalar.always_ram is True
+
+    def test_existing_cloud_collection_upgraded(self):
+        qs = object.__new__(QdrantStore)
+        qs._disabled = False
+        qs._ensured = False
+        qs._cloud = True
+        qs.client = MagicMock()
+        qs.client.get_collections.return_value.collections = [MagicMock()]
+        qs.client.get_collections.return_value.collections[0].name = "cmk_memories"
+        qs.client.get_collection.return_value.config.quantization_config = None
+        qs.ensure_collection()
+        kwargs = qs.client.update_collection.call_args.kwargs
+        assert kwargs["quantization_config"].scalar.type == "int8"
+
+        # A fresh process finds the collection already upgraded
+        qs._ensured = False
+        qs.client.update_collection.reset_mock()
+        qs.client.get_collection.return_value.config.quantization_config = kwargs["quantization_config"]
+        qs.ensure_collection()
+        qs.client.update_collection.assert_not_called()
+
+    def test_ensure_collection_checks_once(self, store: QdrantStore):
+        with patch.object(store.client, "get_collections") as gc:
+            store.ensure_collection()
+        gc.assert_not_called()
+
+    def test_upgrade_failure_keeps_store_enabled(self):
+        qs = object.__new__(QdrantStore)
+        qs._disabled = False
+        qs._cloud = True
+        qs.client = MagicMock()
+        qs.client.get_collections.return_value.collections = []
+        qs.client.get_collection.side_effect = RuntimeError("forbidden")
+        qs._ensure_quantization()
+        assert qs._disabled is False
+
+    def test_dense_prefetch_rescores(self, store: QdrantStore):
+        with patch.object(store.client, "query_points", wraps=store.client.query_points) as qp:
+            store.search("anything", user_id="u1")
+        dense, sparse = qp.call_args.kwargs["prefetch"]
+        assert dense.params.quantization.rescore is True
+        assert dense.params.quantization.oversampling == 2.0
+        assert dense.params.hnsw_ef == 64
+        assert sparse.params is None
+
+
+class TestEncodeQuery:
+    def test_local_query_vectors_memoized(self, store: QdrantStore):
+        with patch.object(store, "_embed_local", wraps=store._embed_local) as dense:
+            store.search("python", user_id="u1")
+            store.search("python", user_id="u2", limit=3)
+            store.search("rust", user_id="u1")
+        assert [c.args[0] for c in dense.call_args_list] == ["python", "rust"]
+
+    def test_cloud_query_documents_memoized(self, store: QdrantStore):
+        store._cloud = True
+        dense, sparse = store.encode_query("python")
+        assert dense.options["task"] == "retrieval.query"
+        assert sparse.text == "python"
+        again = store.encode_query("python")
+        assert again[0] is dense and again[1] is sparse
+        assert store.encode_query("rust")[0].text == "rust"
+
+    def test_cloud_documents_share_built_options(self, store: QdrantStore):
+        store._cloud = True
+        store._jina_key = "jk"
+        vector = store._make_vector("stored text")
+        dense, _ = store.encode_query("python")
+        assert vector["dense"].options == {
+            "jina-api-key": "jk", "dimensions": 1024, "task": "retrieval.passage",
+        }
+        assert dense.options["task"] == "retrieval.query"
+        assert len(store._jina_options) == 2
+
+
+class TestLocalModels:
+    def test_models_cached_under_store_path(self, tmp_path):
+        qs = object.__new__(QdrantStore)
+        qs._fastembed_dense = None
+        qs._fastembed_sparse = None
+        qs._model_cache_dir = str(tmp_path / "models")
+        with patch("fastembed.TextEmbedding") as dense, \
+             patch("fastembed.SparseTextEmbedding") as sparse:
+            assert qs._local_dense_model is qs._local_dense_model
+            qs._local_sparse_model
+        dense.assert_called_once_with(
+            "BAAI/bge-small-en-v1.5", cache_dir=str(tmp_path / "models"),
+            providers=["CPUExecutionProvider"],
+        )
+        assert sparse.call_args.kwargs["cache_dir"] == str(tmp_path / "models")
+
+    def test_concurrent_first_use_loads_once(self):
+        import threading
+        qs = object.__new__(QdrantStore)
+        qs._fastembed_dense = None
+
+        def slow_load(*args, **kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+
+        with patch("fastembed.TextEmbedding", side_effect=slow_load) as dense:
+            threads = [threading.Thread(target=lambda: qs._local_dense_model) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert dense.call_count == 1
+
+
+class TestEmbedPassages:
+    def test_batch_then_inserts_hit_cache(self, store: QdrantStore):
+        with patch.object(store, "_embed_local_many", wraps=store._embed_local_many) as many, \
+             patch.object(store, "_embed_local", wraps=store._embed_local) as one:
+            store.embed_passages(["alpha", "beta", "alpha"])
+            store.insert_memory(_make_memory(mem_id="m1", content="alpha"), user_id="u1")
+            store.insert_memory(_make_memory(mem_id="m2", content="beta"), user_id="u1")
+        many.assert_called_once_with(["alpha", "beta"])
+        one.assert_not_called()
+        assert store.get_memory("m2", user_id="u1").content == "beta"
+
+    def test_journal_and_memory_embed_once(self, store: QdrantStore):
+        with patch.object(store, "_embed_local", wraps=store._embed_local) as one:
+            store.insert_journal_raw("2026-01-15", Gate.epistemic, "same text", user_id="u1")
+            store.insert_memory(_make_memory(content="same text"), user_id="u1")
+        one.assert_called_once_with("same text")
+
+    def test_cloud_noop(self, store: QdrantStore):
+        store._cloud = True
+        with patch.object(store, "_embed_local_many") as many:
+            store.embed_passages(["alpha"])
+        many.assert_not_called()
+
+
+class TestAsyncSearch:
+    @pytest.mark.asyncio
+    async def test_local_mode_uses_sync_client(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1", content="python async programming"), user_id="u1")
+        await store.ainsert_memory(_make_memory(mem_id="m2", content="python typing"), user_id="u1")
+
+        assert await store.asearch("python", user_id="u1") == store.search("python", user_id="u1")
+        assert await store.asearch_dense("python", user_id="u1") == store.search_dense(
+            "python", user_id="u1",
+        )
+        hits = await store.asearch_text("python", user_id="u1")
+        assert {mid for mid, _ in hits} == {"m1", "m2"}
+        await store.aclose()
+
+    @pytest.mark.asyncio
+    async def test_async_client_used_when_present(self, store: QdrantStore):
+        point = MagicMock(payload={"memory_id": "m1"}, score=0.7)
+        store.aclient = AsyncMock()
+        store.aclient.query_points.return_value = MagicMock(points=[point])
+        store.client = MagicMock()
+
+        assert await store.asearch("q", user_id="u1") == [("m1", 0.7)]
+        assert await store.asearch_text("q", user_id="u1") == [("m1", 0.7)]
+        assert await store.asearch_dense("q", user_id="u1") == [("m1", 0.7)]
+        await store.ainsert_memory(_make_memory(mem_id="m1"), user_id="u1")
+        await store.atouch_memories([_make_memory(mem_id="m1")])
+        await store.aclose()
+
+        store.aclient.upsert.assert_awaited_once()
+        store.aclient.batch_update_points.assert_awaited_once()
+        store.aclient.close.assert_awaited_once()
+        store.client.query_points.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_adelete_memory(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="u1")
+        assert await store.adelete_memory("m1", user_id="u2") is None
+        assert (await store.adelete_memory("m1", user_id="u1")).id == "m1"
+        assert store.get_memory("m1", user_id="u1") is None
+
+        payload = {"type": "memory", "user_id": "u1", "memory_id": "m2"}
+        store.aclient = AsyncMock()
+        store.aclient.retrieve.return_value = [MagicMock(payload=payload)]
+        store.client = MagicMock()
+        assert (await store.adelete_memory("m2", user_id="u1")).id == "m2"
+        store.aclient.delete.assert_awaited_once()
+        store.client.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_disabled_returns_empty(self):
+        qs = object.__new__(QdrantStore)
+        qs._disabled = True
+        qs.client = None
+        qs.aclient = None
+        assert await qs.asearch("q") == []
+        assert await qs.asearch_text("q") == []
+        assert await qs.asearch_dense("q") == []
+        await qs.ainsert_memory(_make_memory())
+        assert await qs.adelete_memory("m1") is None
+
 
 class TestFindRecentInContext:
     def test_finds_matching_memory(self, store: QdrantStore):
@@ -307,6 +847,20 @@ class TestFindRecentInContext:
         )
         assert result == "m1"
 
+    def test_epoch_cutoff(self, store: QdrantStore):
+        old = _make_memory(mem_id="m_old", person="Alice")
+        old.created = datetime.now(timezone.utc) - timedelta(days=3)
+        store.insert_memory(old, user_id="u1")
+        store.insert_memory(_make_memory(mem_id="m_new", person="Alice"), user_id="u1")
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=1)).timestamp()
+
+        assert store.find_recent_in_context(
+            "m_x", cutoff, "Alice", None, user_id="u1",
+        ) == "m_new"
+        assert store.find_recent_in_context(
+            "m_new", cutoff, "Alice", None, user_id="u1",
+        ) is None
+
     def test_excludes_self(self, store: QdrantStore):
         mem = _make_memory(mem_id="m1", person="Alice")
         store.insert_memory(mem, user_id="u1")
@@ -324,11 +878,63 @@ class TestMigrateUserId:
         store.insert_memory(_make_memory(mem_id="m1"), user_id="old_user")
         store.insert_memory(_make_memory(mem_id="m2"), user_id="old_user")
 
-        count = store.migrate_user_id("old_user", "new_user")
-        assert count == 2
+        store.insert_journal_raw("2026-01-15", Gate.digest, "digest", user_id="old_user")
+        store.insert_memory(_make_memory(mem_id="m3"), user_id="other")
+
+        with patch.object(store.client, "scroll") as scroll:
+            count = store.migrate_user_id("old_user", "new_user")
+        scroll.assert_not_called()
+        assert count == 3
 
         assert store.get_memory("m1", user_id="new_user") is not None
         assert store.get_memory("m1", user_id="old_user") is None
+        assert store.count_by_type(user_id="new_user") == {"memory": 2, "journal": 1}
+        assert store.get_memory("m3", user_id="other") is not None
+
+    def test_migrate_nothing(self, store: QdrantStore):
+        with patch.object(store.client, "set_payload") as set_payload:
+            assert store.migrate_user_id("nobody", "new_user") == 0
+        set_payload.assert_not_called()
+
+    def test_migrate_with_known_count_skips_recount(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="old_user")
+
+        with patch.object(store.client, "count") as count:
+            assert store.migrate_user_id("old_user", "new_user", count=1) == 1
+        count.assert_not_called()
+        assert store.get_memory("m1", user_id="new_user") is not None
+
+    def test_migrate_keeps_target_identity(self, store: QdrantStore):
+        now = datetime.now(timezone.utc)
+        store.set_identity(
+            IdentityCard(content="anonymous", last_updated=now), user_id="old_user",
+        )
+        store.set_identity(
+            IdentityCard(content="signed in", last_updated=now), user_id="new_user",
+        )
+
+        assert store.migrate_user_id("old_user", "new_user") == 1
+        assert store.get_identity("new_user").content == "signed in"
+        assert store.count_by_type(user_id="new_user") == {"identity": 1}
+        assert store.get_identity("old_user") is None
+
+    def test_migrated_identity_is_rekeyed(self, store: QdrantStore):
+        then = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        store.set_identity(
+            IdentityCard(content="anonymous", last_updated=then), user_id="old_user",
+        )
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="old_user")
+
+        with patch.object(store.client, "set_payload") as set_payload:
+            assert store.migrate_user_id("old_user", "new_user") == 2
+        set_payload.assert_not_called()
+        assert store.instructions_version("new_user")[0] == then.timestamp()
+
+        store.set_identity(
+            IdentityCard(content="updated", last_updated=then), user_id="new_user",
+        )
+        assert store.count_by_type(user_id="new_user") == {"memory": 1, "identity": 1}
+        assert store.get_identity("new_user").content == "updated"
 
 
 class TestDisabledStore:
@@ -370,7 +976,7 @@ class TestDisabledStore:
         now = datetime.now(timezone.utc)
         qs.insert_journal(JournalEntry(timestamp=now, gate=Gate.epistemic, content="x"))
         qs.insert_journal_raw("2026-01-01", Gate.digest, "x")
-        qs.archive_journal_date("2026-01-01")
+        qs.archive_journal_dates(["2026-01-01"])
         qs.set_identity(IdentityCard(content="x", last_updated=now))
         qs.insert_rule("r1", "u1", "all", "no secrets")
         qs.touch_rule("r1")
@@ -412,6 +1018,28 @@ class TestGraphEdges:
         edges = points[0].payload.get("edges", [])
         assert len(edges) == 1
 
+    def test_add_edges_single_write(self, store: QdrantStore):
+        store.insert_memory(_make_memory(mem_id="m1"), user_id="u1")
+        store.add_edge("m1", "m2", "FOLLOWS", user_id="u1")
+
+        with patch.object(store.client, "set_payload",
+                          wraps=store.client.set_payload) as sp:
+            store.add_edges("m1", [
+                ("m2", "FOLLOWS"),       # already stored
+                ("m3", "CONTRADICTS"),
+                ("m3", "CONTRADICTS"),   # repeated in the batch
+                ("m4", "FOLLOWS"),
+            ], user_id="u1")
+        sp.assert_called_once()
+
+        points = store._scroll_all([
+            FieldCondition(key="memory_id", match=MatchValue(value="m1")),
+        ], limit=1)
+        edges = [(e["to"], e["relation"]) for e in points[0].payload["edges"]]
+        assert edges == [
+            ("m2", "FOLLOWS"), ("m3", "CONTRADICTS"), ("m4", "FOLLOWS"),
+        ]
+
     def test_add_edge_to_nonexistent_source(self, store: QdrantStore):
         store.add_edge("nope", "m2", "FOLLOWS", user_id="u1")  # should not raise
 
@@ -440,6 +1068,22 @@ class TestGraphEdges:
         assert "m3" in ids
         assert len(related) == 2
 
+    def test_find_related_one_scroll_per_level(self, store: QdrantStore):
+        for mid in ("root", "a", "b", "a1", "a2", "b1"):
+            store.insert_memory(_make_memory(mem_id=mid), user_id="u1")
+        store.add_edges("root", [("a", "FOLLOWS"), ("b", "FOLLOWS")], user_id="u1")
+        store.add_edges("a", [("a1", "FOLLOWS"), ("a2", "FOLLOWS")], user_id="u1")
+        store.add_edge("b", "b1", "CONTRADICTS", user_id="u1")
+
+        with patch.object(store.client, "scroll",
+                          wraps=store.client.scroll) as scroll:
+            related = store.find_related("root", depth=2, user_id="u1")
+        assert scroll.call_count == 3  # root, then one per depth
+        assert [(r["id"], r["depth"]) for r in related] == [
+            ("a", 1), ("b", 1), ("a1", 2), ("a2", 2), ("b1", 2),
+        ]
+        assert related[-1]["relation"] == "CONTRADICTS"
+
     def test_find_related_no_cycles(self, store: QdrantStore):
         store.insert_memory(_make_memory(mem_id="m1"), user_id="u1")
         store.insert_memory(_make_memory(mem_id="m2"), user_id="u1")
@@ -486,6 +1130,32 @@ class TestJournal:
         assert results[0]["content"] == "learned something new"
         assert results[0]["gate"] == "epistemic"
 
+    @pytest.mark.asyncio
+    async def test_ainsert_journal(self, store: QdrantStore):
+        now = datetime.now(timezone.utc)
+        cp = JournalEntry(timestamp=now, gate=Gate.checkpoint, content="next: ship it")
+        await store.ainsert_journal(cp, user_id="u1")
+        assert store.latest_checkpoint(user_id="u1")["content"] == "next: ship it"
+
+        store.aclient = AsyncMock()
+        await store.ainsert_journal(cp, user_id="u2")
+        (point,) = store.aclient.upsert.call_args.kwargs["points"]
+        assert point.payload["user_id"] == "u2"
+        assert point.payload["gate"] == "checkpoint"
+
+    def test_recent_journal_is_a_time_window(self, store: QdrantStore):
+        now = datetime.now(timezone.utc)
+        for age_days, text in ((0, "today"), (1, "yesterday"), (4, "last week")):
+            store.insert_journal(JournalEntry(
+                timestamp=now - timedelta(days=age_days, minutes=1),
+                gate=Gate.epistemic, content=text,
+            ), user_id="u1")
+
+        recent = store.recent_journal(days=2, user_id="u1")
+        assert [e["content"] for e in recent] == ["today", "yesterday"]
+        assert len(store.recent_journal(days=2, user_id="u1", limit=1)) == 1
+        assert len(store.recent_journal(days=5, user_id="u1")) == 3
+
     def test_journal_by_date(self, store: QdrantStore):
         now = datetime.now(timezone.utc)
         today = now.strftime("%Y-%m-%d")
@@ -521,6 +1191,43 @@ class TestJournal:
         assert result["content"] == "session summary"
         assert result["gate"] == "checkpoint"
 
+    def test_bootstrap(self, store: QdrantStore):
+        assert store.bootstrap(user_id="u1") == (None, None, [], [])
+
+        now = datetime.now(timezone.utc)
+        store.set_identity(
+            IdentityCard(person="A", content="card", last_updated=now), user_id="u1",
+        )
+        for i in range(10):
+            store.insert_journal(
+                JournalEntry(
+                    timestamp=now - timedelta(seconds=i), gate=Gate.epistemic,
+                    content=f"note {i}",
+                ),
+                user_id="u1",
+            )
+        store.insert_journal(
+            JournalEntry(timestamp=now, gate=Gate.checkpoint, content="summary"),
+            user_id="u1",
+        )
+        store.insert_journal(
+            JournalEntry(timestamp=now, gate=Gate.observation, content="saw it"),
+            user_id="u1",
+        )
+        store.insert_journal(
+            JournalEntry(timestamp=now, gate=Gate.epistemic, content="other"),
+            user_id="u2",
+        )
+
+        identity, checkpoint, recent, observations = store.bootstrap(user_id="u1")
+        assert identity == store.get_identity(user_id="u1")
+        assert checkpoint == store.latest_checkpoint(user_id="u1")
+        assert [e["content"] for e in recent] == [f"note {i}" for i in range(8)]
+        assert observations == []
+
+        *_, observations = store.bootstrap(user_id="u1", observations=5)
+        assert observations == [{"gate": "observation", "content": "saw it"}]
+
     def test_stale_journal_dates(self, store: QdrantStore):
         # Insert old entry
         old_time = datetime.now(timezone.utc) - timedelta(days=30)
@@ -539,16 +1246,60 @@ class TestJournal:
         today = now.strftime("%Y-%m-%d")
         assert today not in stale
 
-    def test_archive_journal_date(self, store: QdrantStore):
+    def test_archive_journal_dates_single(self, store: QdrantStore):
         now = datetime.now(timezone.utc)
         today = now.strftime("%Y-%m-%d")
         entry = JournalEntry(timestamp=now, gate=Gate.epistemic, content="will be archived")
         store.insert_journal(entry, user_id="u1")
 
-        store.archive_journal_date(today, user_id="u1")
+        store.archive_journal_dates([today], user_id="u1")
         results = store.journal_by_date(today, user_id="u1")
         assert len(results) == 0
 
+    def test_insert_journal_raw_many(self, store: QdrantStore):
+        store.insert_journal_raw_many([
+            ("2026-W01", Gate.digest, "# Week 2026-W01\n\nfirst"),
+            ("2026-W02", Gate.digest, "# Week 2026-W02\n\nsecond"),
+        ], user_id="u1")
+        assert store.journal_by_date("2026-W01", user_id="u1")[0]["gate"] == "digest"
+        assert len(store.journal_by_date("2026-W02", user_id="u1")) == 1
+        store.insert_journal_raw_many([], user_id="u1")  # no-op
+
+    def test_insert_journal_raw_many_embeds_in_one_batch(self, store: QdrantStore):
+        with patch.object(store, "_embed_local_many", wraps=store._embed_local_many) as many, \
+             patch.object(store, "_embed_local") as one:
+            store.insert_journal_raw_many([
+                ("2026-W01", Gate.digest, "first"),
+                ("2026-W02", Gate.digest, "second"),
+            ], user_id="u1")
+        many.assert_called_once_with(["first", "second"])
+        one.assert_not_called()
+
+    def test_concat_journal_for_dates(self, store: QdrantStore):
+        store.insert_journal_raw("2026-01-05", Gate.epistemic, "first", user_id="u1")
+        store.insert_journal_raw("2026-01-05", Gate.behavioral, "second", user_id="u1")
+        store.insert_journal_raw("2026-01-06", Gate.relational, "other day", user_id="u1")
+        store.insert_journal_raw("2026-01-05", Gate.epistemic, "other user", user_id="u2")
+
+        texts = store.concat_journal_for_dates(["2026-01-05", "2026-01-06"], user_id="u1")
+        assert set(texts) == {"2026-01-05", "2026-01-06"}
+        assert sorted(texts["2026-01-05"].split("\n")) == [
+            "[behavioral] second", "[epistemic] first",
+        ]
+        assert texts["2026-01-06"] == "[relational] other day"
+        assert store.concat_journal_for_dates([], user_id="u1") == {}
+
+    def test_archive_journal_dates(self, store: QdrantStore):
+        store.insert_journal_raw("2026-01-05", Gate.epistemic, "a", user_id="u1")
+        store.insert_journal_raw("2026-01-06", Gate.epistemic, "b", user_id="u1")
+        store.insert_journal_raw("2026-01-07", Gate.epistemic, "c", user_id="u1")
+
+        store.archive_journal_dates(["2026-01-05", "2026-01-06"], user_id="u1")
+        remaining = store.concat_journal_for_dates(
+            ["2026-01-05", "2026-01-06", "2026-01-07"], user_id="u1",
+        )
+        assert set(remaining) == {"2026-01-07"}
+
     def test_user_isolation(self, store: QdrantStore):
         now = datetime.now(timezone.utc)
         entry = JournalEntry(timestamp=now, gate=Gate.epistemic, content="private note")
@@ -1,22 +1,25 @@
 """Comprehensive tests for the MCP server module (server.py).
 
 Covers: _auto_gate, _extract_person_project, _build_instructions,
-        TOOL_DEFS, LEGACY_ALIASES, _dispatch, create_server.
+        _load_instructions, TOOL_DEFS, LEGACY_ALIASES, _dispatch, create_server.
 """
 
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from claude_memory_kit.cache import make_key
 from claude_memory_kit.server import (
+    INSTRUCTIONS_CACHE,
     LEGACY_ALIASES,
     TOOL_DEFS,
     _auto_gate,
     _build_instructions,
     _dispatch,
     _extract_person_project,
+    _load_instructions,
     create_server,
 )
 from claude_memory_kit.types import Gate, IdentityCard, JournalEntry
@@ -232,6 +235,10 @@ class TestAutoGate:
         """Promissory check runs first, so it takes precedence."""
         assert _auto_gate("I will actually do it tomorrow") == "promissory"
 
+    def test_priority_with_overlapping_keywords(self):
+        """'when i' (behavioral) overlaps 'i will' (promissory); both are seen."""
+        assert _auto_gate("when i will ship it") == "promissory"
+
     def test_priority_promissory_over_behavioral(self):
         assert _auto_gate("I will always deploy on Tuesdays") == "promissory"
 
@@ -494,6 +501,117 @@ class TestBuildInstructions:
                 assert not line.startswith("[checkpoint]")
 
 
+class TestBuildInstructionsConcurrency:
+    def test_context_reads_overlap(self):
+        """Each read waits for the other; serial reads would time out."""
+        import threading
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait(result):
+            def read(*args, **kwargs):
+                barrier.wait()
+                return result
+            return read
+
+        store = MagicMock()
+        store.qdrant.bootstrap.side_effect = wait(
+            (None, {"content": "where we were"}, [], []),
+        )
+        store.qdrant.list_rules.side_effect = wait([])
+        instructions = _build_instructions(store, "test-user", team_id="t1")
+        assert "where we were" in instructions
+        store.qdrant.get_identity.assert_not_called()
+        store.qdrant.latest_checkpoint.assert_not_called()
+        store.qdrant.recent_journal.assert_not_called()
+
+
+def _instr_cache(tmp_path, user_id="test-user"):
+    return tmp_path / INSTRUCTIONS_CACHE.format(make_key(user_id)[:16])
+
+
+class TestLoadInstructions:
+    """Tests for the on-disk instructions cache."""
+
+    def _make_store(self, qdrant_db):
+        store = MagicMock()
+        store.qdrant = qdrant_db
+        return store
+
+    def test_warm_start_reuses_cached_text(self, qdrant_db, tmp_path):
+        store = self._make_store(qdrant_db)
+        first = _load_instructions(store, str(tmp_path), "test-user")
+        assert _instr_cache(tmp_path).exists()
+
+        with patch("claude_memory_kit.server._build_instructions") as build:
+            assert _load_instructions(store, str(tmp_path), "test-user") == first
+        build.assert_not_called()
+
+    def test_rebuilds_after_journal_write(self, qdrant_db, tmp_path):
+        store = self._make_store(qdrant_db)
+        _load_instructions(store, str(tmp_path), "test-user")
+        qdrant_db.insert_journal(JournalEntry(
+            timestamp=datetime.now(timezone.utc),
+            gate=Gate.epistemic,
+            content="fresh context line",
+        ), user_id="test-user")
+        assert "fresh context line" in _load_instructions(store, str(tmp_path), "test-user")
+
+    def test_rebuilds_after_identity_update(self, qdrant_db, tmp_path):
+        store = self._make_store(qdrant_db)
+        _load_instructions(store, str(tmp_path), "test-user")
+        qdrant_db.set_identity(IdentityCard(
+            content="new identity", last_updated=datetime.now(timezone.utc),
+        ), user_id="test-user")
+        assert "new identity" in _load_instructions(store, str(tmp_path), "test-user")
+
+    def test_corrupt_cache_rebuilds(self, qdrant_db, tmp_path):
+        _instr_cache(tmp_path).write_text("{not json")
+        store = self._make_store(qdrant_db)
+        text = _load_instructions(store, str(tmp_path), "test-user")
+        assert "persistent memory" in text
+
+    def test_team_sessions_skip_cache(self, qdrant_db, tmp_path):
+        store = self._make_store(qdrant_db)
+        _load_instructions(store, str(tmp_path), "test-user", team_id="t1")
+        assert not list(tmp_path.glob(".instr_cache*"))
+
+    def test_users_keep_separate_caches(self, qdrant_db, tmp_path):
+        store = self._make_store(qdrant_db)
+        _load_instructions(store, str(tmp_path), "alice")
+        _load_instructions(store, str(tmp_path), "bob")
+        assert _instr_cache(tmp_path, "alice").exists()
+        assert _instr_cache(tmp_path, "bob").exists()
+
+        with patch("claude_memory_kit.server._build_instructions") as build:
+            _load_instructions(store, str(tmp_path), "alice")
+        build.assert_not_called()
+
+    def test_version_check_is_one_batch_query(self, qdrant_db, tmp_path):
+        store = self._make_store(qdrant_db)
+        _load_instructions(store, str(tmp_path), "test-user")
+        with patch.object(
+            qdrant_db.client, "query_batch_points", wraps=qdrant_db.client.query_batch_points,
+        ) as batch, patch.object(qdrant_db.client, "scroll") as scroll, \
+             patch.object(qdrant_db.client, "count") as count:
+            _load_instructions(store, str(tmp_path), "test-user")
+        batch.assert_called_once()
+        scroll.assert_not_called()
+        count.assert_not_called()
+
+    def test_rebuilds_after_journal_archive(self, qdrant_db, tmp_path):
+        store = self._make_store(qdrant_db)
+        now = datetime.now(timezone.utc)
+        older = now - timedelta(days=3)
+        for when, line in ((older, "older line"), (now, "newer line")):
+            qdrant_db.insert_journal(JournalEntry(
+                timestamp=when, gate=Gate.epistemic, content=line,
+            ), user_id="test-user")
+        assert "older line" in _load_instructions(store, str(tmp_path), "test-user")
+        qdrant_db.archive_journal_dates([older.strftime("%Y-%m-%d")], user_id="test-user")
+        assert "older line" not in _load_instructions(store, str(tmp_path), "test-user")
+
+
 # ---------------------------------------------------------------------------
 # TOOL_DEFS and LEGACY_ALIASES
 # ---------------------------------------------------------------------------
@@ -708,6 +826,9 @@ class TestDispatch:
                 "user1", counters,
             )
             assert counters["save"] == 1
+        mock_store.auth_db.set_counter.assert_called_once_with(
+            "user1", "saves_since_reflect", 1,
+        )
 
     @pytest.mark.asyncio
     async def test_remember_this_triggers_auto_reflect_at_threshold(self, mock_store, counters):
@@ -730,6 +851,9 @@ class TestDispatch:
             )
             mock_reflect.assert_awaited_once()
             assert counters["save"] == 0
+        mock_store.auth_db.set_counter.assert_called_once_with(
+            "user1", "saves_since_reflect", 0,
+        )
 
     @pytest.mark.asyncio
     async def test_remember_this_auto_reflect_failure_does_not_crash(self, mock_store, counters):
@@ -788,6 +912,30 @@ class TestDispatch:
             )
             assert "Found" in result
 
+    @pytest.mark.asyncio
+    async def test_repeated_recall_served_from_cache(self, mock_store, counters):
+        from claude_memory_kit.cache import invalidate_search_cache
+
+        with patch(
+            "claude_memory_kit.server.do_recall",
+            new_callable=AsyncMock,
+            return_value="Found 1 memories",
+        ) as mock_recall:
+            for query in ("Python tips", "  python TIPS "):
+                result = await _dispatch(
+                    mock_store, "recall_memories", {"query": query},
+                    "user1", counters,
+                )
+                assert result == "Found 1 memories"
+            assert mock_recall.await_count == 1
+
+            invalidate_search_cache("user1")
+            await _dispatch(
+                mock_store, "recall_memories", {"query": "python tips"},
+                "user1", counters,
+            )
+            assert mock_recall.await_count == 2
+
     @pytest.mark.asyncio
     async def test_forget_memory_calls_do_forget(self, mock_store, counters):
         with patch(
@@ -951,9 +1099,7 @@ class TestCreateServer:
     def _mock_store_instance(self):
         """Create a MagicMock Store whose qdrant methods return sane defaults."""
         mock_store_inst = MagicMock()
-        mock_store_inst.qdrant.get_identity.return_value = None
-        mock_store_inst.qdrant.recent_journal.return_value = []
-        mock_store_inst.qdrant.latest_checkpoint.return_value = None
+        mock_store_inst.qdrant.bootstrap.return_value = (None, None, [], [])
         return mock_store_inst
 
     @patch("claude_memory_kit.server.get_user_id", return_value="test-user")
@@ -967,6 +1113,21 @@ class TestCreateServer:
         server = create_server()
         assert isinstance(server, Server)
 
+    @patch("claude_memory_kit.server.get_user_id", return_value="test-user")
+    @patch("claude_memory_kit.server.get_store_path")
+    @patch("claude_memory_kit.server.Store")
+    def test_reflect_counter_resumes_from_store(self, MockStore, mock_path, mock_uid, tmp_path):
+        mock_path.return_value = str(tmp_path / "store")
+        mock_store_inst = self._mock_store_instance()
+        mock_store_inst.auth_db.get_counter.return_value = 7
+        MockStore.return_value = mock_store_inst
+
+        create_server()
+
+        mock_store_inst.auth_db.get_counter.assert_called_once_with(
+            "test-user", "saves_since_reflect",
+        )
+
     @patch("claude_memory_kit.server.get_user_id", return_value="test-user")
     @patch("claude_memory_kit.server.get_store_path")
     @patch("claude_memory_kit.server.Store")
@@ -980,6 +1141,28 @@ class TestCreateServer:
         mock_store_inst.auth_db.migrate.assert_called_once()
         mock_store_inst.qdrant.ensure_collection.assert_called_once()
 
+    @patch("claude_memory_kit.server.get_user_id", return_value="test-user")
+    @patch("claude_memory_kit.server.get_store_path")
+    @patch("claude_memory_kit.server.Store")
+    def test_warmup_runs_in_background(self, MockStore, mock_path, mock_uid, tmp_path):
+        import threading
+
+        mock_path.return_value = str(tmp_path / "store")
+        mock_store_inst = self._mock_store_instance()
+        started, release = threading.Event(), threading.Event()
+
+        def warmup():
+            started.set()
+            release.wait(5)
+
+        mock_store_inst.qdrant.warmup.side_effect = warmup
+        MockStore.return_value = mock_store_inst
+
+        create_server()  # returns while warmup is still blocked
+
+        assert started.wait(5)
+        release.set()
+
     @patch("claude_memory_kit.server.get_user_id", return_value="test-user")
     @patch("claude_memory_kit.server.get_store_path")
     @patch("claude_memory_kit.server.Store")
@@ -1033,6 +1216,46 @@ class TestCreateServer:
             assert len(result.root.content) == 1
             assert "Found" in result.root.content[0].text
 
+    @pytest.mark.asyncio
+    @patch("claude_memory_kit.server.get_user_id", return_value="test-user")
+    @patch("claude_memory_kit.server.get_store_path")
+    @patch("claude_memory_kit.server.Store")
+    async def test_list_tools_reuses_prebuilt_result(self, MockStore, mock_path, mock_uid, tmp_path):
+        mock_path.return_value = str(tmp_path / "store")
+        MockStore.return_value = self._mock_store_instance()
+
+        server = create_server()
+        from mcp.types import ListToolsRequest
+        handler = server.request_handlers[ListToolsRequest]
+        first = await handler(ListToolsRequest(method="tools/list"))
+        second = await handler(ListToolsRequest(method="tools/list"))
+        assert first.root is second.root
+
+    @pytest.mark.asyncio
+    @patch("claude_memory_kit.server.get_user_id", return_value="test-user")
+    @patch("claude_memory_kit.server.get_store_path")
+    @patch("claude_memory_kit.server.Store")
+    async def test_call_tool_rejects_invalid_input(self, MockStore, mock_path, mock_uid, tmp_path):
+        mock_path.return_value = str(tmp_path / "store")
+        MockStore.return_value = self._mock_store_instance()
+
+        server = create_server()
+        from mcp.types import CallToolRequest
+        handler = server.request_handlers[CallToolRequest]
+        with patch(
+            "claude_memory_kit.server.do_remember", new_callable=AsyncMock,
+        ) as mock_remember:
+            result = await handler(
+                CallToolRequest(
+                    method="tools/call",
+                    params={"name": "remember_this", "arguments": {"person": "Al"}},
+                )
+            )
+        assert result.root.isError is True
+        assert "Input validation error" in result.root.content[0].text
+        assert "'text' is a required property" in result.root.content[0].text
+        mock_remember.assert_not_called()
+
     @pytest.mark.asyncio
     @patch("claude_memory_kit.server.get_user_id", return_value="test-user")
     @patch("claude_memory_kit.server.get_store_path")
@@ -1,7 +1,10 @@
 """Tests for SqliteStore (auth-only: users, API keys, teams)."""
 
+import sqlite3
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from unittest.mock import patch
 
 import pytest
 
@@ -19,6 +22,74 @@ def _uid() -> str:
 # ===========================================================================
 
 
+class TestConnection:
+    def test_pragmas_applied(self, db):
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert db.conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert db.conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_readers_are_read_only(self, db):
+        with db._read() as c:
+            assert c.execute("PRAGMA query_only").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                c.execute("DELETE FROM users")
+
+    def test_reads_not_blocked_by_writer(self, db):
+        uid = _uid()
+        db.upsert_user(uid, email="a@b.c")
+        with db._write() as c:
+            c.execute("UPDATE users SET name = 'pending' WHERE id = ?", (uid,))
+            # Another thread can still read the last committed row
+            with ThreadPoolExecutor(1) as pool:
+                user = pool.submit(db.get_user, uid).result(timeout=2)
+        assert user["name"] == ""
+        assert db.get_user(uid)["name"] == "pending"
+
+    def test_failed_write_rolls_back(self, db):
+        uid = _uid()
+        with pytest.raises(RuntimeError):
+            with db._write() as c:
+                c.execute(
+                    "INSERT INTO users (id, created) VALUES (?, 'now')", (uid,),
+                )
+                raise RuntimeError
+        assert db.get_user(uid) is None
+
+
+class TestTransaction:
+    def test_writes_commit_once(self, db):
+        uids = [_uid() for _ in range(3)]
+        with db.transaction():
+            for uid in uids:
+                db.upsert_user(uid)
+                db.set_counter(uid, "saves", 1)
+            assert db.conn.in_transaction
+            # Not yet visible to the read pool
+            assert db.get_user(uids[0]) is None
+        assert not db.conn.in_transaction
+        assert all(db.get_user(uid) for uid in uids)
+        assert db.get_counter(uids[-1], "saves") == 1
+
+    def test_rolls_back_on_error(self, db):
+        uid = _uid()
+        with pytest.raises(ValueError):
+            with db.transaction():
+                db.upsert_user(uid)
+                db.set_counter(uid, "saves", 3)
+                raise ValueError
+        assert db.get_user(uid) is None
+        assert db.get_counter(uid, "saves") == 0
+
+    def test_nested_joins_outer(self, db):
+        uid = _uid()
+        with db.transaction():
+            with db.transaction():
+                db.upsert_user(uid)
+            assert db.conn.in_transaction
+        assert db.get_user(uid) is not None
+
+
 class TestMigration:
     def test_migrate_creates_tables(self, db):
         tables = {
@@ -66,7 +137,33 @@ class TestMigration:
         row = db.conn.execute(
             "SELECT version FROM schema_version WHERE id = 1"
         ).fetchone()
-        assert row[0] == 6
+        assert row[0] == 8
+
+    def test_migrate_when_current_skips_writer(self, db):
+        with patch.object(db, "_migrate") as run:
+            db.migrate()
+        run.assert_not_called()
+
+    def test_migrate_upgrades_old_database(self, db):
+        db.conn.execute("DROP TABLE counters")
+        db.conn.execute("UPDATE schema_version SET version = 6")
+        db.conn.commit()
+        db.migrate()
+        assert db.get_counter("u1", "n") == 0
+        assert db._current_schema_version() == db.SCHEMA_VERSION
+
+    def test_scalar_leaves_pool_row_factory_alone(self, db):
+        assert db._scalar("SELECT 7") == 7
+        assert db._scalar("SELECT 1 WHERE 0") is None
+        assert db.get_user("ghost") is None
+        db.upsert_user("u1")
+        assert db.get_user("u1")["id"] == "u1"
+
+    def test_has_column_reads_table_info_once(self, db):
+        db._columns.clear()
+        assert db._has_column("memories", "pinned")
+        assert not db._has_column("memories", "nope")
+        assert set(db._columns) == {"memories"}
 
 
 # ===========================================================================
@@ -94,6 +191,13 @@ class TestUsers:
         assert second["name"] == "Updated"
         assert second["last_seen"] >= first["last_seen"]
 
+    def test_timestamps_are_fixed_width(self, db):
+        on_the_second = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        with patch("claude_memory_kit.store.sqlite.datetime") as dt:
+            dt.now.return_value = on_the_second
+            db.upsert_user("u1")
+        assert db.get_user("u1")["created"] == "2026-01-01T00:00:00.000000+00:00"
+
     def test_upsert_preserves_existing_email(self, db):
         db.upsert_user("u1", email="original@test.com")
         db.upsert_user("u1")  # no email passed
@@ -126,6 +230,16 @@ class TestAPIKeys:
         second = db.get_api_key_by_hash("hash1")
         assert second["last_used"] is not None
 
+    def test_get_by_hash_throttles_last_used_writes(self, db):
+        db.insert_api_key("k1", "u1", "hash1", "cmk_")
+        first = db.get_api_key_by_hash("hash1")
+        stamped = db.get_api_key_by_hash("hash1")["last_used"]
+        with patch.object(db, "_write") as write:
+            again = db.get_api_key_by_hash("hash1")
+        write.assert_not_called()
+        assert first["last_used"] is None
+        assert again["last_used"] == stamped
+
     def test_list_api_keys(self, db):
         db.insert_api_key("k1", "u1", "h1", "cmk_", name="key1")
         db.insert_api_key("k2", "u1", "h2", "cmk_", name="key2")
@@ -259,3 +373,39 @@ class TestTeams:
         assert len(teams) == 1
         assert teams[0]["name"] == "Alpha"
         assert teams[0]["role"] == "member"
+
+
+# ===========================================================================
+# Counters
+# ===========================================================================
+
+
+class TestCounters:
+    def test_missing_counter_is_zero(self, db):
+        assert db.get_counter("u1", "saves") == 0
+
+    def test_set_and_get_per_user(self, db):
+        db.set_counter("u1", "saves", 3)
+        db.set_counter("u1", "saves", 4)
+        db.set_counter("u2", "saves", 9)
+        assert db.get_counter("u1", "saves") == 4
+        assert db.get_counter("u2", "saves") == 9
+
+
+class TestPendingBatches:
+    def test_add_list_delete(self, db):
+        db.add_pending_batch("msgbatch_1", "u1", "classify")
+        db.add_pending_batch("msgbatch_2", "u1", "classify")
+        db.add_pending_batch("msgbatch_3", "u2", "classify")
+        assert db.list_pending_batches("u1", "classify") == ["msgbatch_1", "msgbatch_2"]
+        assert db.list_pending_batches("u1", "digest") == []
+        db.delete_pending_batch("msgbatch_1")
+        assert db.list_pending_batches("u1", "classify") == ["msgbatch_2"]
+
+    def test_queued_memory_ids(self, db):
+        db.add_pending_batch("msgbatch_1", "u1", "classify", ["m1", "m2"])
+        db.add_pending_batch("msgbatch_2", "u1", "classify", ["m3"])
+        db.add_pending_batch("msgbatch_3", "u2", "classify", ["m4"])
+        assert db.pending_batch_memory_ids("u1", "classify") == {"m1", "m2", "m3"}
+        db.delete_pending_batch("msgbatch_1")
+        assert db.pending_batch_memory_ids("u1", "classify") == {"m3"}